@@ -0,0 +1,36 @@
+"""
+CPU-only benchmarks for Norfair.
+
+The suite generates synthetic scenes that emit [`Detection`][norfair.tracker.Detection]
+objects directly, so no detector, GPU or video file is needed to measure the tracker.
+
+Run it as a module to get a table and a JSON file that can be compared across commits:
+
+```bash
+python -m benchmarks --objects 50 --frames 300 --output results.json
+python -m benchmarks --compare results.json
+```
+
+or through pytest, which runs a reduced version of every benchmark:
+
+```bash
+pytest benchmarks
+```
+"""
+
+from .scene import SceneConfig, generate_scene
+from .tracker import (
+    DEFAULT_DISTANCES,
+    DEFAULT_FILTERS,
+    benchmark_tracker,
+    run_suite,
+)
+
+__all__ = [
+    "SceneConfig",
+    "generate_scene",
+    "DEFAULT_DISTANCES",
+    "DEFAULT_FILTERS",
+    "benchmark_tracker",
+    "run_suite",
+]
@@ -0,0 +1,169 @@
+import argparse
+
+from rich.console import Console
+from rich.table import Table
+
+from .scene import SceneConfig
+from .tracker import (
+    DEFAULT_DISTANCES,
+    DEFAULT_FILTERS,
+    compare_results,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+
+def _results_table(results) -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Filter", style="yellow")
+    table.add_column("Distance", style="yellow")
+    table.add_column("FPS", justify="right")
+    for column in ("mean", "p50", "p90", "p99", "max"):
+        table.add_column(f"{column} ms", justify="right")
+    table.add_column("Objects", justify="right")
+    table.add_column("Bytes/track", justify="right")
+    for result in results["results"]:
+        latency = result["latency_ms"]
+        table.add_row(
+            result["filter"],
+            result["distance"],
+            f"{result['fps']:.1f}",
+            *(f"{latency[c]:.3f}" for c in ("mean", "p50", "p90", "p99", "max")),
+            f"{result['mean_active_objects']:.1f}",
+            f"{result['bytes_per_track']:.0f}",
+        )
+    return table
+
+
+def _motion_table(results) -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Scale", style="yellow")
+    table.add_column("FPS", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Mean error px", justify="right")
+    table.add_column("Max error px", justify="right")
+    table.add_column("Failed frames", justify="right")
+    for result in results["results"]:
+        table.add_row(
+            f"{result['processing_scale']:g}",
+            f"{result['fps']:.1f}",
+            f"{result['latency_ms']['p99']:.3f}",
+            f"{result['mean_error_px']:.3f}",
+            f"{result['max_error_px']:.3f}",
+            str(result["failed_frames"]),
+        )
+    return table
+
+
+def _comparison_table(comparison) -> Table:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Filter", style="yellow")
+    table.add_column("Distance", style="yellow")
+    table.add_column("Baseline FPS", justify="right")
+    table.add_column("FPS", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Baseline p99 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    for row in comparison:
+        color = "green" if row["speedup"] >= 1 else "red"
+        table.add_row(
+            row["filter"],
+            row["distance"],
+            f"{row['baseline_fps']:.1f}",
+            f"{row['fps']:.1f}",
+            f"[{color}]{row['speedup']:.2f}x[/{color}]",
+            f"{row['baseline_p99_ms']:.3f}",
+            f"{row['p99_ms']:.3f}",
+        )
+    return table
+
+
+def main(argv=None):
+    defaults = SceneConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark Tracker.update on synthetic scenes.",
+    )
+    parser.add_argument("--objects", type=int, default=defaults.num_objects)
+    parser.add_argument("--points", type=int, default=defaults.points_per_object)
+    parser.add_argument("--labels", type=int, default=defaults.num_labels)
+    parser.add_argument("--noise", type=float, default=defaults.noise)
+    parser.add_argument("--miss-rate", type=float, default=defaults.miss_rate)
+    parser.add_argument(
+        "--occlusion-iou",
+        type=float,
+        default=defaults.occlusion_iou,
+        help="Hide objects covered by more than this IoU. Negative disables occlusions.",
+    )
+    parser.add_argument("--skip-period", type=int, default=defaults.skip_period)
+    parser.add_argument("--frames", type=int, default=defaults.num_frames)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--filters",
+        nargs="+",
+        choices=list(DEFAULT_FILTERS),
+        default=list(DEFAULT_FILTERS),
+    )
+    parser.add_argument(
+        "--distances", nargs="+", default=list(DEFAULT_DISTANCES), metavar="DISTANCE"
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=["float32", "float64"],
+        help="Floating point type used by the tracker and the filters",
+    )
+    parser.add_argument(
+        "--motion-scales",
+        nargs="+",
+        type=float,
+        metavar="SCALE",
+        help="Also benchmark the camera motion estimation at these processing scales",
+    )
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument(
+        "--compare", help="JSON file of a previous run to compare the results with"
+    )
+    args = parser.parse_args(argv)
+
+    occlusion_iou = args.occlusion_iou
+    if occlusion_iou is not None and occlusion_iou < 0:
+        occlusion_iou = None
+    scene = SceneConfig(
+        num_objects=args.objects,
+        points_per_object=args.points,
+        num_labels=args.labels,
+        noise=args.noise,
+        miss_rate=args.miss_rate,
+        occlusion_iou=occlusion_iou,
+        skip_period=args.skip_period,
+        num_frames=args.frames,
+        seed=args.seed,
+    )
+    results = run_suite(
+        scene, filters=args.filters, distances=args.distances, dtype=args.dtype
+    )
+
+    if args.motion_scales:
+        # The camera motion benchmark needs OpenCV, which the tracker one doesn't
+        from .camera_motion import CameraSceneConfig, run_motion_suite
+
+        results["camera_motion"] = run_motion_suite(
+            CameraSceneConfig(seed=args.seed), scales=args.motion_scales
+        )
+
+    console = Console()
+    console.print(_results_table(results))
+    if "camera_motion" in results:
+        console.print(_motion_table(results["camera_motion"]))
+    if args.compare:
+        console.print(
+            _comparison_table(compare_results(load_results(args.compare), results))
+        )
+    if args.output:
+        save_results(results, args.output)
+        console.print(f"[white]Results saved to: {args.output}[/white]")
+
+
+if __name__ == "__main__":
+    main()
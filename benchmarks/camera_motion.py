@@ -0,0 +1,144 @@
+"""Speed and accuracy of the camera motion estimation at different processing scales."""
+
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import cv2
+import numpy as np
+
+from norfair.camera_motion import MotionEstimator
+
+from .tracker import _summarize_latencies
+
+DEFAULT_SCALES = (1.0, 0.5, 0.25)
+
+
+@dataclass
+class CameraSceneConfig:
+    """
+    Knobs of a synthetic panning camera.
+
+    Parameters
+    ----------
+    width : int, optional
+        Width of the frames.
+    height : int, optional
+        Height of the frames.
+    num_frames : int, optional
+        Length of the scene.
+    velocity : tuple, optional
+        Mean displacement of the camera, in pixels per frame, along x and y.
+    jitter : int, optional
+        Maximum random shake added to the camera position on every frame, in pixels.
+    seed : int, optional
+        Seed of the random generator, the same config always produces the same scene.
+    """
+
+    width: int = 1280
+    height: int = 720
+    num_frames: int = 60
+    velocity: tuple[float, float] = (4.0, 2.0)
+    jitter: int = 3
+    seed: int = 0
+
+
+def generate_camera_scene(
+    config: CameraSceneConfig,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield the frames seen by a camera panning over a textured canvas.
+
+    Each frame comes with the true displacement of the camera since the first frame,
+    which is the translation that converts its coordinates to absolute coordinates.
+    """
+    rng = np.random.default_rng(config.seed)
+    velocity = np.array(config.velocity)
+    steps = np.arange(config.num_frames)[:, None] * velocity
+    shake = rng.integers(-config.jitter, config.jitter + 1, size=steps.shape)
+    offsets = np.round(steps + shake).astype(int)
+    offsets -= offsets.min(axis=0)
+
+    canvas_width = config.width + offsets[:, 0].max() + 1
+    canvas_height = config.height + offsets[:, 1].max() + 1
+    canvas = rng.integers(0, 256, size=(canvas_height, canvas_width), dtype=np.uint8)
+    canvas = cv2.GaussianBlur(canvas, (0, 0), 2)
+    canvas = cv2.normalize(canvas, None, 0, 255, cv2.NORM_MINMAX)
+    canvas = cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+
+    for x, y in offsets:
+        frame = canvas[y : y + config.height, x : x + config.width]
+        yield np.ascontiguousarray(frame), (np.array([x, y]) - offsets[0]).astype(float)
+
+
+def benchmark_motion_estimator(
+    scene: CameraSceneConfig, processing_scale: float = 1.0, **estimator_kwargs: Any
+) -> dict[str, Any]:
+    """
+    Measure `MotionEstimator.update` on a synthetic panning camera.
+
+    Parameters
+    ----------
+    scene : CameraSceneConfig
+        Configuration of the synthetic scene.
+    processing_scale : float, optional
+        Scale at which the motion is estimated.
+    **estimator_kwargs
+        Extra arguments passed to the `MotionEstimator`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The throughput, in frames per second, latency percentiles, in milliseconds,
+        and the error, in full resolution pixels, of the estimated transformations.
+    """
+    frames = list(generate_camera_scene(scene))
+    motion_estimator = MotionEstimator(
+        processing_scale=processing_scale, **estimator_kwargs
+    )
+    # points spread over the frame on which the transformations are evaluated
+    xs, ys = np.meshgrid(
+        np.linspace(0, scene.width, 5), np.linspace(0, scene.height, 5)
+    )
+    points = np.stack([xs.ravel(), ys.ravel()], axis=1)
+
+    latencies = np.empty(len(frames))
+    errors = []
+    for i, (frame, displacement) in enumerate(frames):
+        start = time.perf_counter()
+        coord_transformation = motion_estimator.update(frame)
+        latencies[i] = time.perf_counter() - start
+        if coord_transformation is not None:
+            estimated = coord_transformation.rel_to_abs(points)
+            errors.append(
+                np.linalg.norm(estimated - (points + displacement), axis=1).mean()
+            )
+
+    total_time = float(latencies.sum())
+    return {
+        "processing_scale": processing_scale,
+        "frames": len(frames),
+        "total_s": total_time,
+        "fps": len(frames) / total_time if total_time > 0 else float("inf"),
+        "latency_ms": _summarize_latencies(latencies),
+        "mean_error_px": float(np.mean(errors)) if errors else float("nan"),
+        "max_error_px": float(np.max(errors)) if errors else float("nan"),
+        "failed_frames": len(frames) - len(errors),
+    }
+
+
+def run_motion_suite(
+    scene: CameraSceneConfig, scales: Sequence[float] | None = None
+) -> dict[str, Any]:
+    """
+    Benchmark the motion estimation of the same scene at each of the `scales`.
+
+    Returns a JSON serializable dictionary with the scene and the results.
+    """
+    if scales is None:
+        scales = DEFAULT_SCALES
+    return {
+        "scene": asdict(scene),
+        "results": [benchmark_motion_estimator(scene, scale) for scale in scales],
+    }
@@ -0,0 +1,134 @@
+"""
+Synthetic multi-object scenes that emit detections directly.
+
+The motion model follows `demos/reid/src/video_generator.py`: each object moves on a
+Lissajous-like curve inside a square canvas. Instead of rendering frames, the scene
+returns the noisy [`Detection`][norfair.tracker.Detection] objects a detector would
+have produced.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+from norfair import Detection
+
+
+@dataclass
+class SceneConfig:
+    """
+    Knobs of a synthetic scene.
+
+    Parameters
+    ----------
+    num_objects : int, optional
+        Number of objects moving in the scene.
+    points_per_object : int, optional
+        Points in each detection. `2` produces `[[x_min, y_min], [x_max, y_max]]`
+        boxes, `1` the box center and any other value keypoints scattered inside the box.
+    num_labels : int, optional
+        Number of different labels, objects are assigned labels round-robin.
+        `0` produces unlabeled detections.
+    noise : float, optional
+        Standard deviation, in pixels, of the gaussian noise added to every point.
+    miss_rate : float, optional
+        Probability of an object not being detected in a given frame.
+    occlusion_iou : float, optional
+        Objects whose box overlaps an object in front of them by more than this IoU are
+        not detected. `None` disables occlusions.
+    skip_period : int, optional
+        Detections are only produced every `skip_period` frames, the remaining frames
+        emit `None` so the tracker is updated with `period=skip_period`.
+    num_frames : int, optional
+        Length of the scene.
+    canvas_size : int, optional
+        Side of the square canvas in which objects move.
+    max_omega : float, optional
+        Maximum angular speed of the objects, larger values produce faster objects.
+    seed : int, optional
+        Seed of the random generator, the same config always produces the same scene.
+    """
+
+    num_objects: int = 20
+    points_per_object: int = 2
+    num_labels: int = 0
+    noise: float = 1.0
+    miss_rate: float = 0.05
+    occlusion_iou: float | None = 0.5
+    skip_period: int = 1
+    num_frames: int = 300
+    canvas_size: int = 1000
+    max_omega: float = 0.03
+    seed: int = 0
+
+
+def _iou_one_to_many(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    top_left = np.maximum(box[:2], boxes[:, :2])
+    bottom_right = np.minimum(box[2:], boxes[:, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=1)
+    area = np.prod(box[2:] - box[:2])
+    areas = np.prod(boxes[:, 2:] - boxes[:, :2], axis=1)
+    return intersection / (area + areas - intersection)
+
+
+def generate_scene(config: SceneConfig) -> Iterator[list[Detection] | None]:
+    """
+    Generate the detections of every frame of a synthetic scene.
+
+    Parameters
+    ----------
+    config : SceneConfig
+        The scene configuration.
+
+    Yields
+    ------
+    Optional[List[Detection]]
+        The detections of the frame, or `None` on frames skipped due to `skip_period`.
+    """
+    rng = np.random.default_rng(config.seed)
+    n = config.num_objects
+
+    sizes = rng.uniform(20, 120, size=(n, 2))
+    omegas = rng.uniform(-config.max_omega, config.max_omega, size=(n, 2))
+    phases = rng.uniform(-np.pi, np.pi, size=(n, 2))
+    # keypoints are defined relative to the box, as a proportion of its size
+    keypoint_offsets = rng.uniform(0, 1, size=(n, max(config.points_per_object, 1), 2))
+    if config.num_labels > 0:
+        labels = [i % config.num_labels for i in range(n)]
+    else:
+        labels = [None] * n
+
+    half = (config.canvas_size - sizes.max()) / 2
+    for step in range(config.num_frames):
+        if step % config.skip_period != 0:
+            yield None
+            continue
+
+        top_left = half * np.cos(omegas * step + phases) + half
+        boxes = np.hstack((top_left, top_left + sizes))
+
+        detected = rng.uniform(size=n) >= config.miss_rate
+        if config.occlusion_iou is not None:
+            # objects with lower index are considered to be in front
+            for i in range(1, n):
+                if (
+                    detected[i]
+                    and (
+                        _iou_one_to_many(boxes[i], boxes[:i]) > config.occlusion_iou
+                    ).any()
+                ):
+                    detected[i] = False
+
+        detections = []
+        for i in np.flatnonzero(detected):
+            if config.points_per_object == 1:
+                points = (boxes[i, :2] + boxes[i, 2:])[np.newaxis] / 2
+            elif config.points_per_object == 2:
+                points = boxes[i].reshape(2, 2)
+            else:
+                points = top_left[i] + keypoint_offsets[i] * sizes[i]
+            points = points + rng.normal(0, config.noise, size=points.shape)
+            scores = rng.uniform(0.5, 1.0, size=len(points))
+            detections.append(Detection(points, scores=scores, label=labels[i]))
+        yield detections
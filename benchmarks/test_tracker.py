@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from .__main__ import main
+from .scene import SceneConfig, generate_scene
+from .tracker import (
+    DEFAULT_DISTANCES,
+    DEFAULT_FILTERS,
+    benchmark_tracker,
+    compare_results,
+    run_suite,
+)
+
+SMALL_SCENE = SceneConfig(num_objects=10, num_frames=60)
+
+
+def test_scene_is_deterministic():
+    first = list(generate_scene(SMALL_SCENE))
+    second = list(generate_scene(SMALL_SCENE))
+    assert len(first) == SMALL_SCENE.num_frames
+    for dets_a, dets_b in zip(first, second):
+        assert len(dets_a) == len(dets_b)
+        for a, b in zip(dets_a, dets_b):
+            assert (a.points == b.points).all()
+
+
+def test_scene_knobs():
+    scene = SceneConfig(
+        num_objects=6,
+        points_per_object=5,
+        num_labels=3,
+        miss_rate=0,
+        occlusion_iou=None,
+        skip_period=3,
+        num_frames=9,
+    )
+    frames = list(generate_scene(scene))
+    assert [f is None for f in frames] == [False, True, True] * 3
+    for detections in frames[::3]:
+        assert len(detections) == 6
+        assert {d.label for d in detections} == {0, 1, 2}
+        assert all(d.points.shape == (5, 2) for d in detections)
+
+
+@pytest.mark.parametrize("distance_name", list(DEFAULT_DISTANCES))
+@pytest.mark.parametrize("filter_name", list(DEFAULT_FILTERS))
+def test_benchmark_tracker(filter_name, distance_name):
+    result = benchmark_tracker(SMALL_SCENE, filter_name, distance_name)
+    assert result["frames"] == SMALL_SCENE.num_frames
+    assert result["fps"] > 0
+    latency = result["latency_ms"]
+    assert latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+    # objects on a synthetic scene should be tracked
+    assert result["mean_active_objects"] > 0
+    assert result["bytes_per_track"] > 0
+
+
+@pytest.mark.parametrize("filter_name", list(DEFAULT_FILTERS))
+def test_benchmark_tracker_float32(filter_name):
+    result = benchmark_tracker(SMALL_SCENE, filter_name, "euclidean", dtype="float32")
+    assert result["dtype"] == "float32"
+    assert result["mean_active_objects"] > 0
+
+
+def test_suite_json(tmp_path):
+    output = tmp_path / "results.json"
+    main(
+        [
+            "--objects",
+            "5",
+            "--frames",
+            "20",
+            "--points",
+            "3",
+            "--filters",
+            "optimized",
+            "--output",
+            str(output),
+        ]
+    )
+    results = json.loads(output.read_text())
+    assert results["scene"]["num_objects"] == 5
+    # iou is skipped when objects are not boxes
+    assert {r["distance"] for r in results["results"]} == set(DEFAULT_DISTANCES) - {
+        "iou"
+    }
+
+    comparison = compare_results(results, run_suite(SceneConfig(num_objects=5)))
+    assert len(comparison) == len(results["results"])
+
+
+def test_motion_suite(tmp_path):
+    pytest.importorskip("cv2")
+    output = tmp_path / "results.json"
+    main(
+        [
+            "--objects",
+            "5",
+            "--frames",
+            "10",
+            "--filters",
+            "none",
+            "--distances",
+            "euclidean",
+            "--motion-scales",
+            "1",
+            "0.5",
+            "--output",
+            str(output),
+        ]
+    )
+    motion = json.loads(output.read_text())["camera_motion"]
+    assert [r["processing_scale"] for r in motion["results"]] == [1, 0.5]
+    for result in motion["results"]:
+        assert result["fps"] > 0
+        # the synthetic camera only pans, the motion should be recovered closely
+        assert result["mean_error_px"] < 2
@@ -0,0 +1,292 @@
+"""Throughput and latency benchmarks of `Tracker.update`."""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+import norfair
+from norfair import (
+    FilterPyKalmanFilterFactory,
+    NoFilterFactory,
+    OptimizedKalmanFilterFactory,
+    Tracker,
+)
+from norfair.filter import FilterFactory
+
+from .scene import SceneConfig, generate_scene
+
+DEFAULT_FILTERS: dict[str, Callable[[], FilterFactory]] = {
+    "filterpy": FilterPyKalmanFilterFactory,
+    "optimized": OptimizedKalmanFilterFactory,
+    "none": NoFilterFactory,
+}
+
+# Distance name -> distance threshold used for it on synthetic scenes.
+# Covers the three kinds of distances: scalar, vectorized and scipy.
+DEFAULT_DISTANCES: dict[str, float] = {
+    "frobenius": 60.0,
+    "mean_euclidean": 40.0,
+    "mean_manhattan": 50.0,
+    "iou": 0.7,
+    "euclidean": 60.0,
+}
+
+PERCENTILES = (50, 90, 99)
+# Measuring memory walks every tracked object, so it's done outside of the timed
+# section and only every this many frames.
+_MEMORY_SAMPLE_PERIOD = 25
+
+
+def _summarize_latencies(latencies: np.ndarray) -> dict[str, float]:
+    summary = {"mean": float(latencies.mean() * 1000)}
+    for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        summary[f"p{q}"] = float(value * 1000)
+    summary["max"] = float(latencies.max() * 1000)
+    return summary
+
+
+def _deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """Size in bytes of `obj` and everything it references that is not in `seen`."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, np.ndarray):
+        # views don't own their data, count the array that does, only once
+        if obj.base is not None:
+            size += _deep_sizeof(obj.base, seen)
+        elif obj.dtype == object:
+            size += sum(_deep_sizeof(item, seen) for item in obj.flat)
+        return size
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            _deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_deep_sizeof(item, seen) for item in obj)
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                size += _deep_sizeof(getattr(obj, slot), seen)
+    if hasattr(obj, "__dict__"):
+        size += _deep_sizeof(obj.__dict__, seen)
+    return size
+
+
+def bytes_per_track(tracker: Tracker) -> float:
+    """
+    Average memory, in bytes, held by each of the tracked objects of a tracker.
+
+    Everything reachable from the tracked objects is counted, including filters and
+    past detections, while objects shared by all tracks are only counted once.
+    """
+    if not tracker.tracked_objects:
+        return 0.0
+    # the object factory is shared by all the tracks and owned by the tracker
+    seen = {id(tracker._obj_factory)}
+    total = sum(_deep_sizeof(obj, seen) for obj in tracker.tracked_objects)
+    return total / len(tracker.tracked_objects)
+
+
+def benchmark_tracker(
+    scene: SceneConfig,
+    filter_name: str,
+    distance_name: str,
+    distance_threshold: float | None = None,
+    dtype: str | None = None,
+    **tracker_kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Measure `Tracker.update` on a synthetic scene.
+
+    The scene is fully generated before the measurement starts, so only the tracker
+    is timed.
+
+    Parameters
+    ----------
+    scene : SceneConfig
+        Configuration of the synthetic scene.
+    filter_name : str
+        One of the keys of `DEFAULT_FILTERS`.
+    distance_name : str
+        Name of the distance, as accepted by [`Tracker`][norfair.tracker.Tracker].
+    distance_threshold : Optional[float], optional
+        Defaults to the value in `DEFAULT_DISTANCES`.
+    dtype : Optional[str], optional
+        Floating point type passed to the tracker and the filter factory, the
+        detections of the scene are converted to it beforehand. Defaults to float64.
+    **tracker_kwargs
+        Extra arguments passed to the `Tracker`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The throughput, in frames per second, and latency percentiles, in milliseconds.
+    """
+    if distance_threshold is None:
+        distance_threshold = DEFAULT_DISTANCES[distance_name]
+    frames = list(generate_scene(scene))
+
+    if dtype is None:
+        filter_factory = DEFAULT_FILTERS[filter_name]()
+    else:
+        # convert the detections outside of the timed section, as a detector would
+        # already output them in this type
+        for detections in frames:
+            for detection in detections or ():
+                detection.points = detection.points.astype(dtype)
+        filter_factory = DEFAULT_FILTERS[filter_name](dtype=dtype)
+        tracker_kwargs["dtype"] = dtype
+
+    tracker = Tracker(
+        distance_function=distance_name,
+        distance_threshold=distance_threshold,
+        filter_factory=filter_factory,
+        **tracker_kwargs,
+    )
+
+    latencies = np.empty(len(frames))
+    active_objects = 0
+    track_bytes = []
+    for i, detections in enumerate(frames):
+        start = time.perf_counter()
+        tracked_objects = tracker.update(detections, period=scene.skip_period)
+        latencies[i] = time.perf_counter() - start
+        active_objects += len(tracked_objects)
+        if (i + 1) % _MEMORY_SAMPLE_PERIOD == 0:
+            track_bytes.append(bytes_per_track(tracker))
+
+    total_time = float(latencies.sum())
+    return {
+        "filter": filter_name,
+        "distance": distance_name,
+        "dtype": dtype or "float64",
+        "frames": len(frames),
+        "total_s": total_time,
+        "fps": len(frames) / total_time if total_time > 0 else float("inf"),
+        "latency_ms": _summarize_latencies(latencies),
+        "mean_active_objects": active_objects / len(frames),
+        "total_objects": tracker.total_object_count,
+        "bytes_per_track": float(np.mean(track_bytes))
+        if track_bytes
+        else bytes_per_track(tracker),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    scene: SceneConfig,
+    filters: Sequence[str] | None = None,
+    distances: Sequence[str] | None = None,
+    dtype: str | None = None,
+) -> dict[str, Any]:
+    """
+    Benchmark every combination of filter factory and distance on the same scene.
+
+    Distances that only work on boxes (`iou`) are skipped if the scene doesn't have
+    2 points per object.
+
+    Parameters
+    ----------
+    scene : SceneConfig
+        Configuration of the synthetic scene.
+    filters : Optional[Sequence[str]], optional
+        Filters to benchmark, defaults to all the keys in `DEFAULT_FILTERS`.
+    distances : Optional[Sequence[str]], optional
+        Distances to benchmark, defaults to all the keys in `DEFAULT_DISTANCES`.
+    dtype : Optional[str], optional
+        Floating point type used for tracking, defaults to float64.
+
+    Returns
+    -------
+    Dict[str, Any]
+        A JSON serializable dictionary with the environment, the scene and the results.
+    """
+    if filters is None:
+        filters = list(DEFAULT_FILTERS)
+    if distances is None:
+        distances = list(DEFAULT_DISTANCES)
+
+    results = []
+    for distance_name in distances:
+        if distance_name in ("iou", "iou_opt") and scene.points_per_object != 2:
+            continue
+        for filter_name in filters:
+            results.append(
+                benchmark_tracker(scene, filter_name, distance_name, dtype=dtype)
+            )
+
+    return {
+        "meta": {
+            "norfair": norfair.__version__,
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "scene": asdict(scene),
+        "results": results,
+    }
+
+
+def save_results(results: dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """
+    Compare the throughput of two runs of the suite.
+
+    Returns one entry per (filter, distance) present in both runs, where `speedup` is
+    the ratio between the current and the baseline fps.
+    """
+    baseline_by_key = {(r["filter"], r["distance"]): r for r in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        key = (result["filter"], result["distance"])
+        if key not in baseline_by_key:
+            continue
+        previous = baseline_by_key[key]
+        comparison.append(
+            {
+                "filter": key[0],
+                "distance": key[1],
+                "baseline_fps": previous["fps"],
+                "fps": result["fps"],
+                "speedup": result["fps"] / previous["fps"],
+                "baseline_p99_ms": previous["latency_ms"]["p99"],
+                "p99_ms": result["latency_ms"]["p99"],
+            }
+        )
+    return comparison
@@ -49,9 +49,10 @@ from .filter import (
     NoFilterFactory,
     OptimizedKalmanFilterFactory,
 )
+from .frame import FramePacket
 from .tracker import Detection, Tracker
 from .utils import get_cutout, print_objects_as_table
-from .video import Video
+from .video import SkippedFrame, Video
 
 __version__ = importlib.metadata.version("norfair-enough")
 
@@ -85,6 +86,8 @@ __all__ = [
     "FilterPyKalmanFilterFactory",
     "NoFilterFactory",
     "OptimizedKalmanFilterFactory",
+    # frame
+    "FramePacket",
     # tracker
     "Detection",
     "Tracker",
@@ -92,5 +95,6 @@ __all__ = [
     "get_cutout",
     "print_objects_as_table",
     # video
+    "SkippedFrame",
     "Video",
 ]
@@ -1,8 +1,10 @@
 "Camera motion stimation module."
 
+import asyncio
 import contextlib
 import copy
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from logging import warning
 
 import numpy as np
@@ -14,6 +16,8 @@ except ImportError:
 
     cv2 = DummyOpenCVImport()
 
+from .frame import FramePacket
+
 
 #
 # Abstract interfaces
@@ -30,6 +34,10 @@ class CoordinatesTransformation(ABC):
 
     Therefore, coordinate transformation in this context is a class that can transform
     coordinates in one reference to another.
+
+    The transformations included in norfair also accept an `out` array of the same shape as
+    `points` in which the result is written, avoiding the allocation of a new array.
+    It can be `points` itself, to transform them in place.
     """
 
     @abstractmethod
@@ -69,11 +77,37 @@ class TranslationTransformation(CoordinatesTransformation):
     def __init__(self, movement_vector):
         self.movement_vector = movement_vector
 
-    def abs_to_rel(self, points: np.ndarray):
-        return points + self.movement_vector
+    def abs_to_rel(self, points: np.ndarray, out: np.ndarray | None = None):
+        return np.add(points, self.movement_vector, out=out)
+
+    def rel_to_abs(self, points: np.ndarray, out: np.ndarray | None = None):
+        return np.subtract(points, self.movement_vector, out=out)
+
+
+# The bins are counted with np.bincount as long as there are at most this many bins
+# per flow vector, otherwise the flow is too spread and sorting it is cheaper.
+_MAX_BINS_PER_FLOW = 64
 
-    def rel_to_abs(self, points: np.ndarray):
-        return points - self.movement_vector
+
+def _flow_mode(flow: np.ndarray, bin_size: float) -> tuple[np.ndarray, int]:
+    """Most common flow vector, after bucketizing it into bins of `bin_size`, and its count."""
+    bins = np.around(flow / bin_size)
+    if np.isfinite(bins).all():
+        bins = bins.astype(np.int64)
+        lowest = bins.min(axis=0)
+        bins -= lowest
+        width = int(bins[:, 1].max()) + 1
+        num_bins = (int(bins[:, 0].max()) + 1) * width
+        if num_bins <= _MAX_BINS_PER_FLOW * len(flow):
+            # row-major indices keep the order of np.unique, so ties are broken the same way
+            counts = np.bincount(bins[:, 0] * width + bins[:, 1], minlength=num_bins)
+            mode_index = counts.argmax()
+            mode = np.array(divmod(mode_index, width)) + lowest
+            return mode * bin_size, int(counts[mode_index])
+        bins += lowest
+    unique_bins, counts = np.unique(bins, axis=0, return_counts=True)
+    max_index = counts.argmax()
+    return unique_bins[max_index] * bin_size, int(counts[max_index])
 
 
 class TranslationTransformationGetter(TransformationGetter):
@@ -87,6 +121,9 @@ class TranslationTransformationGetter(TransformationGetter):
     for this reason the reference frame is kept fixed as we progress through the video.
     Eventually, if the transformation is no longer able to match enough points, the reference frame is updated.
 
+    The mode is found by counting the bins with `np.bincount`, which is linear in the number of points,
+    falling back to sorting the flows when they are spread over too many bins.
+
     Parameters
     ----------
     bin_size : float
@@ -109,16 +146,11 @@ class TranslationTransformationGetter(TransformationGetter):
         flow = curr_pts - prev_pts
 
         # get mode
-        flow = np.around(flow / self.bin_size) * self.bin_size
-        unique_flows, counts = np.unique(flow, axis=0, return_counts=True)
-
-        max_index = counts.argmax()
+        flow_mode, count = _flow_mode(flow, self.bin_size)
 
-        proportion_points_used = counts[max_index] / len(prev_pts)
+        proportion_points_used = count / len(prev_pts)
         update_prvs = proportion_points_used < self.proportion_points_used_threshold
 
-        flow_mode = unique_flows[max_index]
-
         with contextlib.suppress(TypeError):
             flow_mode += self.data
 
@@ -145,35 +177,31 @@ class HomographyTransformation(CoordinatesTransformation):
         self.homography_matrix = homography_matrix
         self.inverse_homography_matrix = np.linalg.inv(homography_matrix)
 
-    def abs_to_rel(self, points: np.ndarray):
-        single_point = points.ndim == 1
-        if single_point:
-            points = points.reshape(1, -1)
-        ones = np.ones((len(points), 1))
-        points_with_ones = np.hstack((points, ones))
-        points_transformed = points_with_ones @ self.homography_matrix.T
-        last_column = points_transformed[:, -1]
-        last_column[last_column == 0] = 0.0000001
-        points_transformed = points_transformed / last_column.reshape(-1, 1)
-        result = points_transformed[:, :2]
-        if single_point:
-            return result.flatten()
-        return result
-
-    def rel_to_abs(self, points: np.ndarray):
-        single_point = points.ndim == 1
-        if single_point:
-            points = points.reshape(1, -1)
-        ones = np.ones((len(points), 1))
-        points_with_ones = np.hstack((points, ones))
-        points_transformed = points_with_ones @ self.inverse_homography_matrix.T
-        last_column = points_transformed[:, -1]
+    @staticmethod
+    def _apply(
+        matrix: np.ndarray, points: np.ndarray, out: np.ndarray | None
+    ) -> np.ndarray:
+        if out is None:
+            out = np.empty(points.shape, np.result_type(points, matrix))
+        points = points.reshape(-1, 2)
+        result = out.reshape(-1, 2)
+        # the projective divisor is computed first, as `out` may be `points`
+        last_column = points @ matrix[2, :2]
+        last_column += matrix[2, 2]
         last_column[last_column == 0] = 0.0000001
-        points_transformed = points_transformed / last_column.reshape(-1, 1)
-        result = points_transformed[:, :2]
-        if single_point:
-            return result.flatten()
-        return result
+        np.matmul(points, matrix[:2, :2].T, out=result)
+        result += matrix[:2, 2]
+        result /= last_column[:, None]
+        if not np.may_share_memory(result, out):
+            # reshaping a non contiguous `out` copies it, so the result is written back
+            out[...] = result.reshape(out.shape)
+        return out
+
+    def abs_to_rel(self, points: np.ndarray, out: np.ndarray | None = None):
+        return self._apply(self.homography_matrix, points, out)
+
+    def rel_to_abs(self, points: np.ndarray, out: np.ndarray | None = None):
+        return self._apply(self.inverse_homography_matrix, points, out)
 
 
 class HomographyTransformationGetter(TransformationGetter):
@@ -264,6 +292,145 @@ class HomographyTransformationGetter(TransformationGetter):
         return bool(update_prvs), HomographyTransformation(homography_matrix)
 
 
+#
+# Affine
+#
+def _compose_affine(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """2x3 affine matrix applying `second` and then `first`."""
+    return np.hstack(
+        (first[:, :2] @ second[:, :2], first[:, :2] @ second[:, 2:] + first[:, 2:])
+    )
+
+
+class AffineTransformation(CoordinatesTransformation):
+    """
+    Coordinate transformation between points using an affine transformation.
+
+    Cheaper than [`HomographyTransformation`][norfair.camera_motion.HomographyTransformation],
+    it represents the movements of a camera that pans, tilts and zooms without perspective changes.
+
+    Parameters
+    ----------
+    affine_matrix : np.ndarray
+        The 2x3 matrix representing the affine transformation, from absolute to relative coordinates.
+    """
+
+    def __init__(self, affine_matrix: np.ndarray):
+        self.affine_matrix = affine_matrix
+        # closed form inverse of [[a, b, tx], [c, d, ty]]
+        (a, b), (c, d) = affine_matrix[:, :2]
+        inverse_linear = np.array([[d, -b], [-c, a]]) / (a * d - b * c)
+        self.inverse_affine_matrix = np.hstack(
+            (inverse_linear, -inverse_linear @ affine_matrix[:, 2:])
+        )
+
+    @staticmethod
+    def _apply(
+        matrix: np.ndarray, points: np.ndarray, out: np.ndarray | None
+    ) -> np.ndarray:
+        out = np.matmul(points, matrix[:, :2].T, out=out)
+        out += matrix[:, 2]
+        return out
+
+    def abs_to_rel(self, points: np.ndarray, out: np.ndarray | None = None):
+        return self._apply(self.affine_matrix, points, out)
+
+    def rel_to_abs(self, points: np.ndarray, out: np.ndarray | None = None):
+        return self._apply(self.inverse_affine_matrix, points, out)
+
+
+class AffineTransformationGetter(TransformationGetter):
+    """
+    Calculates AffineTransformation between points.
+
+    The camera movement is represented as a rotation, uniform scaling and translation that matches the optical flow
+    between the previous reference frame and the current, estimated with `cv2.estimateAffinePartial2D`.
+    It's a good fit for cameras that only pan and zoom, and much cheaper to find than an homography.
+
+    As with [`HomographyTransformationGetter`][norfair.camera_motion.HomographyTransformationGetter], the reference frame
+    is kept fixed until the transformation is no longer able to match enough points.
+
+    Parameters
+    ----------
+    method : Optional[int], optional
+        One of openCV's robust methods. Valid options are: `[cv.RANSAC, cv.LMEDS]`, by default `cv.RANSAC`
+    ransac_reproj_threshold : int, optional
+        Maximum allowed reprojection error to treat a point pair as an inlier. More info in links below.
+    max_iters : int, optional
+        The maximum number of RANSAC iterations.  More info in links below.
+    confidence : float, optional
+        Confidence level, must be between 0 and 1. More info in links below.
+    refine_iters : int, optional
+        Maximum number of iterations of the refining algorithm, 0 disables the refinement.
+    proportion_points_used_threshold : float, optional
+        Proportion of points that must be matched, otherwise the reference frame must be updated.
+
+    See Also
+    --------
+    [opencv.estimateAffinePartial2D](https://docs.opencv.org/4.x/d9/d0c/group__calib3d.html#gad767faff73e9cbd8b9d92b955b50062d)
+    """
+
+    def __init__(
+        self,
+        method: int | None = None,
+        ransac_reproj_threshold: int = 3,
+        max_iters: int = 2000,
+        confidence: float = 0.995,
+        refine_iters: int = 10,
+        proportion_points_used_threshold: float = 0.9,
+    ) -> None:
+        self.data = None
+        if method is None:
+            method = cv2.RANSAC
+        self.method = method
+        self.ransac_reproj_threshold = ransac_reproj_threshold
+        self.max_iters = max_iters
+        self.confidence = confidence
+        self.refine_iters = refine_iters
+        self.proportion_points_used_threshold = proportion_points_used_threshold
+
+    def __call__(
+        self, curr_pts: np.ndarray, prev_pts: np.ndarray
+    ) -> tuple[bool, AffineTransformation | None]:
+        affine_matrix, points_used = None, None
+        if (
+            isinstance(prev_pts, np.ndarray)
+            and prev_pts.shape[0] >= 2
+            and isinstance(curr_pts, np.ndarray)
+            and curr_pts.shape[0] >= 2
+        ):
+            affine_matrix, points_used = cv2.estimateAffinePartial2D(
+                prev_pts,
+                curr_pts,
+                method=self.method,
+                ransacReprojThreshold=self.ransac_reproj_threshold,
+                maxIters=self.max_iters,
+                confidence=self.confidence,
+                refineIters=self.refine_iters,
+            )
+        if affine_matrix is None or points_used is None:
+            warning(
+                "The affine transformation couldn't be computed in this frame "
+                "due to low amount of points"
+            )
+            if isinstance(self.data, np.ndarray):
+                return True, AffineTransformation(self.data)
+            else:
+                return True, None
+
+        proportion_points_used = np.sum(points_used) / len(points_used)
+
+        update_prvs = proportion_points_used < self.proportion_points_used_threshold
+
+        if self.data is not None:
+            affine_matrix = _compose_affine(affine_matrix, self.data)
+
+        if update_prvs:
+            self.data = affine_matrix
+
+        return bool(update_prvs), AffineTransformation(affine_matrix)
+
+
 #
 # Motion estimation
 #
@@ -325,6 +492,66 @@ def _get_sparse_flow(
     return curr_pts_filtered, prev_pts_filtered
 
 
+def _replenish_points(
+    gray: np.ndarray,
+    points: np.ndarray,
+    grid: tuple[int, int],
+    max_points: int = 300,
+    min_distance: int = 15,
+    block_size: int = 3,
+    mask: np.ndarray | None = None,
+    quality_level: float = 0.01,
+) -> np.ndarray:
+    """
+    Keep `points` and sample new corners only in the cells of the grid left without points.
+
+    Returns the points in the format of `cv2.goodFeaturesToTrack`.
+    """
+    points = points.reshape((-1, 2)).astype(np.float32)
+    height, width = gray.shape[:2]
+    rows, cols = grid
+    if mask is not None and len(points) > 0:
+        x = np.clip(points[:, 0].astype(int), 0, width - 1)
+        y = np.clip(points[:, 1].astype(int), 0, height - 1)
+        points = points[mask[y, x] > 0]
+
+    row_edges = np.linspace(0, height, rows + 1).astype(int)
+    col_edges = np.linspace(0, width, cols + 1).astype(int)
+    covered = np.zeros((rows, cols), dtype=bool)
+    if len(points) > 0:
+        point_rows = np.searchsorted(row_edges, points[:, 1], side="right") - 1
+        point_cols = np.searchsorted(col_edges, points[:, 0], side="right") - 1
+        covered[np.clip(point_rows, 0, rows - 1), np.clip(point_cols, 0, cols - 1)] = (
+            True
+        )
+
+    budget = max_points - len(points)
+    per_cell = max(1, max_points // (rows * cols))
+    new_points = [points]
+    for row, col in zip(*np.nonzero(~covered)):
+        if budget <= 0:
+            break
+        y0, y1 = row_edges[row], row_edges[row + 1]
+        x0, x1 = col_edges[col], col_edges[col + 1]
+        # only the cell is searched, so the cost depends on the area that lost its points
+        cell_points = cv2.goodFeaturesToTrack(
+            gray[y0:y1, x0:x1],
+            maxCorners=min(per_cell, budget),
+            qualityLevel=quality_level,
+            minDistance=min_distance,
+            blockSize=block_size,
+            mask=mask[y0:y1, x0:x1] if mask is not None else None,
+        )
+        if cell_points is None:
+            continue
+        cell_points = cell_points.reshape((-1, 2)) + np.array(
+            [x0, y0], dtype=np.float32
+        )
+        new_points.append(cell_points)
+        budget -= len(cell_points)
+    return np.concatenate(new_points).reshape((-1, 1, 2))
+
+
 class MotionEstimator:
     """
     Estimator of the motion of the camera.
@@ -349,6 +576,18 @@ class MotionEstimator:
         Color of the drawing, by default blue.
     quality_level : float, optional
         Parameter characterizing the minimal accepted quality of image corners.
+    processing_scale : float, optional
+        Scale at which corners are sampled and the optical flow is calculated, by default `1.0`.
+        Using values such as `0.5` or `0.25` on high resolution videos makes the estimation much faster.
+        `min_distance` is given in full resolution pixels and the transformations are always
+        returned in full resolution coordinates.
+    replenish_grid : Optional[Tuple[int, int]], optional
+        Rows and columns of a grid used to replenish the sampled points, by default `None`.
+
+        Without it, every time the reference frame changes all the points are discarded and
+        corners are sampled again on the whole frame. With it, the points that are still tracked
+        are kept and new corners are only sampled in the cells of the grid left without points,
+        which is cheaper and keeps the estimation more stable.
 
     Examples
     --------
@@ -376,7 +615,19 @@ class MotionEstimator:
         draw_flow: bool = False,
         flow_color: tuple[int, int, int] | None = None,
         quality_level: float = 0.01,
+        processing_scale: float = 1.0,
+        replenish_grid: tuple[int, int] | None = None,
     ):
+        if processing_scale <= 0:
+            raise ValueError(
+                f"Argument `processing_scale` should be positive, not {processing_scale}."
+            )
+        self.processing_scale = processing_scale
+        if replenish_grid is not None and min(replenish_grid) < 1:
+            raise ValueError(
+                f"Argument `replenish_grid` should have at least 1 row and 1 column, not {replenish_grid}."
+            )
+        self.replenish_grid = replenish_grid
         self.max_points = max_points
         self.min_distance = min_distance
         self.block_size = block_size
@@ -399,15 +650,15 @@ class MotionEstimator:
         self.quality_level = quality_level
 
     def update(
-        self, frame: np.ndarray, mask: np.ndarray | None = None
+        self, frame: np.ndarray | FramePacket, mask: np.ndarray | None = None
     ) -> CoordinatesTransformation | None:
         """
         Estimate camera motion for each frame
 
         Parameters
         ----------
-        frame : np.ndarray
-            The frame.
+        frame : Union[np.ndarray, FramePacket]
+            The frame. If a [`FramePacket`][norfair.frame.FramePacket] is given, its grayscale version is reused.
         mask : np.ndarray, optional
             An optional mask to avoid areas of the frame when sampling the corner.
             Must be an array of shape `(frame.shape[0], frame.shape[1])`, dtype same as frame,
@@ -426,25 +677,51 @@ class MotionEstimator:
             or vice versa.
         """
 
-        self.gray_next = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        scale = self.processing_scale
+        if isinstance(frame, FramePacket):
+            self.gray_next = frame.downscaled(scale, gray=True)
+            frame = frame.image
+        else:
+            self.gray_next = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if scale != 1:
+                self.gray_next = cv2.resize(
+                    self.gray_next,
+                    None,
+                    fx=scale,
+                    fy=scale,
+                    interpolation=cv2.INTER_AREA,
+                )
+        if mask is not None and scale != 1:
+            mask = cv2.resize(
+                mask,
+                (self.gray_next.shape[1], self.gray_next.shape[0]),
+                interpolation=cv2.INTER_NEAREST,
+            )
         if self.gray_prvs is None:
             self.gray_prvs = self.gray_next
             self.prev_mask = mask
 
-        curr_pts, prev_pts = None, None
+        curr_pts, prev_pts, sampled_pts, tracked_pts = None, None, None, None
         try:
             curr_pts, prev_pts = _get_sparse_flow(
                 self.gray_next,
                 self.gray_prvs,
                 self.prev_pts,
                 self.max_points,
-                self.min_distance,
+                max(1, round(self.min_distance * scale)),
                 self.block_size,
                 self.prev_mask,
                 quality_level=self.quality_level,
             )
+            tracked_pts = curr_pts
+            if scale != 1:
+                # The points are kept at the processing scale to track them on the next
+                # frame, but the transformation is found in full resolution coordinates
+                curr_pts, sampled_pts = curr_pts / scale, prev_pts / scale
+            else:
+                sampled_pts = prev_pts
             if self.draw_flow and self.flow_color is not None:
-                for curr, prev in zip(curr_pts, prev_pts):
+                for curr, prev in zip(curr_pts, sampled_pts):
                     c = tuple(curr.astype(int).ravel())
                     p = tuple(prev.astype(int).ravel())
                     cv2.line(frame, c, p, self.flow_color, 2)
@@ -453,10 +730,10 @@ class MotionEstimator:
             warning(e)
 
         update_prvs, coord_transformations = True, None
-        if curr_pts is not None and prev_pts is not None:
+        if curr_pts is not None and sampled_pts is not None:
             try:
                 update_prvs, coord_transformations = self.transformations_getter(
-                    curr_pts, prev_pts
+                    curr_pts, sampled_pts
                 )
             except Exception as e:
                 warning(e)
@@ -469,7 +746,100 @@ class MotionEstimator:
             self.gray_prvs = self.gray_next
             self.prev_pts = None
             self.prev_mask = mask
+            if self.replenish_grid is not None and tracked_pts is not None:
+                try:
+                    self.prev_pts = _replenish_points(
+                        self.gray_next,
+                        tracked_pts,
+                        self.replenish_grid,
+                        self.max_points,
+                        max(1, round(self.min_distance * scale)),
+                        self.block_size,
+                        mask,
+                        quality_level=self.quality_level,
+                    )
+                except Exception as e:
+                    warning(e)
         else:
             self.prev_pts = prev_pts
 
         return coord_transformations
+
+
+class AsyncMotionEstimator:
+    """
+    Runs a [`MotionEstimator`][norfair.camera_motion.MotionEstimator] in a background thread.
+
+    The motion of the camera only depends on the frames, so it can be estimated while the detector runs on
+    the same frame. Most of the work is done by OpenCV, which releases the GIL, so both run in parallel even
+    when the detector is CPU bound.
+
+    [`update`][norfair.camera_motion.AsyncMotionEstimator.update] returns immediately with a
+    [`Future`][concurrent.futures.Future] of the `CoordinatesTransformation`, which can be passed directly to
+    [`Tracker.update`][norfair.tracker.Tracker.update], it's resolved there before matching the detections.
+    Updates are run one at a time in the order they are submitted.
+
+    The frame, and the mask, must not be modified until the future is done,
+    except by the `draw_flow` option of the motion estimator.
+
+    Parameters
+    ----------
+    motion_estimator : Optional[MotionEstimator], optional
+        The motion estimator run in the background, by default a `MotionEstimator` with the default parameters.
+
+    Examples
+    --------
+    >>> motion_estimator = AsyncMotionEstimator(MotionEstimator())
+    >>> for frame in video:
+    >>>    coord_transformation = motion_estimator.update(frame)  # starts in the background
+    >>>    detections = get_detections(frame)
+    >>>    tracked_objects = tracker.update(detections, coord_transformations=coord_transformation)
+    >>> motion_estimator.close()
+
+    In an asyncio event loop, the estimation can be awaited instead:
+
+    >>> coord_transformation = await motion_estimator.update_async(frame)
+    """
+
+    def __init__(self, motion_estimator: MotionEstimator | None = None):
+        if motion_estimator is None:
+            motion_estimator = MotionEstimator()
+        self.motion_estimator = motion_estimator
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="norfair-motion-estimator"
+        )
+
+    def update(
+        self, frame: np.ndarray | FramePacket, mask: np.ndarray | None = None
+    ) -> "Future[CoordinatesTransformation | None]":
+        """
+        Start estimating the camera motion of a frame in the background.
+
+        Takes the same arguments as [`MotionEstimator.update`][norfair.camera_motion.MotionEstimator.update].
+
+        Returns
+        -------
+        Future[Optional[CoordinatesTransformation]]
+            A future of the value returned by `MotionEstimator.update`.
+        """
+        return self._executor.submit(self.motion_estimator.update, frame, mask)
+
+    async def update_async(
+        self, frame: np.ndarray | FramePacket, mask: np.ndarray | None = None
+    ) -> CoordinatesTransformation | None:
+        """
+        Estimate the camera motion of a frame without blocking the running event loop.
+
+        Takes the same arguments as [`MotionEstimator.update`][norfair.camera_motion.MotionEstimator.update].
+        """
+        return await asyncio.wrap_future(self.update(frame, mask))
+
+    def close(self) -> None:
+        """Wait for the pending updates and stop the background thread."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
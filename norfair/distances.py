@@ -10,12 +10,22 @@ import numpy as np
 from scipy.spatial.distance import cdist
 
 if TYPE_CHECKING:
-    from typing import TypeAlias
+    from collections.abc import Hashable
+    from typing import Protocol, TypeAlias
 
     from .tracker import Detection, TrackedObject
 
     Candidate: TypeAlias = "Detection | TrackedObject"
 
+    class TrackedObjectLike(Protocol):
+        """What distances use of the objects: a `TrackedObject`, or the tracks stitched by `norfair.offline`."""
+
+        @property
+        def estimate(self) -> np.ndarray: ...
+
+        @property
+        def label(self) -> Hashable: ...
+
 
 class Distance(ABC):
     """
@@ -27,7 +37,7 @@ class Distance(ABC):
     @abstractmethod
     def get_distances(
         self,
-        objects: Sequence["TrackedObject"],
+        objects: Sequence["TrackedObjectLike"],
         candidates: Sequence["Candidate"] | None,
     ) -> np.ndarray:
         """
@@ -83,7 +93,7 @@ class ScalarDistance(Distance):
 
     def get_distances(
         self,
-        objects: Sequence["TrackedObject"],
+        objects: Sequence["TrackedObjectLike"],
         candidates: Sequence["Candidate"] | None,
     ) -> np.ndarray:
         """
@@ -150,7 +160,7 @@ class VectorizedDistance(Distance):
 
     def get_distances(
         self,
-        objects: Sequence["TrackedObject"],
+        objects: Sequence["TrackedObjectLike"],
         candidates: Sequence["Candidate"] | None,
     ) -> np.ndarray:
         """
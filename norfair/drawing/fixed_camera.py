@@ -16,8 +16,8 @@ class FixedCamera:
 
     !!! Warning
         This only works with [`TranslationTransformation`][norfair.camera_motion.TranslationTransformation],
-        using [`HomographyTransformation`][norfair.camera_motion.HomographyTransformation] will result in
-        unexpected behaviour.
+        using [`HomographyTransformation`][norfair.camera_motion.HomographyTransformation] or
+        [`AffineTransformation`][norfair.camera_motion.AffineTransformation] will result in unexpected behaviour.
 
     !!! Warning
         If using other drawers, always apply this one last. Using other drawers on the scaled up frame will not work as expected.
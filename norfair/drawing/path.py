@@ -5,6 +5,7 @@ import numpy as np
 
 from norfair.drawing.color import Palette
 from norfair.drawing.drawer import Drawer
+from norfair.history import TrackHistory
 from norfair.tracker import TrackedObject
 from norfair.utils import warn_once
 
@@ -152,7 +153,13 @@ class AbsolutePaths:
     radius : Optional[int], optional
         Radius of the circles representing the paths of interest.
     max_history : int, optional
-        Number of past points to include in the path. High values make the drawing slower
+        Number of past points to include in the path. High values make the drawing slower.
+        The paths of the objects that aren't drawn for more than `max_history` calls are forgotten.
+    history : Optional[TrackHistory], optional
+        A [`TrackHistory`][norfair.history.TrackHistory] with absolute estimates from which the past points are read,
+        instead of keeping a history in the drawer. It must be updated with the tracked objects before drawing them.
+        Every estimate in the history is part of the path, including those of frames in which the object had no live
+        points, which the drawer doesn't add to its own history.
 
     Examples
     --------
@@ -174,7 +181,13 @@ class AbsolutePaths:
         color: tuple[int, int, int] | None = None,
         radius: int | None = None,
         max_history=20,
+        history: TrackHistory | None = None,
     ):
+        if history is not None and not history.absolute:
+            raise ValueError(
+                "The history of AbsolutePaths should store absolute estimates, create it with `TrackHistory(absolute=True)`."
+            )
+
         if get_points_to_draw is None:
 
             def default_get_points(points):
@@ -190,7 +203,11 @@ class AbsolutePaths:
         self.thickness = thickness
         self.color = color
         self.past_points: defaultdict[int | None, list[np.ndarray]] = defaultdict(list)
+        # number of the last draw in which the path of each object was extended
+        self._last_drawn: dict[int | None, int] = {}
+        self._draw_number = 0
         self.max_history = max_history
+        self.history = history
         self.alphas = np.linspace(0.99, 0.01, max_history)
 
     def draw(self, frame, tracked_objects, coord_transform=None):
@@ -200,6 +217,11 @@ class AbsolutePaths:
             self.radius = int(max(frame_scale * 0.7, 1))
         if self.thickness is None:
             self.thickness = int(max(frame_scale / 7, 1))
+        past_estimates: dict[int, np.ndarray] = {}
+        if self.history is not None:
+            past_estimates = self.history.last_estimates(
+                [obj.id for obj in tracked_objects], self.max_history + 1
+            )
         for obj in tracked_objects:
             if not obj.live_points.any():
                 continue
@@ -228,8 +250,17 @@ class AbsolutePaths:
                     thickness=self.thickness,
                 )
 
+            history_points: list[np.ndarray]
+            if self.history is None:
+                history_points = self.past_points[obj.id]
+            else:
+                # newest first, skipping the estimate of this frame
+                history_points = [
+                    np.asarray(self.get_points_to_draw(estimate))
+                    for estimate in past_estimates.get(obj.id, [])[-2::-1]
+                ]
             last = points_to_draw
-            for i, past_points in enumerate(self.past_points[obj.id]):
+            for i, past_points in enumerate(history_points):
                 overlay = frame.copy()
                 last_rel = (
                     coord_transform.abs_to_rel(last)
@@ -254,7 +285,20 @@ class AbsolutePaths:
 
                 alpha = self.alphas[i]
                 frame = Drawer.alpha_blend(overlay, frame, alpha=alpha)
-            # pyrefly: ignore[bad-argument-type]
-            self.past_points[obj.id].insert(0, points_to_draw)
-            self.past_points[obj.id] = self.past_points[obj.id][: self.max_history]
+            if self.history is None:
+                # pyrefly: ignore[bad-argument-type]
+                self.past_points[obj.id].insert(0, points_to_draw)
+                self.past_points[obj.id] = self.past_points[obj.id][: self.max_history]
+                self._last_drawn[obj.id] = self._draw_number
+        # forget the paths of the objects that haven't been drawn for longer than a path lasts,
+        # the objects left out of a few calls, like those filtered by the caller, keep theirs
+        stale = [
+            id
+            for id, last_drawn in self._last_drawn.items()
+            if self._draw_number - last_drawn > self.max_history
+        ]
+        for id in stale:
+            del self.past_points[id]
+            del self._last_drawn[id]
+        self._draw_number += 1
         return frame
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from typing import Protocol
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from .kalman_filter import KalmanFilter
 
@@ -32,6 +34,38 @@ class FilterFactory(ABC):
     def create_filter(self, initial_detection: np.ndarray) -> Filter:
         pass
 
+    def release_filter(self, filter: Filter) -> None:
+        """
+        Called by the tracker when a filter created by this factory is no longer in use.
+
+        Factories that recycle their filters override it, by default it does nothing.
+        """
+        return None
+
+
+class _FilterPool:
+    """Released filters waiting to be reused, grouped by their dimensions."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._free: defaultdict[tuple[int, int], list] = defaultdict(list)
+
+    def acquire(self, dim_x: int, dim_z: int):
+        free = self._free.get((dim_x, dim_z))
+        if free:
+            return free.pop()
+        return None
+
+    def release(self, filter) -> None:
+        free = self._free[(filter.x.shape[0], filter.dim_z)]
+        if len(free) < self.max_size:
+            free.append(filter)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
 
 class FilterPyKalmanFilterFactory(FilterFactory):
     """
@@ -49,16 +83,70 @@ class FilterPyKalmanFilterFactory(FilterFactory):
         Multiplier for the process uncertainty, by default 0.1
     P : float, optional
         Multiplier for the initial covariance matrix estimation, only in the entries that correspond to position (not speed) variables, by default 10.0
+    pool_size : int, optional
+        Maximum number of filters of each dimension kept for reuse after their tracked objects die, by default 0 (no reuse).
+
+        Recycling filters avoids allocating all the Kalman filter matrices every time an object is born, which
+        matters in scenes where objects constantly appear and disappear. When enabled, the filter of a
+        [`TrackedObject`][norfair.tracker.TrackedObject] removed from the tracker is handed to a new object,
+        so its state must not be read after the object stops being returned by the tracker.
+    dtype : DTypeLike, optional
+        Floating point type of the filter state and covariances, by default `np.float64`.
+        Use `np.float32` together with [`Tracker(dtype=np.float32)`][norfair.tracker.Tracker] to track in single precision.
 
     See Also
     --------
     [`filterpy.KalmanFilter`](https://filterpy.readthedocs.io/en/latest/kalman/KalmanFilter.html).
     """
 
-    def __init__(self, R: float = 4.0, Q: float = 0.1, P: float = 10.0):
+    def __init__(
+        self,
+        R: float = 4.0,
+        Q: float = 0.1,
+        P: float = 10.0,
+        pool_size: int = 0,
+        dtype: DTypeLike = np.float64,
+    ):
         self.R = R
         self.Q = Q
         self.P = P
+        self.pool_size = pool_size
+        self.dtype: np.dtype = np.dtype(dtype)
+        self._pool = _FilterPool(pool_size)
+        # Matrices that depend only on the dimensions, shared by all the filters.
+        # F, H and _I are never modified and are read-only, the rest are templates
+        # used to initialize each filter's own copy.
+        self._matrices: dict[tuple[int, int], dict[str, np.ndarray]] = {}
+
+    def _get_matrices(self, dim_x: int, dim_z: int) -> dict[str, np.ndarray]:
+        matrices = self._matrices.get((dim_x, dim_z))
+        if matrices is None:
+            # State transition matrix (models physics)
+            F = np.eye(dim_x, dtype=self.dtype)
+            dt = 1  # At each step we update pos with v * dt
+            F[:dim_z, dim_z:] = dt * np.eye(dim_z)
+
+            # Process uncertainty
+            # Don't decrease it too much or trackers pay too little attention to detections
+            Q = np.eye(dim_x, dtype=self.dtype)
+            Q[dim_z:, dim_z:] *= self.Q
+
+            # Estimation uncertainty
+            P = np.eye(dim_x, dtype=self.dtype)
+            P[dim_z:, dim_z:] *= self.P
+
+            matrices = {
+                "F": _read_only(F),
+                # Measurement function
+                "H": _read_only(np.eye(dim_z, dim_x, dtype=self.dtype)),
+                "I": _read_only(np.eye(dim_x, dtype=self.dtype)),
+                # Measurement uncertainty (sensor noise)
+                "R": _read_only(np.eye(dim_z, dtype=self.dtype) * self.R),
+                "Q": _read_only(Q),
+                "P": _read_only(P),
+            }
+            self._matrices[(dim_x, dim_z)] = matrices
+        return matrices
 
     def create_filter(self, initial_detection: np.ndarray) -> KalmanFilter:
         """
@@ -81,41 +169,44 @@ class FilterPyKalmanFilterFactory(FilterFactory):
         dim_z = dim_points * num_points
         dim_x = 2 * dim_z  # We need to accommodate for velocities
 
-        filter = KalmanFilter(dim_x=dim_x, dim_z=dim_z)
-
-        # State transition matrix (models physics): numpy.array()
-        filter.F = np.eye(dim_x)
-        dt = 1  # At each step we update pos with v * dt
-
-        filter.F[:dim_z, dim_z:] = dt * np.eye(dim_z)
-
-        # Measurement function: numpy.array(dim_z, dim_x)
-        filter.H = np.eye(
-            dim_z,
-            dim_x,
-        )
-
-        # Measurement uncertainty (sensor noise): numpy.array(dim_z, dim_z)
-        filter.R *= self.R
-
-        # Process uncertainty: numpy.array(dim_x, dim_x)
-        # Don't decrease it too much or trackers pay too little attention to detections
-        filter.Q[dim_z:, dim_z:] *= self.Q
+        matrices = self._get_matrices(dim_x, dim_z)
+        filter = self._pool.acquire(dim_x, dim_z)
+        if filter is None:
+            filter = KalmanFilter(dim_x=dim_x, dim_z=dim_z, dtype=self.dtype)
+            filter.F = matrices["F"]
+            filter.H = matrices["H"]
+            filter._I = matrices["I"]
+            filter.R = matrices["R"].copy()
+            filter.Q = matrices["Q"].copy()
+            filter.P = matrices["P"].copy()
+        else:
+            # Reset the recycled filter in place
+            np.copyto(filter.R, matrices["R"])
+            np.copyto(filter.Q, matrices["Q"])
+            np.copyto(filter.P, matrices["P"])
+            filter.y.fill(0)
+            filter.z = np.array([[None] * dim_z]).T
 
         # Initial state: numpy.array(dim_x, 1)
         filter.x[:dim_z] = np.expand_dims(initial_detection.flatten(), 0).T
         filter.x[dim_z:] = 0
 
-        # Estimation uncertainty: numpy.array(dim_x, dim_x)
-        filter.P[dim_z:, dim_z:] *= self.P
+        filter.x_prior = filter.x.copy()
+        filter.P_prior = filter.P.copy()
+        filter.x_post = filter.x.copy()
+        filter.P_post = filter.P.copy()
 
         return filter
 
+    def release_filter(self, filter: Filter) -> None:
+        if self.pool_size > 0:
+            self._pool.release(filter)
+
 
 class NoFilter:
-    def __init__(self, dim_x, dim_z):
+    def __init__(self, dim_x, dim_z, dtype: DTypeLike = np.float64):
         self.dim_z = dim_z
-        self.x = np.zeros((dim_x, 1))
+        self.x = np.zeros((dim_x, 1), dtype=dtype)
 
     def predict(self):
         return
@@ -144,23 +235,36 @@ class NoFilterFactory(FilterFactory):
 
     Parameters
     ----------
-    FilterFactory : _type_
-        _description_
+    pool_size : int, optional
+        Maximum number of filters of each dimension kept for reuse after their tracked objects die, by default 0 (no reuse).
+    dtype : DTypeLike, optional
+        Floating point type of the filter state and covariances, by default `np.float64`.
+        Use `np.float32` together with [`Tracker(dtype=np.float32)`][norfair.tracker.Tracker] to track in single precision.
     """
 
+    def __init__(self, pool_size: int = 0, dtype: DTypeLike = np.float64):
+        self.pool_size = pool_size
+        self.dtype: np.dtype = np.dtype(dtype)
+        self._pool = _FilterPool(pool_size)
+
     def create_filter(self, initial_detection: np.ndarray):
         num_points = initial_detection.shape[0]
         dim_points = initial_detection.shape[1]
         dim_z = dim_points * num_points  # flattened positions
         dim_x = 2 * dim_z  # We need to accommodate for velocities
 
-        no_filter = NoFilter(
-            dim_x,
-            dim_z,
-        )
+        no_filter = self._pool.acquire(dim_x, dim_z)
+        if no_filter is None:
+            no_filter = NoFilter(dim_x, dim_z, dtype=self.dtype)
+        else:
+            no_filter.x[dim_z:] = 0
         no_filter.x[:dim_z] = np.expand_dims(initial_detection.flatten(), 0).T
         return no_filter
 
+    def release_filter(self, filter: Filter) -> None:
+        if self.pool_size > 0:
+            self._pool.release(filter)
+
 
 class OptimizedKalmanFilter:
     def __init__(
@@ -172,18 +276,31 @@ class OptimizedKalmanFilter:
         vel_variance: float = 1.0,
         q: float = 0.1,
         r: float = 4.0,
+        dtype: DTypeLike = np.float64,
     ):
         self.dim_z = dim_z
-        self.x = np.zeros((dim_x, 1))
+        self.x = np.zeros((dim_x, 1), dtype=dtype)
 
         # matrix P from Kalman
-        self.pos_variance = np.zeros((dim_z, 1)) + pos_variance
-        self.pos_vel_covariance = np.zeros((dim_z, 1)) + pos_vel_covariance
-        self.vel_variance = np.zeros((dim_z, 1)) + vel_variance
+        self.pos_variance = np.full((dim_z, 1), pos_variance, dtype=dtype)
+        self.pos_vel_covariance = np.full((dim_z, 1), pos_vel_covariance, dtype=dtype)
+        self.vel_variance = np.full((dim_z, 1), vel_variance, dtype=dtype)
 
         self.q_Q = q
 
-        self.default_r = r * np.ones((dim_z, 1))
+        self.default_r = np.full((dim_z, 1), r, dtype=dtype)
+
+    def reset(
+        self,
+        pos_variance: float = 10.0,
+        pos_vel_covariance: float = 0.0,
+        vel_variance: float = 1.0,
+    ):
+        """Reset the state and covariances in place, so the filter can be reused."""
+        self.x.fill(0)
+        self.pos_variance.fill(pos_variance)
+        self.pos_vel_covariance.fill(pos_vel_covariance)
+        self.vel_variance.fill(vel_variance)
 
     def predict(self):
         self.x[: self.dim_z] += self.x[self.dim_z :]
@@ -193,8 +310,8 @@ class OptimizedKalmanFilter:
             diagonal = np.diagonal(H).reshape((self.dim_z, 1))
             one_minus_diagonal = 1 - diagonal
         else:
-            diagonal = np.ones((self.dim_z, 1))
-            one_minus_diagonal = np.zeros((self.dim_z, 1))
+            diagonal = np.ones((self.dim_z, 1), dtype=self.x.dtype)
+            one_minus_diagonal = np.zeros((self.dim_z, 1), dtype=self.x.dtype)
 
         if R is not None:
             kalman_r = np.diagonal(R).reshape((self.dim_z, 1))
@@ -261,6 +378,14 @@ class OptimizedKalmanFilterFactory(FilterFactory):
         Multiplier for the initial covariance matrix estimation, only in the entries that correspond to the covariance between position and speed.
     vel_variance : float, optional
         Multiplier for the initial covariance matrix estimation, only in the entries that correspond to velocity (not position) variables.
+    pool_size : int, optional
+        Maximum number of filters of each dimension kept for reuse after their tracked objects die, by default 0 (no reuse).
+
+        When enabled, the filter of a [`TrackedObject`][norfair.tracker.TrackedObject] removed from the tracker
+        is handed to a new object, so its state must not be read after the object stops being returned by the tracker.
+    dtype : DTypeLike, optional
+        Floating point type of the filter state and covariances, by default `np.float64`.
+        Use `np.float32` together with [`Tracker(dtype=np.float32)`][norfair.tracker.Tracker] to track in single precision.
     """
 
     def __init__(
@@ -270,9 +395,14 @@ class OptimizedKalmanFilterFactory(FilterFactory):
         pos_variance: float = 10,
         pos_vel_covariance: float = 0,
         vel_variance: float = 1,
+        pool_size: int = 0,
+        dtype: DTypeLike = np.float64,
     ):
         self.R = R
         self.Q = Q
+        self.pool_size = pool_size
+        self.dtype: np.dtype = np.dtype(dtype)
+        self._pool = _FilterPool(pool_size)
 
         # entrances P matrix of KF
         self.pos_variance = pos_variance
@@ -285,15 +415,28 @@ class OptimizedKalmanFilterFactory(FilterFactory):
         dim_z = dim_points * num_points  # flattened positions
         dim_x = 2 * dim_z  # We need to accommodate for velocities
 
-        custom_filter = OptimizedKalmanFilter(
-            dim_x,
-            dim_z,
-            pos_variance=self.pos_variance,
-            pos_vel_covariance=self.pos_vel_covariance,
-            vel_variance=self.vel_variance,
-            q=self.Q,
-            r=self.R,
-        )
+        custom_filter = self._pool.acquire(dim_x, dim_z)
+        if custom_filter is None:
+            custom_filter = OptimizedKalmanFilter(
+                dim_x,
+                dim_z,
+                pos_variance=self.pos_variance,
+                pos_vel_covariance=self.pos_vel_covariance,
+                vel_variance=self.vel_variance,
+                q=self.Q,
+                r=self.R,
+                dtype=self.dtype,
+            )
+        else:
+            custom_filter.reset(
+                pos_variance=self.pos_variance,
+                pos_vel_covariance=self.pos_vel_covariance,
+                vel_variance=self.vel_variance,
+            )
         custom_filter.x[:dim_z] = np.expand_dims(initial_detection.flatten(), 0).T
 
         return custom_filter
+
+    def release_filter(self, filter: Filter) -> None:
+        if self.pool_size > 0:
+            self._pool.release(filter)
@@ -0,0 +1,90 @@
+"Frames shared by the different stages of a video processing pipeline."
+
+from collections.abc import Hashable
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    from .utils import DummyOpenCVImport
+
+    cv2 = DummyOpenCVImport()  # type: ignore[assignment, misc]
+
+
+class FramePacket:
+    """
+    A video frame together with the images derived from it.
+
+    Derived images, such as the grayscale or downscaled versions of the frame, are computed the first
+    time they are requested and then reused, so the detector, the
+    [`MotionEstimator`][norfair.camera_motion.MotionEstimator] and any other consumer of the frame
+    don't compute them again.
+
+    Derived images are computed from the frame as it is when they are first requested,
+    so they don't reflect drawings made on `image` afterwards.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        The frame, in BGR or grayscale.
+    index : Optional[int], optional
+        Position of the frame in the video, starting at 0.
+
+    Examples
+    --------
+    >>> motion_estimator = MotionEstimator()
+    >>> for packet in video.iter_frames(packets=True):
+    >>>     detections = detector(packet.downscaled(0.5))
+    >>>     coord_transformation = motion_estimator.update(packet)  # reuses packet.gray
+    """
+
+    __slots__ = ("image", "index", "_views")
+
+    def __init__(self, image: np.ndarray, index: int | None = None):
+        self.image = image
+        self.index = index
+        self._views: dict[Hashable, np.ndarray] = {}
+
+    def __repr__(self):
+        return f"FramePacket(index={self.index}, shape={self.image.shape})"
+
+    @property
+    def gray(self) -> np.ndarray:
+        """The frame in grayscale."""
+        view = self._views.get("gray")
+        if view is None:
+            if self.image.ndim == 2:
+                view = self.image
+            else:
+                view = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+            self._views["gray"] = view
+        return view
+
+    def downscaled(self, scale: float, gray: bool = False) -> np.ndarray:
+        """
+        The frame resized by `scale`.
+
+        Parameters
+        ----------
+        scale : float
+            Factor by which the width and height are multiplied.
+        gray : bool, optional
+            Whether to downscale the grayscale version of the frame.
+
+        Returns
+        -------
+        np.ndarray
+            The resized frame.
+        """
+        source = self.gray if gray else self.image
+        if scale == 1:
+            return source
+        key = ("downscaled", scale, gray)
+        view = self._views.get(key)
+        if view is None:
+            view = cv2.resize(
+                source, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+            self._views[key] = view
+        return view
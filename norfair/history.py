@@ -0,0 +1,353 @@
+"""Shared storage of the past estimates of tracked objects."""
+
+import itertools
+import os
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from .tracker import TrackedObject
+
+
+class _Chunk:
+    """Rows of the history stored in columns: id, frame and estimate, sorted by frame."""
+
+    __slots__ = ("ids", "frames", "estimates", "size", "files")
+
+    def __init__(self, ids: np.ndarray, frames: np.ndarray, estimates: np.ndarray):
+        self.ids = ids
+        self.frames = frames
+        self.estimates = estimates
+        self.size = len(ids)
+        # files backing the columns when the chunk is spilled to disk
+        self.files: list[str] = []
+
+    @property
+    def first_frame(self) -> int:
+        return self.frames[0]
+
+    @property
+    def last_frame(self) -> int:
+        return self.frames[self.size - 1]
+
+    def columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (
+            self.ids[: self.size],
+            self.frames[: self.size],
+            self.estimates[: self.size],
+        )
+
+    def remove_files(self):
+        for file in self.files:
+            os.remove(file)
+        self.files = []
+
+
+class TrackHistory:
+    """
+    History of the estimates of tracked objects, shared by all the consumers of a tracker.
+
+    Every call to [`update`][norfair.history.TrackHistory.update] appends a row with the id, the frame and
+    the estimate of each tracked object. Rows are stored in columns, in chunks of `chunk_size` rows,
+    so appending never copies the history, and chunks can be spilled to memory mapped files to keep
+    long histories out of memory. The history can then be queried for the last estimates of some
+    objects, or for the objects that went through a region of the frame.
+
+    Objects that haven't been updated for `retention` frames are considered dead, they aren't returned by
+    the queries and their rows are removed from the history, in batches, to bound its size.
+
+    Parameters
+    ----------
+    retention : Optional[int], optional
+        Number of frames during which the history of an object is kept after its last update.
+        By default histories are never removed.
+    chunk_size : int, optional
+        Number of rows of each chunk.
+    path : Optional[str], optional
+        Directory in which full chunks are saved and then memory mapped. By default chunks are kept in memory.
+    absolute : bool, optional
+        Store the estimates in absolute coordinates, which requires the tracker to be updated with a coordinate
+        transformation. Needed to share the history with [`AbsolutePaths`][norfair.drawing.AbsolutePaths].
+
+    Examples
+    --------
+    >>> history = TrackHistory(retention=100)
+    >>> for frame in video:
+    >>>     tracked_objects = tracker.update(detections)
+    >>>     history.update(tracked_objects)
+    >>>     tails = history.last_estimates([obj.id for obj in tracked_objects], 10)
+    >>> crossed = history.query_box([0, 0], [100, 100], start_frame=0, end_frame=50)
+    """
+
+    def __init__(
+        self,
+        retention: int | None = None,
+        chunk_size: int = 4096,
+        path: str | None = None,
+        absolute: bool = False,
+    ):
+        if retention is not None and retention < 1:
+            raise ValueError(
+                f"Argument `retention` should be at least 1, not {retention}."
+            )
+        if chunk_size < 1:
+            raise ValueError(
+                f"Argument `chunk_size` should be at least 1, not {chunk_size}."
+            )
+        self.retention = retention
+        self.chunk_size = chunk_size
+        self.path = path
+        self.absolute = absolute
+        self.frame_number = -1
+
+        self._chunks: list[_Chunk] = []
+        self._active: _Chunk | None = None
+        self._estimate_shape: tuple[int, ...] | None = None
+        self._last_seen: dict[int, int] = {}
+        self._last_eviction = 0
+        self._file_counter = itertools.count()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        """Number of rows in the history."""
+        return sum(chunk.size for chunk in self._all_chunks())
+
+    def _all_chunks(self) -> list[_Chunk]:
+        if self._active is None or self._active.size == 0:
+            return self._chunks
+        return self._chunks + [self._active]
+
+    def update(
+        self, tracked_objects: Sequence[TrackedObject], frame_number: int | None = None
+    ):
+        """
+        Append the estimates of the tracked objects of a frame to the history.
+
+        Parameters
+        ----------
+        tracked_objects : Sequence[TrackedObject]
+            The objects returned by [`Tracker.update`][norfair.tracker.Tracker.update].
+        frame_number : Optional[int], optional
+            Number of the frame, by default the one after the previous update, starting at 0.
+        """
+        if frame_number is None:
+            frame_number = self.frame_number + 1
+        elif frame_number < self.frame_number:
+            raise ValueError(
+                f"Frames should be added in order, frame {frame_number} was added after frame {self.frame_number}."
+            )
+        self.frame_number = frame_number
+
+        if tracked_objects:
+            estimates = np.stack(
+                [obj.get_estimate(absolute=self.absolute) for obj in tracked_objects]
+            )
+            if self._estimate_shape is None:
+                self._estimate_shape = estimates.shape[1:]
+            elif estimates.shape[1:] != self._estimate_shape:
+                raise ValueError(
+                    f"All the estimates should have the same shape, expected {self._estimate_shape}, got {estimates.shape[1:]}."
+                )
+            ids = []
+            for obj in tracked_objects:
+                assert obj.id is not None  # Only initialized objects are returned
+                ids.append(obj.id)
+            self._append(np.array(ids, dtype=np.int64), estimates)
+            self._last_seen.update(dict.fromkeys(ids, frame_number))
+
+        # dead tracks are removed in batches, as it requires rewriting the chunks where they are
+        if self.retention is not None and frame_number - self._last_eviction >= max(
+            self.retention // 4, 1
+        ):
+            self._evict()
+            self._last_eviction = frame_number
+
+    def _append(self, ids: np.ndarray, estimates: np.ndarray):
+        start = 0
+        while start < len(ids):
+            if self._active is None:
+                self._active = _Chunk(
+                    np.empty(self.chunk_size, dtype=np.int64),
+                    np.empty(self.chunk_size, dtype=np.int64),
+                    np.empty((self.chunk_size,) + estimates.shape[1:]),
+                )
+                self._active.size = 0
+            chunk = self._active
+            count = min(len(ids) - start, self.chunk_size - chunk.size)
+            end = chunk.size + count
+            chunk.ids[chunk.size : end] = ids[start : start + count]
+            chunk.frames[chunk.size : end] = self.frame_number
+            chunk.estimates[chunk.size : end] = estimates[start : start + count]
+            chunk.size = end
+            start += count
+            if chunk.size == self.chunk_size:
+                self._chunks.append(self._seal(*chunk.columns()))
+                self._active = None
+
+    def _seal(
+        self, ids: np.ndarray, frames: np.ndarray, estimates: np.ndarray
+    ) -> _Chunk:
+        """Chunk with the given columns, saved and memory mapped if the history has a `path`."""
+        if self.path is None:
+            return _Chunk(ids, frames, estimates)
+        number = next(self._file_counter)
+        files = [
+            os.path.join(self.path, f"chunk_{number}_{column}.npy")
+            for column in ("ids", "frames", "estimates")
+        ]
+        for file, column in zip(files, (ids, frames, estimates)):
+            np.save(file, column)
+        chunk = _Chunk(*(np.load(file, mmap_mode="r") for file in files))
+        chunk.files = files
+        return chunk
+
+    def _is_alive(self, id: int) -> bool:
+        return (
+            self.retention is None
+            or self.frame_number - self._last_seen[id] < self.retention
+        )
+
+    def _evict(self):
+        """Remove the rows of the objects that haven't been updated during the retention window."""
+        dead = [id for id in self._last_seen if not self._is_alive(id)]
+        if not dead:
+            return
+        last_dead_frame = max(self._last_seen[id] for id in dead)
+        for id in dead:
+            del self._last_seen[id]
+        dead_ids = np.array(dead, dtype=np.int64)
+
+        chunks = []
+        for chunk in self._chunks:
+            # rows are sorted by frame, so later chunks don't contain dead objects
+            if chunk.first_frame > last_dead_frame:
+                chunks.append(chunk)
+                continue
+            ids, frames, estimates = chunk.columns()
+            keep = ~np.isin(ids, dead_ids)
+            if keep.all():
+                chunks.append(chunk)
+                continue
+            chunk.remove_files()
+            if keep.any():
+                chunks.append(self._seal(ids[keep], frames[keep], estimates[keep]))
+        self._chunks = chunks
+
+        if self._active is not None and self._active.size > 0:
+            active = self._active
+            keep = ~np.isin(active.ids[: active.size], dead_ids)
+            size = int(keep.sum())
+            for column in (active.ids, active.frames, active.estimates):
+                column[:size] = column[: active.size][keep]
+            active.size = size
+
+    def last_estimates(self, ids: Iterable[int], n: int) -> dict[int, np.ndarray]:
+        """
+        The last `n` estimates of each of the given objects.
+
+        Parameters
+        ----------
+        ids : Iterable[int]
+            Ids of the objects.
+        n : int
+            Maximum number of estimates of each object.
+
+        Returns
+        -------
+        Dict[int, np.ndarray]
+            The estimates of each object with history, from oldest to newest,
+            in an array of shape `(min(n, length of the history), num_points, dim_points)`.
+        """
+        remaining = {
+            id: n for id in ids if id in self._last_seen and self._is_alive(id)
+        }
+        pieces: dict[int, list[np.ndarray]] = {id: [] for id in remaining}
+        for chunk in reversed(self._all_chunks()):
+            if not remaining:
+                break
+            chunk_ids, _, estimates = chunk.columns()
+            rows = np.flatnonzero(
+                np.isin(chunk_ids, np.fromiter(remaining, dtype=np.int64))
+            )[::-1]
+            row_ids = chunk_ids[rows]
+            for id in np.unique(row_ids).tolist():
+                selected = rows[row_ids == id][: remaining[id]]
+                pieces[id].append(estimates[selected])
+                remaining[id] -= len(selected)
+                if remaining[id] == 0:
+                    del remaining[id]
+        return {
+            id: np.concatenate(id_pieces)[::-1]
+            for id, id_pieces in pieces.items()
+            if id_pieces
+        }
+
+    def query_box(
+        self,
+        top_left: Sequence[float],
+        bottom_right: Sequence[float],
+        start_frame: int | None = None,
+        end_frame: int | None = None,
+    ) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """
+        The objects whose center was inside a box between two frames.
+
+        The center of an object is the mean of the points of its estimate.
+
+        Parameters
+        ----------
+        top_left : Sequence[float]
+            Smallest coordinates of the box, on each axis.
+        bottom_right : Sequence[float]
+            Largest coordinates of the box, on each axis.
+        start_frame : Optional[int], optional
+            First frame of the query, by default the oldest in the history.
+        end_frame : Optional[int], optional
+            Last frame of the query, included, by default the newest.
+
+        Returns
+        -------
+        Dict[int, Tuple[np.ndarray, np.ndarray]]
+            The frames in which each object was inside the box, and its estimates on them.
+        """
+        first_frame = -np.inf if start_frame is None else start_frame
+        last_frame = np.inf if end_frame is None else end_frame
+        low = np.asarray(top_left)
+        high = np.asarray(bottom_right)
+
+        found_ids, found_frames, found_estimates = [], [], []
+        for chunk in self._all_chunks():
+            if chunk.last_frame < first_frame or chunk.first_frame > last_frame:
+                continue
+            ids, frames, estimates = chunk.columns()
+            start = np.searchsorted(frames, first_frame)
+            end = np.searchsorted(frames, last_frame, side="right")
+            centers = estimates[start:end].mean(axis=1)
+            rows = start + np.flatnonzero(
+                np.all((centers >= low) & (centers <= high), axis=1)
+            )
+            found_ids.append(ids[rows])
+            found_frames.append(frames[rows])
+            found_estimates.append(estimates[rows])
+        if not found_ids:
+            return {}
+
+        ids = np.concatenate(found_ids)
+        frames = np.concatenate(found_frames)
+        estimates = np.concatenate(found_estimates)
+        order = np.argsort(ids, kind="stable")
+        unique_ids, starts = np.unique(ids[order], return_index=True)
+        return {
+            id: (frames[rows], estimates[rows])
+            for id, rows in zip(unique_ids.tolist(), np.split(order, starts[1:]))
+            if self._is_alive(id)
+        }
+
+    def close(self):
+        """Remove the files of the chunks spilled to disk."""
+        for chunk in self._chunks:
+            chunk.remove_files()
+        self._chunks = []
+        self._active = None
+        self._last_seen = {}
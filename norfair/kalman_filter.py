@@ -392,6 +392,11 @@ class KalmanFilter:
         size of the control input, if it is being used.
         Default value of 0 indicates it is not used.
 
+    dtype : numpy dtype (optional)
+        Floating point type of the state and all the matrices, by default
+        float64. With lower precision types the system uncertainty S is
+        still inverted in float64.
+
     compute_log_likelihood : bool (default = True)
         Computes log likelihood by default, but this can be a slow
         computation, so if you never use it you can turn this computation
@@ -491,7 +496,7 @@ class KalmanFilter:
 
     """
 
-    def __init__(self, dim_x, dim_z, dim_u=0):
+    def __init__(self, dim_x, dim_z, dim_u=0, dtype=np.float64):
         if dim_x < 1:
             raise ValueError("dim_x must be 1 or greater")
         if dim_z < 1:
@@ -502,28 +507,31 @@ class KalmanFilter:
         self.dim_x = dim_x
         self.dim_z = dim_z
         self.dim_u = dim_u
+        self.dtype = np.dtype(dtype)
 
-        self.x = zeros((dim_x, 1))  # state
-        self.P = eye(dim_x)  # uncertainty covariance
-        self.Q = eye(dim_x)  # process uncertainty
+        self.x = zeros((dim_x, 1), dtype=dtype)  # state
+        self.P = eye(dim_x, dtype=dtype)  # uncertainty covariance
+        self.Q = eye(dim_x, dtype=dtype)  # process uncertainty
         self.B = None  # control transition matrix
-        self.F = eye(dim_x)  # state transition matrix
-        self.H = zeros((dim_z, dim_x))  # measurement function
-        self.R = eye(dim_z)  # measurement uncertainty
+        self.F = eye(dim_x, dtype=dtype)  # state transition matrix
+        self.H = zeros((dim_z, dim_x), dtype=dtype)  # measurement function
+        self.R = eye(dim_z, dtype=dtype)  # measurement uncertainty
         self._alpha_sq = 1.0  # fading memory control
-        self.M = np.zeros((dim_x, dim_z))  # process-measurement cross correlation
+        # process-measurement cross correlation
+        self.M = np.zeros((dim_x, dim_z), dtype=dtype)
         self.z = np.array([[None] * self.dim_z]).T
 
         # gain and residual are computed during the innovation step. We
         # save them so that in case you want to inspect them for various
         # purposes
-        self.K = np.zeros((dim_x, dim_z))  # kalman gain
-        self.y = zeros((dim_z, 1))
-        self.S = np.zeros((dim_z, dim_z))  # system uncertainty
-        self.SI = np.zeros((dim_z, dim_z))  # inverse system uncertainty
+        self.K = np.zeros((dim_x, dim_z), dtype=dtype)  # kalman gain
+        self.y = zeros((dim_z, 1), dtype=dtype)
+        self.S = np.zeros((dim_z, dim_z), dtype=dtype)  # system uncertainty
+        # inverse system uncertainty
+        self.SI = np.zeros((dim_z, dim_z), dtype=dtype)
 
         # identity matrix. Do not alter this.
-        self._I = np.eye(dim_x)
+        self._I = np.eye(dim_x, dtype=dtype)
 
         # these will always be a copy of x,P after predict() is called
         self.x_prior = self.x.copy()
@@ -620,13 +628,13 @@ class KalmanFilter:
             self.z = np.array([[None] * self.dim_z]).T
             self.x_post = self.x.copy()
             self.P_post = self.P.copy()
-            self.y = zeros((self.dim_z, 1))
+            self.y = zeros((self.dim_z, 1), dtype=self.dtype)
             return
 
         if R is None:
             R = self.R
         elif isscalar(R):
-            R = eye(self.dim_z) * R
+            R = eye(self.dim_z, dtype=self.dtype) * R
 
         if H is None:
             z = reshape_z(z, self.dim_z, self.x.ndim)
@@ -642,7 +650,11 @@ class KalmanFilter:
         # S = HPH' + R
         # project system uncertainty into measurement space
         self.S = dot(H, PHT) + R
-        self.SI = self.inv(self.S)
+        if self.S.dtype == np.float64:
+            self.SI = self.inv(self.S)
+        else:
+            # S can be badly conditioned, invert it in double precision
+            self.SI = self.inv(self.S.astype(np.float64)).astype(self.S.dtype)
         # K = PH'inv(S)
         # map system uncertainty into kalman gain
         self.K = dot(PHT, self.SI)
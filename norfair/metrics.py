@@ -1,9 +1,16 @@
+import contextlib
 import os
-from collections import OrderedDict
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from functools import cached_property
+from logging import warning
 
 import numpy as np
 from rich import print
 from rich.progress import track
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from norfair import Detection
 
@@ -39,11 +46,21 @@ class InformationFile:
             return result
 
 
+# Line of a tracked object in the MOTChallenge format:
+# frame_number, id, bb_left, bb_top, bb_width, bb_height, -1, -1, -1, -1
+_MOT_ROW_FORMAT = "%d,%d,%s,%s,%s,%s,-1,-1,-1,-1\n"
+
+
 class PredictionsTextFile:
     """Generates a text file with your predicted tracked objects, in the MOTChallenge format.
     It needs the 'input_path', which is the path to the sequence being processed,
     the 'save_path', and optionally the 'information_file' (in case you don't give an
     'information_file', is assumed there is one in the input_path folder).
+
+    The rows are buffered and written in blocks of `buffer_size` rows, the file is flushed and
+    closed after the last frame of the sequence, or when calling `close`.
+    With `binary=True` the rows are also saved in a `.npy` file next to the text file when it's closed,
+    as an array of shape `(rows, 10)`.
     """
 
     def __init__(
@@ -51,6 +68,8 @@ class PredictionsTextFile:
         input_path: str,
         save_path: str = ".",
         information_file: InformationFile | None = None,
+        buffer_size: int = 10000,
+        binary: bool = False,
     ):
         file_name = os.path.split(input_path)[1]
 
@@ -70,68 +89,151 @@ class PredictionsTextFile:
 
         out_file_name = os.path.join(predictions_folder, file_name + ".txt")
         self.text_file = open(out_file_name, "w+")
+        self.binary_path = (
+            os.path.join(predictions_folder, file_name + ".npy") if binary else None
+        )
+
+        self.buffer_size = buffer_size
+        # rows of each frame, with the dtype of the estimates their boxes are printed in
+        self._pending_rows: list[tuple[np.ndarray, np.dtype]] = []
+        self._num_pending_rows = 0
+        self._all_rows = _GrowableArray(num_columns=10) if binary else None
 
         self.frame_number = 1
 
     def update(self, predictions, frame_number=None):
-        if frame_number is None:
-            frame_number = self.frame_number
         """
         Write tracked object information in the output file (for this frame), in the format
         frame_number, id, bb_left, bb_top, bb_width, bb_height, -1, -1, -1, -1
         """
-        for obj in predictions:
-            frame_str = str(int(frame_number))
-            id_str = str(int(obj.id))
-            bb_left_str = str(obj.estimate[0, 0])
-            bb_top_str = str(obj.estimate[0, 1])  # [0,1]
-            bb_width_str = str(obj.estimate[1, 0] - obj.estimate[0, 0])
-            bb_height_str = str(obj.estimate[1, 1] - obj.estimate[0, 1])
-            row_text_out = (
-                frame_str
-                + ","
-                + id_str
-                + ","
-                + bb_left_str
-                + ","
-                + bb_top_str
-                + ","
-                + bb_width_str
-                + ","
-                + bb_height_str
-                + ",-1,-1,-1,-1"
-            )
-            self.text_file.write(row_text_out)
-            self.text_file.write("\n")
+        if frame_number is None:
+            frame_number = self.frame_number
+        rows = _predictions_to_rows(predictions, frame_number)
+        if len(rows) > 0:
+            self._pending_rows.append((rows, predictions[0].estimate.dtype))
+            self._num_pending_rows += len(rows)
+            if self._all_rows is not None:
+                self._all_rows.extend(rows)
+            if self._num_pending_rows >= self.buffer_size:
+                self.flush()
 
         self.frame_number += 1
 
         if self.frame_number > self.length:
-            self.text_file.close()
+            self.close()
+
+    def flush(self):
+        """Write the buffered rows to the text file."""
+        if self._pending_rows:
+            self.text_file.write(
+                "".join(
+                    [
+                        _format_mot_rows(rows, dtype)
+                        for rows, dtype in self._pending_rows
+                    ]
+                )
+            )
+            self._pending_rows = []
+            self._num_pending_rows = 0
+        self.text_file.flush()
+
+    def close(self):
+        """Write the buffered rows and close the files."""
+        if self.text_file.closed:
+            return
+        self.flush()
+        self.text_file.close()
+        if self._all_rows is not None and self.binary_path is not None:
+            np.save(self.binary_path, self._all_rows.array)
+
+
+def _format_mot_rows(rows: np.ndarray, dtype: np.dtype) -> str:
+    """
+    Text of rows in the MOTChallenge format, with the boxes printed as values of `dtype`,
+    so float32 estimates are written with their shortest float32 representation.
+    """
+    ids = rows[:, :2].tolist()
+    if dtype == np.float64:
+        boxes = rows[:, 2:6].tolist()
+    else:
+        # numpy scalars are printed with the precision of their own dtype
+        boxes = [list(box) for box in rows[:, 2:6].astype(dtype)]
+    return "".join(
+        [_MOT_ROW_FORMAT % (*row_ids, *box) for row_ids, box in zip(ids, boxes)]
+    )
+
+
+def _predictions_to_rows(predictions, frame_number) -> np.ndarray:
+    """
+    Rows in the MOTChallenge format of the tracked objects of a frame, read all at once:
+    frame_number, id, bb_left, bb_top, bb_width, bb_height, -1, -1, -1, -1
+    """
+    rows = np.full((len(predictions), 10), -1.0)
+    if len(predictions) == 0:
+        return rows
+    boxes = np.stack([obj.estimate for obj in predictions])
+    rows[:, 0] = frame_number
+    rows[:, 1] = [obj.id for obj in predictions]
+    rows[:, 2:4] = boxes[:, 0]
+    rows[:, 4:6] = boxes[:, 1] - boxes[:, 0]
+    return rows
+
+
+class _GrowableArray:
+    """2D array to which rows are appended, doubling its capacity when it's full."""
+
+    def __init__(self, num_columns: int, capacity: int = 1024):
+        self._data = np.empty((capacity, num_columns))
+        self._size = 0
+
+    def extend(self, rows: np.ndarray):
+        end = self._size + len(rows)
+        if end > len(self._data):
+            data = np.empty((max(end, 2 * len(self._data)), self._data.shape[1]))
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+        self._data[self._size : end] = rows
+        self._size = end
+
+    @property
+    def array(self) -> np.ndarray:
+        """View of the rows appended so far."""
+        return self._data[: self._size]
 
 
 class DetectionFileParser:
-    """Get Norfair detections from MOTChallenge text files containing detections"""
+    """Get Norfair detections from MOTChallenge text files containing detections
+
+    The detections of a frame are only turned into [`Detection`][norfair.tracker.Detection] objects
+    when the frame is requested.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the sequence, containing the `det/det.txt` file.
+    information_file : Optional[InformationFile], optional
+        The `seqinfo.ini` file of the sequence, by default the one in `input_path`.
+    cache : bool, optional
+        Save the parsed detections in a binary `det/det.npy` file the first time, and memory map it
+        afterwards instead of parsing the text file again, by default `False`.
+        The cache is rebuilt if `det/det.txt` is modified.
+    """
 
     def __init__(
-        self, input_path: str, information_file: InformationFile | None = None
+        self,
+        input_path: str,
+        information_file: InformationFile | None = None,
+        cache: bool = False,
     ):
         self.frame_number = 1
 
         # Get detecions matrix data with rows corresponding to:
         # frame, id, bb_left, bb_top, bb_right, bb_down, conf, x, y, z
         detections_path = os.path.join(input_path, "det/det.txt")
-
-        self.matrix_detections = np.loadtxt(detections_path, dtype="f", delimiter=",")
-        row_order = np.argsort(self.matrix_detections[:, 0])
-        self.matrix_detections = self.matrix_detections[row_order]
-        # Coordinates refer to box corners
-        self.matrix_detections[:, 4] = (
-            self.matrix_detections[:, 2] + self.matrix_detections[:, 4]
-        )
-        self.matrix_detections[:, 5] = (
-            self.matrix_detections[:, 3] + self.matrix_detections[:, 5]
-        )
+        if cache:
+            self.matrix_detections = _load_cached_detections(detections_path)
+        else:
+            self.matrix_detections = _parse_detections(detections_path)
 
         if information_file is None:
             seqinfo_path = os.path.join(input_path, "seqinfo.ini")
@@ -143,23 +245,35 @@ class DetectionFileParser:
             int(seq_length) if isinstance(seq_length, str) else seq_length
         )
 
-        self.sorted_by_frame = []
-        for frame_number in range(1, self.length + 1):
-            self.sorted_by_frame.append(self.get_dets_from_frame(frame_number))
+        # The rows of frame i are the ones in [frame_offsets[i - 1], frame_offsets[i])
+        self._frame_offsets = np.searchsorted(
+            self.matrix_detections[:, 0], np.arange(1, self.length + 2) - 0.5
+        )
+
+    @cached_property
+    def sorted_by_frame(self) -> list[list[Detection]]:
+        """The detections of every frame of the sequence, built on the first access."""
+        return [
+            _detections_from_rows(self.get_frame_matrix(frame_number))
+            for frame_number in range(1, self.length + 1)
+        ]
+
+    def get_frame_matrix(self, frame_number: int) -> np.ndarray:
+        """
+        The rows of the detections of a frame, without building `Detection` objects.
+
+        The columns are: frame, id, bb_left, bb_top, bb_right, bb_down, conf, x, y, z.
+        The result is a view of the detections of the whole sequence, it must not be modified.
+        """
+        if not 1 <= frame_number <= self.length:
+            return self.matrix_detections[:0]
+        return self.matrix_detections[
+            self._frame_offsets[frame_number - 1] : self._frame_offsets[frame_number]
+        ]
 
     def get_dets_from_frame(self, frame_number):
         """this function returns a list of norfair Detections class, corresponding to frame=frame_number"""
-
-        indexes = np.argwhere(self.matrix_detections[:, 0] == frame_number)
-        detections = []
-        if len(indexes) > 0:
-            actual_det = self.matrix_detections[indexes]
-            actual_det = actual_det.reshape(actual_det.shape[0], actual_det.shape[2])
-            for det in actual_det:
-                points = np.array([[det[2], det[3]], [det[4], det[5]]])
-                conf = det[6]
-                new_detection = Detection(points, np.array([conf, conf]))
-                detections.append(new_detection)
+        detections = _detections_from_rows(self.get_frame_matrix(frame_number))
         self.actual_detections = detections
         return detections
 
@@ -170,22 +284,75 @@ class DetectionFileParser:
     def __next__(self):
         if self.frame_number <= self.length:
             self.frame_number += 1
-            # Frame_number is always 1 unit bigger than the corresponding index in self.sorted_by_frame, and
-            # also we just incremented the frame_number, so now is 2 units bigger than the corresponding index
-            return self.sorted_by_frame[self.frame_number - 2]
+            return self.get_dets_from_frame(self.frame_number - 1)
 
         raise StopIteration()
 
 
+def _detections_from_rows(rows: np.ndarray) -> list[Detection]:
+    """Detections of the rows of a parsed `det.txt`, whose boxes are corners."""
+    detections = []
+    for det in rows:
+        points = np.array([[det[2], det[3]], [det[4], det[5]]])
+        conf = det[6]
+        detections.append(Detection(points, np.array([conf, conf])))
+    return detections
+
+
+def _parse_detections(detections_path: str) -> np.ndarray:
+    """Detections of a MOTChallenge `det.txt` file sorted by frame, with the boxes as corners."""
+    matrix_detections = np.loadtxt(detections_path, dtype="f", delimiter=",", ndmin=2)
+    row_order = np.argsort(matrix_detections[:, 0], kind="stable")
+    matrix_detections = matrix_detections[row_order]
+    # Coordinates refer to box corners
+    matrix_detections[:, 4] = matrix_detections[:, 2] + matrix_detections[:, 4]
+    matrix_detections[:, 5] = matrix_detections[:, 3] + matrix_detections[:, 5]
+    return matrix_detections
+
+
+def _load_cached_detections(detections_path: str) -> np.ndarray:
+    """Memory map the parsed detections of `det.txt`, parsing them if they aren't in the cache."""
+    cache_path = os.path.splitext(detections_path)[0] + ".npy"
+    if not (
+        os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(detections_path)
+    ):
+        matrix_detections = _parse_detections(detections_path)
+        # written to a temporary file first, so concurrent runs never read half a cache
+        temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "wb") as cache_file:
+                np.save(cache_file, matrix_detections)
+            os.replace(temporary_path, cache_path)
+        except OSError as e:
+            warning(f"Couldn't cache the detections in {cache_path}: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(temporary_path)
+            return matrix_detections
+    return np.load(cache_path, mmap_mode="r")
+
+
 class Accumulators:
-    def __init__(self):
+    """
+    Collect the predictions of several MOTChallenge sequences and evaluate them.
+
+    Parameters
+    ----------
+    native : bool, optional
+        Compute the metrics with [`eval_mot_challenge`][norfair.metrics.eval_mot_challenge] instead of `motmetrics`,
+        so it doesn't need to be installed. The summary is then a dictionary instead of a `pandas.DataFrame`.
+    """
+
+    def __init__(self, native: bool = False):
+        self.native = native
         self.matrixes_predictions = []
         self.paths = []
 
     def create_accumulator(self, input_path, information_file=None):
-        # Check that motmetrics is installed here, so we don't have to process
-        # the whole dataset before failing out if we don't.
-        mm.metrics  # noqa: B018 — intentional attribute access to fail early if motmetrics not installed
+        if not self.native:
+            # Check that motmetrics is installed here, so we don't have to process
+            # the whole dataset before failing out if we don't.
+            mm.metrics  # noqa: B018 — intentional attribute access to fail early if motmetrics not installed
 
         file_name = os.path.split(input_path)[1]
 
@@ -194,7 +361,7 @@ class Accumulators:
         # pyrefly: ignore[bad-assignment]
         self.paths = np.hstack((self.paths, input_path))
         # Initialize a matrix where we will save our predictions for this video (in the MOTChallenge format)
-        self.matrix_predictions = []
+        self._predictions_buffer = _GrowableArray(num_columns=10)
 
         # Initialize progress bar
         if information_file is None:
@@ -209,36 +376,24 @@ class Accumulators:
             track(range(length_int - 1), description=file_name, transient=False)
         )
 
+    @property
+    def matrix_predictions(self) -> np.ndarray:
+        """Predictions of the current video so far, one row per tracked object and frame in the MOTChallenge format."""
+        return self._predictions_buffer.array
+
     def update(self, predictions=None):
         # Get the tracked boxes from this frame in an array
         if predictions is not None:
-            for obj in predictions:
-                new_row = [
-                    self.frame_number,
-                    obj.id,
-                    obj.estimate[0, 0],
-                    obj.estimate[0, 1],
-                    obj.estimate[1, 0] - obj.estimate[0, 0],
-                    obj.estimate[1, 1] - obj.estimate[0, 1],
-                    -1,
-                    -1,
-                    -1,
-                    -1,
-                ]
-                if np.shape(self.matrix_predictions)[0] == 0:
-                    self.matrix_predictions = new_row
-                else:
-                    self.matrix_predictions = (
-                        np.vstack(  # pyrefly: ignore[bad-assignment]
-                            (self.matrix_predictions, new_row)
-                        )
-                    )
+            self._predictions_buffer.extend(
+                _predictions_to_rows(predictions, self.frame_number)
+            )
         self.frame_number += 1
         # Advance in progress bar
         try:
             next(self.progress_bar_iter)
         except StopIteration:
-            self.matrixes_predictions.append(self.matrix_predictions)
+            # copy, so the spare capacity of the buffer is released
+            self.matrixes_predictions.append(self.matrix_predictions.copy())
             return
 
     def compute_metrics(
@@ -246,6 +401,15 @@ class Accumulators:
         metrics=None,
         generate_overall=True,
     ):
+        if self.native:
+            self.summary_text, self.summary_dataframe = eval_mot_challenge(
+                matrixes_predictions=self.matrixes_predictions,
+                paths=self.paths,
+                metrics=metrics,
+                generate_overall=generate_overall,
+            )
+            return self.summary_dataframe
+
         if metrics is None:
             metrics = list(mm.metrics.motchallenge_metrics)
 
@@ -376,3 +540,563 @@ def eval_motChallenge(matrixes_predictions, paths, metrics=None, generate_overal
         namemap=mm.io.motchallenge_metric_names,
     )
     return summary_text, summary_dataframe
+
+
+MOT_CHALLENGE_METRICS = (
+    "idf1",
+    "idp",
+    "idr",
+    "recall",
+    "precision",
+    "num_unique_objects",
+    "mostly_tracked",
+    "partially_tracked",
+    "mostly_lost",
+    "num_false_positives",
+    "num_misses",
+    "num_switches",
+    "num_fragmentations",
+    "mota",
+    "motp",
+    "num_transfer",
+    "num_ascend",
+    "num_migrate",
+)
+"""Metrics reported by [`eval_mot_challenge`][norfair.metrics.eval_mot_challenge], the same as `motmetrics.metrics.motchallenge_metrics`."""
+
+# Column names and formats of the rendered summary, the same as motmetrics' ones
+_METRIC_NAMES = {
+    "idf1": "IDF1",
+    "idp": "IDP",
+    "idr": "IDR",
+    "recall": "Rcll",
+    "precision": "Prcn",
+    "num_unique_objects": "GT",
+    "mostly_tracked": "MT",
+    "partially_tracked": "PT",
+    "mostly_lost": "ML",
+    "num_false_positives": "FP",
+    "num_misses": "FN",
+    "num_switches": "IDs",
+    "num_fragmentations": "FM",
+    "mota": "MOTA",
+    "motp": "MOTP",
+    "num_transfer": "IDt",
+    "num_ascend": "IDa",
+    "num_migrate": "IDm",
+}
+_PERCENTAGE_METRICS = {"idf1", "idp", "idr", "recall", "precision", "mota"}
+
+
+def _iou_distances(
+    gt_boxes: np.ndarray, predicted_boxes: np.ndarray, max_distance: float
+) -> np.ndarray:
+    """
+    1 - IoU between every pair of `(x, y, width, height)` boxes, `nan` for pairs farther than `max_distance`.
+
+    The arithmetic follows `motmetrics.distances.iou_matrix`, so both produce the same distances.
+    """
+    gt_min = gt_boxes[:, None, :2]
+    gt_max = gt_min + gt_boxes[:, None, 2:4]
+    predicted_min = predicted_boxes[None, :, :2]
+    predicted_max = predicted_min + predicted_boxes[None, :, 2:4]
+
+    intersection_size = np.maximum(
+        np.minimum(gt_max, predicted_max) - np.maximum(gt_min, predicted_min), 0
+    )
+    intersection = np.prod(intersection_size, axis=-1)
+    gt_area = np.prod(np.maximum(gt_max - gt_min, 0), axis=-1)
+    predicted_area = np.prod(np.maximum(predicted_max - predicted_min, 0), axis=-1)
+    union = gt_area + predicted_area - intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = np.where(intersection == 0, 0.0, intersection / union)
+    distances = 1 - iou
+    distances[distances > max_distance] = np.nan
+    return distances
+
+
+def _assign(costs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum cost assignment of a cost matrix where `nan` marks pairs that can't be matched.
+
+    Invalid pairs are replaced by a cost larger than any assignment of valid pairs, as
+    motmetrics does, so the largest number of valid pairs is matched and ties are broken
+    in the same way.
+    """
+    valid = np.isfinite(costs)
+    if not valid.any():
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    if not valid.all():
+        largest = np.abs(costs[valid]).max() + 1
+        costs = np.where(valid, costs, 2 * min(costs.shape) * largest + 1)
+    rows, columns = linear_sum_assignment(costs)
+    matched = valid[rows, columns]
+    return rows[matched], columns[matched]
+
+
+def _max_overlap_matching(pair_counts: Counter) -> int:
+    """
+    Total count of the bipartite matching of ground truth and predicted ids with the largest count.
+
+    `pair_counts` maps `(gt_id, predicted_id)` pairs to the number of frames in which they could be matched.
+    The problem is split in the connected components of the pairs, which are usually small,
+    so no dense matrix of all the ids is ever built.
+    """
+    if not pair_counts:
+        return 0
+    pairs = list(pair_counts)
+    gt_ids, gt_index = np.unique([gt_id for gt_id, _ in pairs], return_inverse=True)
+    predicted_ids, predicted_index = np.unique(
+        [predicted_id for _, predicted_id in pairs], return_inverse=True
+    )
+    counts = np.fromiter(pair_counts.values(), dtype=float, count=len(pairs))
+    num_gt = len(gt_ids)
+
+    graph = coo_matrix(
+        (np.ones(len(pairs)), (gt_index, num_gt + predicted_index)),
+        shape=(num_gt + len(predicted_ids),) * 2,
+    )
+    _, components = connected_components(graph, directed=False)
+    pair_components = components[gt_index]
+
+    total = 0.0
+    for component in np.unique(pair_components):
+        in_component = pair_components == component
+        rows, row_index = np.unique(gt_index[in_component], return_inverse=True)
+        columns, column_index = np.unique(
+            predicted_index[in_component], return_inverse=True
+        )
+        weights = np.zeros((len(rows), len(columns)))
+        weights[row_index, column_index] = counts[in_component]
+        matched_rows, matched_columns = linear_sum_assignment(weights, maximize=True)
+        total += weights[matched_rows, matched_columns].sum()
+    return int(total)
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator != 0 else float("nan")
+
+
+class _MOTAccumulator:
+    """
+    Matches the ground truth and predicted boxes of a sequence frame by frame, and counts
+    the events from which CLEAR-MOT and identity metrics are computed.
+
+    The matching follows `motmetrics.MOTAccumulator`: objects keep the prediction they were
+    matched to on the previous frame while their IoU is over the threshold, the rest are
+    matched minimizing 1 - IoU. Only counters are kept, instead of the list of events, so
+    the memory doesn't grow with the length of the sequence.
+    """
+
+    def __init__(self, iou_threshold: float = 0.5):
+        self.max_distance = 1 - iou_threshold
+        self.num_frames = 0
+        self.num_matches = 0
+        self.num_switches = 0
+        self.num_false_positives = 0
+        self.num_misses = 0
+        self.num_transfer = 0
+        self.num_ascend = 0
+        self.num_migrate = 0
+        self.num_fragmentations = 0
+        self.total_distance = 0.0
+
+        # last prediction matched to each object, and vice versa
+        self._matches: dict = {}
+        self._reverse_matches: dict = {}
+        self._matched_predictions: set = set()
+
+        # frames in which each object is present, and in which it is tracked
+        self._object_frames: Counter = Counter()
+        self._tracked_frames: Counter = Counter()
+        self._predicted_frames: Counter = Counter()
+        # frames in which each pair of object and prediction are close enough to be matched
+        self._pair_frames: Counter = Counter()
+        # objects that have been tracked, and those of them that were missed since
+        self._tracked: set = set()
+        self._interrupted: set = set()
+
+    def update(
+        self,
+        gt_ids: np.ndarray,
+        gt_boxes: np.ndarray,
+        predicted_ids: np.ndarray,
+        predicted_boxes: np.ndarray,
+    ):
+        """Match the boxes of one frame, in the `(x, y, width, height)` format."""
+        oids = np.asarray(gt_ids).tolist()
+        hids = np.asarray(predicted_ids).tolist()
+        # like in motmetrics, frames without boxes aren't counted
+        if oids or hids:
+            self.num_frames += 1
+        self._object_frames.update(set(oids))
+        self._predicted_frames.update(set(hids))
+
+        object_matched = [False] * len(oids)
+        prediction_matched = [False] * len(hids)
+        if oids and hids:
+            distances = _iou_distances(
+                np.asarray(gt_boxes, dtype=float),
+                np.asarray(predicted_boxes, dtype=float),
+                self.max_distance,
+            )
+            rows, columns = np.nonzero(np.isfinite(distances))
+            self._pair_frames.update(
+                zip([oids[r] for r in rows], [hids[c] for c in columns])
+            )
+
+            # objects keep the prediction of the previous frame if it is still close enough
+            prediction_index: dict = {}
+            for j, hid in enumerate(hids):
+                prediction_index.setdefault(hid, []).append(j)
+            for i, oid in enumerate(oids):
+                if oid not in self._matches:
+                    continue
+                for j in prediction_index.get(self._matches[oid], ()):
+                    if not prediction_matched[j]:
+                        if np.isfinite(distances[i, j]):
+                            object_matched[i] = prediction_matched[j] = True
+                            self._record_match(oid, hids[j], float(distances[i, j]))
+                        break
+
+            # the rest are assigned minimizing the distance
+            distances[np.array(object_matched), :] = np.nan
+            distances[:, np.array(prediction_matched)] = np.nan
+            for i, j in zip(*_assign(distances)):
+                object_matched[i] = prediction_matched[j] = True
+                oid, hid = oids[i], hids[j]
+                if oid in self._matches and self._matches[oid] != hid:
+                    self.num_switches += 1
+                    if hid not in self._matched_predictions:
+                        self.num_ascend += 1
+                else:
+                    self.num_matches += 1
+                if hid in self._reverse_matches and self._reverse_matches[hid] != oid:
+                    self.num_transfer += 1
+                    if oid not in self._tracked:
+                        self.num_migrate += 1
+                self._record_match(oid, hid, float(distances[i, j]), count=False)
+                # like in motmetrics, predictions only change object on this path
+                self._reverse_matches[hid] = oid
+
+        for oid, matched in zip(oids, object_matched):
+            if not matched:
+                self.num_misses += 1
+                if oid in self._tracked:
+                    self._interrupted.add(oid)
+        self.num_false_positives += prediction_matched.count(False)
+
+    def _record_match(self, oid, hid, distance: float, count: bool = True):
+        if count:
+            self.num_matches += 1
+        self.total_distance += distance
+        self._tracked_frames[oid] += 1
+        if oid in self._interrupted:
+            self._interrupted.remove(oid)
+            self.num_fragmentations += 1
+        self._tracked.add(oid)
+        self._matched_predictions.add(hid)
+        self._matches[oid] = hid
+
+    def counts(self) -> dict[str, float]:
+        """Counts of the events so far, which can be added across sequences."""
+        tracked_ratios = np.array(
+            [
+                self._tracked_frames[oid] / frames
+                for oid, frames in self._object_frames.items()
+            ]
+        )
+        num_objects = self.num_matches + self.num_switches + self.num_misses
+        num_detections = self.num_matches + self.num_switches
+        matched_frames = _max_overlap_matching(self._pair_frames)
+        return {
+            "num_frames": self.num_frames,
+            "num_matches": self.num_matches,
+            "num_switches": self.num_switches,
+            "num_false_positives": self.num_false_positives,
+            "num_misses": self.num_misses,
+            "num_detections": num_detections,
+            "num_objects": num_objects,
+            "num_predictions": num_detections + self.num_false_positives,
+            "num_unique_objects": len(self._object_frames),
+            "mostly_tracked": int((tracked_ratios >= 0.8).sum()),
+            "partially_tracked": int(
+                ((tracked_ratios >= 0.2) & (tracked_ratios < 0.8)).sum()
+            ),
+            "mostly_lost": int((tracked_ratios < 0.2).sum()),
+            "num_fragmentations": self.num_fragmentations,
+            "num_transfer": self.num_transfer,
+            "num_ascend": self.num_ascend,
+            "num_migrate": self.num_migrate,
+            "idfn": self._object_frames.total() - matched_frames,
+            "idfp": self._predicted_frames.total() - matched_frames,
+            "total_distance": self.total_distance,
+        }
+
+
+def _metrics_from_counts(counts: dict[str, float]) -> dict[str, float]:
+    """Compute the metrics of one or several sequences from the sum of their counts."""
+    metrics = dict(counts)
+    num_objects = counts["num_objects"]
+    num_detections = counts["num_detections"]
+    idtp = num_objects - counts["idfn"]
+    metrics["idtp"] = idtp
+    metrics["idp"] = _divide(idtp, idtp + counts["idfp"])
+    metrics["idr"] = _divide(idtp, idtp + counts["idfn"])
+    metrics["idf1"] = _divide(2 * idtp, num_objects + counts["num_predictions"])
+    metrics["recall"] = _divide(num_detections, num_objects)
+    metrics["precision"] = _divide(
+        num_detections, num_detections + counts["num_false_positives"]
+    )
+    metrics["mota"] = 1 - _divide(
+        counts["num_misses"] + counts["num_switches"] + counts["num_false_positives"],
+        num_objects,
+    )
+    metrics["motp"] = _divide(counts["total_distance"], num_detections)
+    return metrics
+
+
+def _as_mot_matrix(matrix) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=float)
+    return matrix.reshape(0, 6) if matrix.size == 0 else matrix
+
+
+def _frame_slices(matrix: np.ndarray) -> dict[float, np.ndarray]:
+    """Rows of a matrix in the MOTChallenge format of each frame, keeping their order."""
+    matrix = matrix[np.argsort(matrix[:, 0], kind="stable")]
+    frames, starts = np.unique(matrix[:, 0], return_index=True)
+    return dict(zip(frames.tolist(), np.split(matrix, starts[1:])))
+
+
+def evaluate_mot_sequence(
+    gt: np.ndarray, predictions: np.ndarray, iou_threshold: float = 0.5
+) -> dict[str, float]:
+    """
+    Compute the CLEAR-MOT and identity metrics of a sequence, with NumPy and SciPy only.
+
+    The results are the same as those of `motmetrics` comparing the boxes with `"iou"` and `distth=1 - iou_threshold`,
+    so the metrics can be computed without installing it.
+
+    Parameters
+    ----------
+    gt : np.ndarray
+        Ground truth boxes, one per row in the MOTChallenge format: `[frame, id, x, y, width, height, ...]`.
+        Rows to ignore, like those with confidence 0 in MOTChallenge's `gt.txt`, should be removed beforehand,
+        see [`load_mot_gt`][norfair.metrics.load_mot_gt].
+    predictions : np.ndarray
+        Predicted boxes in the same format, like the rows saved by [`PredictionsTextFile`][norfair.metrics.PredictionsTextFile].
+    iou_threshold : float, optional
+        Minimum IoU of a predicted box to match a ground truth one.
+
+    Returns
+    -------
+    Dict[str, float]
+        The metrics, with the names used by `motmetrics`, see [`MOT_CHALLENGE_METRICS`][norfair.metrics.MOT_CHALLENGE_METRICS],
+        together with the counts from which they are computed.
+    """
+    return _metrics_from_counts(
+        _accumulate_sequence(gt, predictions, iou_threshold).counts()
+    )
+
+
+def _accumulate_sequence(
+    gt: np.ndarray, predictions: np.ndarray, iou_threshold: float
+) -> _MOTAccumulator:
+    gt_frames = _frame_slices(_as_mot_matrix(gt))
+    predicted_frames = _frame_slices(_as_mot_matrix(predictions))
+    empty = np.empty((0, 6))
+
+    accumulator = _MOTAccumulator(iou_threshold)
+    for frame in sorted(gt_frames.keys() | predicted_frames.keys()):
+        frame_gt = gt_frames.get(frame, empty)
+        frame_predictions = predicted_frames.get(frame, empty)
+        accumulator.update(
+            frame_gt[:, 1],
+            frame_gt[:, 2:6],
+            frame_predictions[:, 1],
+            frame_predictions[:, 2:6],
+        )
+    return accumulator
+
+
+def load_mot_gt(file_path: str, min_confidence: float = 1) -> np.ndarray:
+    """
+    Load a MOTChallenge ground truth file, like `gt/gt.txt`, as a matrix with one row per box.
+
+    Rows with confidence lower than `min_confidence` are removed, by default those marked to be ignored.
+    """
+    gt = np.loadtxt(file_path, delimiter=",", ndmin=2)
+    if gt.size == 0:
+        return gt.reshape(0, 10)
+    return gt[gt[:, 6] >= min_confidence]
+
+
+def render_metrics(
+    summary: dict[str, dict[str, float]], metrics: Sequence[str] | None = None
+) -> str:
+    """
+    Render the metrics of several sequences as a text table, like `motmetrics.io.render_summary`.
+
+    Parameters
+    ----------
+    summary : Dict[str, Dict[str, float]]
+        The metrics of each sequence, by name.
+    metrics : Optional[Sequence[str]], optional
+        The metrics to show, by default [`MOT_CHALLENGE_METRICS`][norfair.metrics.MOT_CHALLENGE_METRICS].
+
+    Returns
+    -------
+    str
+        The table, with a row per sequence and a column per metric.
+    """
+    if metrics is None:
+        metrics = MOT_CHALLENGE_METRICS
+
+    def format_value(metric: str, value: float) -> str:
+        if metric in _PERCENTAGE_METRICS:
+            return f"{value:.1%}"
+        if metric == "motp":
+            return f"{value:.3f}"
+        if isinstance(value, float) and not value.is_integer():
+            return f"{value:.3f}"
+        return f"{value:.0f}"
+
+    header = [""] + [_METRIC_NAMES.get(metric, metric) for metric in metrics]
+    rows = [header] + [
+        [name] + [format_value(metric, values[metric]) for metric in metrics]
+        for name, values in summary.items()
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        " ".join(
+            [row[0].ljust(widths[0])]
+            + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        )
+        for row in rows
+    )
+
+
+def eval_mot_challenge(
+    matrixes_predictions: Sequence[np.ndarray],
+    paths: Sequence[str],
+    metrics: Sequence[str] | None = None,
+    generate_overall: bool = True,
+    iou_threshold: float = 0.5,
+) -> tuple[str, dict[str, dict[str, float]]]:
+    """
+    Evaluate the predictions of several MOTChallenge sequences without `motmetrics` nor `pandas`.
+
+    Counterpart of [`eval_motChallenge`][norfair.metrics.eval_motChallenge] which computes the same metrics
+    with [`evaluate_mot_sequence`][norfair.metrics.evaluate_mot_sequence].
+
+    Parameters
+    ----------
+    matrixes_predictions : Sequence[np.ndarray]
+        The predictions of each sequence in the MOTChallenge format.
+    paths : Sequence[str]
+        The folder of each sequence, containing its `gt/gt.txt` file.
+    metrics : Optional[Sequence[str]], optional
+        The metrics to report, by default [`MOT_CHALLENGE_METRICS`][norfair.metrics.MOT_CHALLENGE_METRICS].
+    generate_overall : bool, optional
+        Whether to add an `"OVERALL"` entry with the metrics of all the sequences together.
+    iou_threshold : float, optional
+        Minimum IoU of a predicted box to match a ground truth one.
+
+    Returns
+    -------
+    Tuple[str, Dict[str, Dict[str, float]]]
+        The summary rendered as text, and the metrics of each sequence by name.
+    """
+    if metrics is None:
+        metrics = MOT_CHALLENGE_METRICS
+
+    sequence_counts = {}
+    for path, predictions in zip(paths, matrixes_predictions):
+        gt = load_mot_gt(os.path.join(path, "gt", "gt.txt"))
+        sequence_counts[os.path.split(path)[1]] = _accumulate_sequence(
+            gt, predictions, iou_threshold
+        ).counts()
+    if generate_overall and sequence_counts:
+        sequence_counts["OVERALL"] = {
+            key: sum(counts[key] for counts in sequence_counts.values())
+            for key in next(iter(sequence_counts.values()), {})
+        }
+
+    summary = {}
+    for name, counts in sequence_counts.items():
+        sequence_metrics = _metrics_from_counts(counts)
+        summary[name] = {metric: sequence_metrics[metric] for metric in metrics}
+    return render_metrics(summary, metrics), summary
+
+
+class OnlineMOTMetrics:
+    """
+    Evaluate a tracker while it runs, one frame at a time.
+
+    Each call to [`update`][norfair.metrics.OnlineMOTMetrics.update] matches the ground truth and predicted boxes of a
+    frame and updates the CLEAR-MOT counters and the statistics used by IDF1, so the metrics of the frames seen so far
+    can be computed at any moment without storing the predictions. The memory grows with the number of different ids,
+    not with the number of frames. After the last frame, the metrics are the same as those of
+    [`evaluate_mot_sequence`][norfair.metrics.evaluate_mot_sequence] on the whole sequence.
+
+    Parameters
+    ----------
+    iou_threshold : float, optional
+        Minimum IoU of a predicted box to match a ground truth one.
+
+    Examples
+    --------
+    >>> gt = load_mot_gt("MOT17-02/gt/gt.txt")
+    >>> online_metrics = OnlineMOTMetrics()
+    >>> for frame_number, detections in enumerate(DetectionFileParser("MOT17-02"), start=1):
+    >>>     tracked_objects = tracker.update(detections)
+    >>>     online_metrics.update(gt[gt[:, 0] == frame_number], tracked_objects)
+    >>>     if frame_number % 100 == 0:
+    >>>         print(online_metrics.render())
+    """
+
+    def __init__(self, iou_threshold: float = 0.5):
+        self._accumulator = _MOTAccumulator(iou_threshold)
+        self._num_updates = 0
+
+    @property
+    def num_frames(self) -> int:
+        """Number of frames evaluated so far, including those without boxes, which don't count in the metrics."""
+        return self._num_updates
+
+    def update(self, gt: np.ndarray, predictions=None):
+        """
+        Evaluate the next frame.
+
+        Parameters
+        ----------
+        gt : np.ndarray
+            Ground truth boxes of the frame, one per row in the MOTChallenge format: `[frame, id, x, y, width, height, ...]`.
+        predictions : Optional[Union[List[TrackedObject], np.ndarray]], optional
+            The [`TrackedObject`][norfair.tracker.TrackedObject]s returned by the tracker on the frame, whose estimates
+            are bounding boxes, or their rows in the MOTChallenge format. `None` if there are no predictions.
+        """
+        gt = _as_mot_matrix(gt)
+        if predictions is None:
+            rows = _as_mot_matrix([])
+        elif isinstance(predictions, np.ndarray):
+            rows = _as_mot_matrix(predictions)
+        else:
+            rows = _predictions_to_rows(predictions, self.num_frames + 1)
+        self._num_updates += 1
+        self._accumulator.update(gt[:, 1], gt[:, 2:6], rows[:, 1], rows[:, 2:6])
+
+    def compute(self) -> dict[str, float]:
+        """
+        Compute the metrics of the frames evaluated so far.
+
+        Returns
+        -------
+        Dict[str, float]
+            The metrics, with the same names as those of [`evaluate_mot_sequence`][norfair.metrics.evaluate_mot_sequence].
+        """
+        return _metrics_from_counts(self._accumulator.counts())
+
+    def render(self, metrics: Sequence[str] | None = None, name: str = "") -> str:
+        """Render the metrics of the frames evaluated so far as a text table, see [`render_metrics`][norfair.metrics.render_metrics]."""
+        return render_metrics({name: self.compute()}, metrics)
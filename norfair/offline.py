@@ -0,0 +1,311 @@
+"""Offline processing of a single video in parallel, split in overlapping chunks."""
+
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    from .utils import DummyOpenCVImport
+
+    cv2 = DummyOpenCVImport()  # type: ignore[assignment, misc]
+
+from .camera_motion import MotionEstimator
+from .distances import Distance, ScalarDistance, get_distance_by_name
+from .tracker import Detection, Tracker
+
+if TYPE_CHECKING:
+    from .distances import TrackedObjectLike
+
+
+@dataclass
+class TrackState:
+    """
+    State of a tracked object on one frame, as returned by [`track_video_in_chunks`][norfair.offline.track_video_in_chunks].
+
+    Parameters
+    ----------
+    id : int
+        Id of the object, consistent across the whole video.
+    estimate : np.ndarray
+        Position estimate of the object on the frame, in the same format as
+        [`TrackedObject.estimate`][norfair.tracker.TrackedObject.estimate].
+    label : Hashable
+        Label of the object.
+    """
+
+    id: int
+    estimate: np.ndarray
+    label: Hashable = None
+
+
+@dataclass
+class _Chunk:
+    start: int
+    end: int
+    # Frames of the chunk which are part of the output, the rest overlap with the
+    # previous chunk and are only used to stitch ids.
+    first_output: int
+
+
+def _split_in_chunks(total_frames: int, chunk_size: int, overlap: int) -> list[_Chunk]:
+    chunks = []
+    for start in range(0, max(total_frames, 1), chunk_size):
+        chunks.append(
+            _Chunk(
+                start=start,
+                end=min(start + chunk_size + overlap, total_frames),
+                first_output=start + overlap if start > 0 else 0,
+            )
+        )
+    return chunks
+
+
+def _track_chunk(
+    input_path: str,
+    start: int,
+    end: int,
+    detector: Callable[[np.ndarray], list[Detection]],
+    tracker_factory: Callable[[], Tracker],
+    motion_estimator_factory: Callable[[], MotionEstimator] | None,
+    period: int,
+) -> list[list[TrackState]]:
+    """Run the detector and a new tracker on frames `[start, end)` of the video."""
+    video_capture = cv2.VideoCapture(input_path)
+    if start > 0:
+        video_capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+    tracker = tracker_factory()
+    motion_estimator = (
+        motion_estimator_factory() if motion_estimator_factory is not None else None
+    )
+
+    frames: list[list[TrackState]] = []
+    try:
+        for frame_number in range(start, end):
+            run_detector = frame_number % period == 0
+            detections, coord_transformations = None, None
+            if run_detector or motion_estimator is not None:
+                ret, frame = video_capture.read()
+                if ret is False or frame is None:
+                    break
+                if motion_estimator is not None:
+                    coord_transformations = motion_estimator.update(frame)
+                if run_detector:
+                    detections = detector(frame)
+            elif not video_capture.grab():
+                break
+
+            if run_detector:
+                tracked_objects = tracker.update(
+                    detections=detections,
+                    period=period,
+                    coord_transformations=coord_transformations,
+                )
+            else:
+                tracked_objects = tracker.update(
+                    coord_transformations=coord_transformations
+                )
+            states = []
+            for obj in tracked_objects:
+                assert obj.id is not None  # Only initialized objects are returned
+                states.append(
+                    TrackState(id=obj.id, estimate=obj.estimate, label=obj.label)
+                )
+            frames.append(states)
+    finally:
+        video_capture.release()
+    return frames
+
+
+def _match_in_overlap(
+    previous: Sequence[list[TrackState]],
+    current: Sequence[list[TrackState]],
+    distance: Distance,
+    tracker: Tracker,
+    distance_threshold: float,
+) -> dict[int, int]:
+    """
+    Match the ids of two chunks by their mean distance over the frames in which both are present.
+
+    Returns a dictionary from the ids of `current` to the ids of `previous`.
+    """
+    previous_ids = sorted({state.id for states in previous for state in states})
+    current_ids = sorted({state.id for states in current for state in states})
+    if not previous_ids or not current_ids:
+        return {}
+    previous_index = {id: i for i, id in enumerate(previous_ids)}
+    current_index = {id: i for i, id in enumerate(current_ids)}
+
+    distance_sum = np.zeros((len(previous_ids), len(current_ids)))
+    frame_count = np.zeros((len(previous_ids), len(current_ids)), dtype=int)
+    for previous_states, current_states in zip(previous, current):
+        if not previous_states or not current_states:
+            continue
+        candidates = [
+            Detection(state.estimate, label=state.label) for state in previous_states
+        ]
+        distances = distance.get_distances(current_states, candidates)
+        rows = [previous_index[state.id] for state in previous_states]
+        columns = [current_index[state.id] for state in current_states]
+        finite = np.isfinite(distances)
+        distance_sum[np.ix_(rows, columns)] += np.where(finite, distances, 0)
+        frame_count[np.ix_(rows, columns)] += finite
+
+    mean_distance = np.full(distance_sum.shape, np.inf)
+    present = frame_count > 0
+    mean_distance[present] = distance_sum[present] / frame_count[present]
+    previous_idxs, current_idxs = tracker.match_dets_and_objs(
+        mean_distance, distance_threshold
+    )
+    return {
+        current_ids[c]: previous_ids[p] for p, c in zip(previous_idxs, current_idxs)
+    }
+
+
+def track_video_in_chunks(
+    input_path: str,
+    detector: Callable[[np.ndarray], list[Detection]],
+    tracker_factory: Callable[[], Tracker],
+    chunk_size: int = 1000,
+    overlap: int = 50,
+    max_workers: int | None = None,
+    period: int = 1,
+    motion_estimator_factory: Callable[[], MotionEstimator] | None = None,
+    distance_function: str
+    | Callable[[Detection, "TrackedObjectLike"], float]
+    | None = None,
+    distance_threshold: float | None = None,
+) -> list[list[TrackState]]:
+    """
+    Track the objects of a video file using several processes.
+
+    The video is split in chunks of `chunk_size` frames, each of them extended with the first `overlap` frames of the
+    next one. Every chunk is processed by an independent detector and tracker in a process pool. Then the tracks of
+    consecutive chunks are matched by their mean distance over the overlapping frames, so the ids are consistent
+    across the whole video. The output of the overlapping frames is taken from the earlier chunk, whose tracker
+    is already initialized.
+
+    Since each chunk starts without tracks, objects are only returned once initialized, `overlap` should be larger than
+    the `initialization_delay` of the tracker, and a few times larger than `period`.
+
+    `detector`, `tracker_factory` and `motion_estimator_factory` are sent to the worker processes, so they must
+    be picklable, for instance functions defined at the top level of a module or `functools.partial` objects.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the video file.
+    detector : Callable[[np.ndarray], List[Detection]]
+        Function returning the detections found in a frame.
+    tracker_factory : Callable[[], Tracker]
+        Function creating the [`Tracker`][norfair.tracker.Tracker] of each chunk, for instance
+        `functools.partial(Tracker, distance_function="iou", distance_threshold=0.7)`.
+    chunk_size : int, optional
+        Number of frames of each chunk, without counting the overlap.
+    overlap : int, optional
+        Number of frames processed by two consecutive chunks, used to match their tracks.
+    max_workers : Optional[int], optional
+        Number of processes, by default the number of CPUs.
+    period : int, optional
+        The detector only runs one out of every `period` frames, the rest are not decoded unless
+        a motion estimator is used. Works like the `period` argument of [`Tracker.update`][norfair.tracker.Tracker.update].
+    motion_estimator_factory : Optional[Callable[[], MotionEstimator]], optional
+        Function creating a [`MotionEstimator`][norfair.camera_motion.MotionEstimator] for each chunk, if the camera moves.
+    distance_function : Optional[Union[str, Callable[[Detection, TrackState], float]]], optional
+        Distance used to match tracks across chunks, by default the one of the tracker.
+        Tracks of the earlier chunk are passed as [`Detection`][norfair.tracker.Detection] instances, and those
+        of the later chunk as [`TrackState`][norfair.offline.TrackState] instances, so the distance can only
+        use their `estimate` and `label`.
+    distance_threshold : Optional[float], optional
+        Maximum mean distance to match two tracks, by default the one of the tracker.
+
+    Returns
+    -------
+    List[List[TrackState]]
+        The tracked objects on each frame of the video.
+    """
+    if chunk_size < 1:
+        raise ValueError(
+            f"Argument `chunk_size` should be at least 1, not {chunk_size}."
+        )
+    if overlap < 1:
+        raise ValueError(
+            f"Argument `overlap` should be at least 1 to be able to match the tracks of consecutive chunks, not {overlap}."
+        )
+
+    # Used to match tracks in the same way, and with the same distance, as the tracker
+    tracker = tracker_factory()
+    distance: Distance
+    if distance_function is None:
+        distance = tracker.distance_function
+    elif isinstance(distance_function, str):
+        distance = get_distance_by_name(distance_function)
+    else:
+        distance = ScalarDistance(distance_function)
+    if distance_threshold is None:
+        distance_threshold = tracker.distance_threshold
+
+    video_capture = cv2.VideoCapture(input_path)
+    total_frames = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    video_capture.release()
+    if total_frames == 0:
+        raise RuntimeError(
+            f"'{input_path}' does not seem to be a video file supported by OpenCV."
+        )
+    chunks = _split_in_chunks(total_frames, chunk_size, overlap)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _track_chunk,
+                input_path,
+                chunk.start,
+                chunk.end,
+                detector,
+                tracker_factory,
+                motion_estimator_factory,
+                period,
+            )
+            for chunk in chunks
+        ]
+        chunk_frames = [future.result() for future in futures]
+
+    frames: list[list[TrackState]] = []
+    next_id = 1
+    previous_ids: dict[int, int] = {}
+    for i, (chunk, states) in enumerate(zip(chunks, chunk_frames)):
+        if i == 0:
+            matches = {}
+        else:
+            previous_chunk, previous_states = chunks[i - 1], chunk_frames[i - 1]
+            matches = _match_in_overlap(
+                previous_states[chunk.start - previous_chunk.start :],
+                states[: chunk.first_output - chunk.start],
+                distance,
+                tracker,
+                distance_threshold,
+            )
+        # Map the ids of the chunk to the global ids
+        ids: dict[int, int] = {}
+        for frame_states in states:
+            for state in frame_states:
+                if state.id in ids:
+                    continue
+                if state.id in matches:
+                    ids[state.id] = previous_ids[matches[state.id]]
+                else:
+                    ids[state.id] = next_id
+                    next_id += 1
+        for frame_states in states[chunk.first_output - chunk.start :]:
+            frames.append(
+                [
+                    TrackState(id=ids[s.id], estimate=s.estimate, label=s.label)
+                    for s in frame_states
+                ]
+            )
+        previous_ids = ids
+    return frames
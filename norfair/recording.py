@@ -0,0 +1,408 @@
+"""Recording of the inputs of a tracker in a binary log, and their replay."""
+
+import os
+import pickle
+import struct
+from collections.abc import Hashable, Iterator
+from concurrent.futures import Future
+from typing import BinaryIO
+
+import numpy as np
+
+from .camera_motion import (
+    AffineTransformation,
+    CoordinatesTransformation,
+    HomographyTransformation,
+    TranslationTransformation,
+)
+from .tracker import Detection, TrackedObject, Tracker
+
+# The log starts with the magic bytes and is followed by records, each with a header
+# (record type, payload size) and a payload padded to 8 bytes, so that the arrays it
+# contains can be viewed without copying them.
+_MAGIC = b"NORFREC1"
+_RECORD_HEADER = struct.Struct("<B3xI")
+_LABEL_RECORD = 1
+_FRAME_RECORD = 2
+
+# Number of detections, points and dimensions, period, flags, dtypes of the points and
+# the scores, dtype and number of dimensions of the embeddings, and shape of the embeddings.
+_FRAME_HEADER = struct.Struct("<4I5B4I")
+_DETECTIONS_NONE = 1
+_HAS_SCORES = 2
+_HAS_EMBEDDINGS = 4
+_TRANSFORMATION_FLOAT32 = 8
+_TRANSFORMATION_SHIFT = 4
+
+_DTYPES = [np.dtype(t) for t in ("f8", "f4", "i8", "i4")]
+_TRANSFORMATIONS = [
+    None,
+    TranslationTransformation,
+    HomographyTransformation,
+    AffineTransformation,
+]
+
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+
+def _dtype_code(dtype: np.dtype) -> int:
+    try:
+        return _DTYPES.index(dtype)
+    except ValueError:
+        raise ValueError(
+            f"Arrays of type {dtype} can't be recorded, they should be one of {[str(t) for t in _DTYPES]}."
+        ) from None
+
+
+def _encode_transformation(
+    coord_transformations: CoordinatesTransformation | None,
+) -> tuple[int, np.ndarray | None]:
+    """Kind of the transformation, as its index in `_TRANSFORMATIONS`, and its parameters."""
+    if coord_transformations is None:
+        return 0, None
+    if isinstance(coord_transformations, TranslationTransformation):
+        parameters = coord_transformations.movement_vector
+    elif isinstance(coord_transformations, HomographyTransformation):
+        parameters = coord_transformations.homography_matrix
+    elif isinstance(coord_transformations, AffineTransformation):
+        parameters = coord_transformations.affine_matrix
+    else:
+        raise ValueError(
+            f"Coordinate transformations of type {type(coord_transformations).__name__} can't be recorded."
+        )
+    return _TRANSFORMATIONS.index(type(coord_transformations)), np.asarray(parameters)
+
+
+class TrackerRecorder:
+    """
+    Record the inputs of [`Tracker.update`][norfair.tracker.Tracker.update] in a compact binary log.
+
+    Each frame is appended to the log as a record with the points, scores, labels and embeddings of its
+    detections, the period, and the matrix of the coordinate transformation. The log can be replayed with
+    [`TrackerReplayer`][norfair.recording.TrackerReplayer], to reproduce the behavior of a tracker without
+    running the detector again.
+
+    The `data` of the detections isn't recorded. Points, and embeddings if any, must be arrays of floats or
+    ints with the same shape in all the detections of a frame. Only the transformations included in Norfair
+    can be recorded. Labels are stored with `pickle`, so only logs from trusted sources should be replayed.
+
+    Parameters
+    ----------
+    path : str
+        Path to the log. If it already exists, new frames are appended to it.
+
+    Examples
+    --------
+    >>> with TrackerRecorder("traffic.rec") as recorder:
+    >>>     for frame in video:
+    >>>         detections = detector(frame)
+    >>>         coord_transformations = motion_estimator.update(frame)
+    >>>         recorder.record(detections, coord_transformations=coord_transformations)
+    >>>         tracked_objects = tracker.update(detections, coord_transformations=coord_transformations)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._labels: dict[Hashable, int] = {}
+        self._file: BinaryIO
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            existing = TrackerReplayer(path)
+            self._labels = {label: i for i, label in enumerate(existing.labels)}
+            end = existing.end
+            del existing
+            self._file = open(path, "r+b")
+            # a record left incomplete by an interrupted recording is overwritten
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """Flush the recorded frames and close the log."""
+        self._file.close()
+
+    def _write_record(self, record_type: int, chunks: list[bytes]):
+        size = sum(len(chunk) for chunk in chunks)
+        self._file.write(_RECORD_HEADER.pack(record_type, size))
+        self._file.write(b"".join(chunks))
+
+    def _label_code(self, label: Hashable) -> int:
+        if label is None:
+            return -1
+        code = self._labels.get(label)
+        if code is None:
+            code = len(self._labels)
+            payload = pickle.dumps(label)
+            self._write_record(_LABEL_RECORD, [payload, bytes(_padding(len(payload)))])
+            self._labels[label] = code
+        return code
+
+    def record(
+        self,
+        detections: list[Detection] | None = None,
+        period: int = 1,
+        coord_transformations: CoordinatesTransformation
+        | Future[CoordinatesTransformation | None]
+        | None = None,
+    ):
+        """
+        Append the inputs of a call to [`Tracker.update`][norfair.tracker.Tracker.update] to the log.
+
+        The arguments are the same as those of `Tracker.update`.
+        """
+        if isinstance(coord_transformations, Future):
+            coord_transformations = coord_transformations.result()
+        kind, transformation = _encode_transformation(coord_transformations)
+        flags = kind << _TRANSFORMATION_SHIFT
+        if detections is None:
+            flags |= _DETECTIONS_NONE
+            detections = []
+
+        num_detections = len(detections)
+        if num_detections > 0:
+            points = np.stack([det.points for det in detections])
+        else:
+            points = np.empty((0, 0, 0))
+        labels = np.array(
+            [self._label_code(det.label) for det in detections], dtype=np.int32
+        )
+        chunks = []
+        if transformation is not None:
+            if transformation.dtype == np.float32:
+                flags |= _TRANSFORMATION_FLOAT32
+            parameters = np.zeros(9)
+            parameters[: transformation.size] = transformation.ravel()
+            chunks.append(parameters.tobytes())
+
+        chunks.append(points.tobytes())
+        chunks.append(bytes(_padding(points.nbytes)))
+
+        scores_code = 0
+        if any(det.scores is not None for det in detections):
+            flags |= _HAS_SCORES
+            has_scores = np.array([det.scores is not None for det in detections])
+            scores = np.zeros(
+                points.shape[:2],
+                np.result_type(
+                    *(det.scores for det in detections if det.scores is not None)
+                ),
+            )
+            scores_code = _dtype_code(scores.dtype)
+            for i, det in enumerate(detections):
+                if det.scores is not None:
+                    scores[i] = det.scores
+            chunks += [scores.tobytes(), has_scores.tobytes()]
+            chunks.append(bytes(_padding(has_scores.nbytes)))
+
+        chunks += [labels.tobytes(), bytes(_padding(labels.nbytes))]
+
+        embedding_shape: tuple[int, ...] = ()
+        embedding_code = 0
+        if any(det.embedding is not None for det in detections):
+            flags |= _HAS_EMBEDDINGS
+            has_embeddings = np.array([det.embedding is not None for det in detections])
+            first = np.asarray(
+                next(det.embedding for det in detections if det.embedding is not None)
+            )
+            embedding_shape = first.shape
+            if len(embedding_shape) > 4:
+                raise ValueError(
+                    f"Embeddings of up to 4 dimensions can be recorded, not {len(embedding_shape)}."
+                )
+            embedding_code = _dtype_code(first.dtype)
+            embeddings = np.zeros((num_detections,) + embedding_shape, first.dtype)
+            for i, det in enumerate(detections):
+                if det.embedding is not None:
+                    embeddings[i] = det.embedding
+            chunks += [has_embeddings.tobytes(), bytes(_padding(num_detections))]
+            chunks += [embeddings.tobytes(), bytes(_padding(embeddings.nbytes))]
+
+        header = _FRAME_HEADER.pack(
+            num_detections,
+            points.shape[1],
+            points.shape[2],
+            period,
+            flags,
+            _dtype_code(points.dtype) if num_detections > 0 else 0,
+            scores_code,
+            embedding_code,
+            len(embedding_shape),
+            *(embedding_shape + (0,) * (4 - len(embedding_shape))),
+        )
+        chunks.insert(0, header + bytes(_padding(len(header))))
+        self._write_record(_FRAME_RECORD, chunks)
+
+
+class TrackerReplayer:
+    """
+    Replay a log recorded with [`TrackerRecorder`][norfair.recording.TrackerRecorder].
+
+    The log is memory mapped, and the [`Detection`][norfair.tracker.Detection]s of each frame are built from
+    a single copy of its record, so replaying it costs little more than the tracker itself. A record
+    left incomplete at the end of the log, for instance by an interrupted recording, is ignored.
+
+    Iterating over the replayer yields the arguments of [`Tracker.update`][norfair.tracker.Tracker.update]
+    for each frame, as a tuple of detections, period and coordinate transformation.
+
+    Parameters
+    ----------
+    path : str
+        Path to the log.
+
+    Examples
+    --------
+    >>> replayer = TrackerReplayer("traffic.rec")
+    >>> tracker = Tracker(distance_function="iou", distance_threshold=0.7)
+    >>> for tracked_objects in replayer.replay(tracker):
+    >>>     ...
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        size = os.path.getsize(path)
+        if size < len(_MAGIC):
+            raise ValueError(f"'{path}' is not a tracker recording.")
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if self._buffer[: len(_MAGIC)].tobytes() != _MAGIC:
+            raise ValueError(f"'{path}' is not a tracker recording.")
+
+        self.labels: list[Hashable] = []
+        frames = []
+        position = len(_MAGIC)
+        while position + _RECORD_HEADER.size <= size:
+            record_type, record_size = _RECORD_HEADER.unpack_from(
+                self._buffer, position
+            )
+            start = position + _RECORD_HEADER.size
+            if start + record_size > size:
+                break
+            if record_type == _LABEL_RECORD:
+                self.labels.append(
+                    pickle.loads(self._buffer[start : start + record_size].tobytes())
+                )
+            elif record_type == _FRAME_RECORD:
+                frames.append((start, record_size))
+            else:
+                raise ValueError(
+                    f"'{path}' contains a record of an unknown type ({record_type})."
+                )
+            position = start + record_size
+        # end of the last complete record
+        self.end = position
+        self._frames = np.array(frames, dtype=np.int64).reshape(-1, 2)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(
+        self, index: int
+    ) -> tuple[list[Detection] | None, int, CoordinatesTransformation | None]:
+        start, size = self._frames[index]
+        # a single copy of the record, which the detections view
+        payload = np.array(self._buffer[start : start + size])
+        (
+            num_detections,
+            num_points,
+            num_dims,
+            period,
+            flags,
+            points_code,
+            scores_code,
+            embedding_code,
+            embedding_ndim,
+            *embedding_shape,
+        ) = _FRAME_HEADER.unpack_from(payload)
+        position = _FRAME_HEADER.size + _padding(_FRAME_HEADER.size)
+
+        def take(dtype: np.dtype, shape: tuple[int, ...]) -> np.ndarray:
+            nonlocal position
+            count = int(np.prod(shape))
+            array = (
+                payload[position : position + count * dtype.itemsize]
+                .view(dtype)
+                .reshape(shape)
+            )
+            position += array.nbytes + _padding(array.nbytes)
+            return array
+
+        coord_transformations = None
+        kind = flags >> _TRANSFORMATION_SHIFT
+        if kind != 0:
+            parameters = take(np.dtype("f8"), (9,))
+            if flags & _TRANSFORMATION_FLOAT32:
+                parameters = parameters.astype(np.float32)
+            if kind == 1:
+                coord_transformations = TranslationTransformation(parameters[:2])
+            elif kind == 2:
+                coord_transformations = HomographyTransformation(
+                    parameters.reshape(3, 3)
+                )
+            else:
+                coord_transformations = AffineTransformation(
+                    parameters[:6].reshape(2, 3)
+                )
+
+        if flags & _DETECTIONS_NONE:
+            return None, period, coord_transformations
+
+        points = take(_DTYPES[points_code], (num_detections, num_points, num_dims))
+        scores = None
+        has_scores = np.zeros(num_detections, dtype=bool)
+        if flags & _HAS_SCORES:
+            scores = take(_DTYPES[scores_code], (num_detections, num_points))
+            has_scores = take(np.dtype(bool), (num_detections,))
+        labels = take(np.dtype("i4"), (num_detections,))
+        embeddings = None
+        has_embeddings = np.zeros(num_detections, dtype=bool)
+        if flags & _HAS_EMBEDDINGS:
+            has_embeddings = take(np.dtype(bool), (num_detections,))
+            embeddings = take(
+                _DTYPES[embedding_code],
+                (num_detections, *embedding_shape[:embedding_ndim]),
+            )
+
+        detections = []
+        for i in range(num_detections):
+            detections.append(
+                Detection(
+                    points[i],
+                    scores=scores[i] if scores is not None and has_scores[i] else None,
+                    label=self.labels[labels[i]] if labels[i] >= 0 else None,
+                    embedding=embeddings[i]
+                    if embeddings is not None and has_embeddings[i]
+                    else None,
+                )
+            )
+        return detections, period, coord_transformations
+
+    def __iter__(
+        self,
+    ) -> Iterator[tuple[list[Detection] | None, int, CoordinatesTransformation | None]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def replay(self, tracker: Tracker) -> Iterator[list[TrackedObject]]:
+        """
+        Update `tracker` with every recorded frame, as fast as possible.
+
+        Parameters
+        ----------
+        tracker : Tracker
+            The tracker to update, usually configured in the same way as the one of the recording.
+
+        Yields
+        ------
+        List[TrackedObject]
+            The active tracked objects returned by the tracker on each frame.
+        """
+        for detections, period, coord_transformations in self:
+            yield tracker.update(detections, period, coord_transformations)
@@ -0,0 +1,249 @@
+"""Parallel evaluation of tracker configurations on MOTChallenge sequences."""
+
+import itertools
+import os
+import tempfile
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+import numpy as np
+
+from .metrics import (
+    _PERCENTAGE_METRICS,
+    MOT_CHALLENGE_METRICS,
+    InformationFile,
+    _detections_from_rows,
+    _metrics_from_counts,
+    _MOTAccumulator,
+    _parse_detections,
+    _predictions_to_rows,
+    load_mot_gt,
+    render_metrics,
+)
+from .tracker import Tracker
+
+
+def config_grid(**parameters: Sequence[Any]) -> list[dict[str, Any]]:
+    """
+    Every combination of the values of the given parameters.
+
+    Examples
+    --------
+    >>> config_grid(distance_threshold=[0.7, 0.9], hit_counter_max=[5, 10])
+    [{'distance_threshold': 0.7, 'hit_counter_max': 5}, {'distance_threshold': 0.7, 'hit_counter_max': 10},
+     {'distance_threshold': 0.9, 'hit_counter_max': 5}, {'distance_threshold': 0.9, 'hit_counter_max': 10}]
+    """
+    names = list(parameters)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*(parameters[name] for name in names))
+    ]
+
+
+@dataclass(frozen=True)
+class _SequenceFiles:
+    # Parsed inputs of a sequence, saved once and memory mapped by every worker
+    detections_path: str
+    gt_path: str
+    length: int
+
+
+@cache
+def _load_matrix(path: str) -> np.ndarray:
+    # each worker maps the file once, its pages are shared by all the processes
+    return np.load(path, mmap_mode="r")
+
+
+def _frame_offsets(matrix: np.ndarray, length: int) -> np.ndarray:
+    """The rows of frame i of a matrix sorted by frame are the ones in [offsets[i - 1], offsets[i])."""
+    return np.searchsorted(matrix[:, 0], np.arange(1, length + 2) - 0.5)
+
+
+def _evaluate_config(
+    sequence: _SequenceFiles,
+    tracker_factory: Callable[..., Tracker],
+    config: dict[str, Any],
+    iou_threshold: float,
+) -> dict[str, float]:
+    """Track a sequence with a new tracker and return the counts of its metrics."""
+    detections = _load_matrix(sequence.detections_path)
+    gt = _load_matrix(sequence.gt_path)
+    detection_offsets = _frame_offsets(detections, sequence.length)
+    gt_offsets = _frame_offsets(gt, sequence.length)
+
+    tracker = tracker_factory(**config)
+    accumulator = _MOTAccumulator(iou_threshold)
+    for frame_number in range(1, sequence.length + 1):
+        start, end = detection_offsets[frame_number - 1 : frame_number + 1]
+        tracked_objects = tracker.update(_detections_from_rows(detections[start:end]))
+        predictions = _predictions_to_rows(tracked_objects, frame_number)
+        start, end = gt_offsets[frame_number - 1 : frame_number + 1]
+        frame_gt = gt[start:end]
+        accumulator.update(
+            frame_gt[:, 1], frame_gt[:, 2:6], predictions[:, 1], predictions[:, 2:6]
+        )
+    return accumulator.counts()
+
+
+def _save_sequence(path: str, directory: str, index: int) -> _SequenceFiles:
+    """Parse the detections and ground truth of a sequence and save them as binary files in `directory`."""
+    seq_length = InformationFile(os.path.join(path, "seqinfo.ini")).search(
+        variable_name="seqLength"
+    )
+    gt = load_mot_gt(os.path.join(path, "gt", "gt.txt"))
+    gt = gt[np.argsort(gt[:, 0], kind="stable")]
+
+    sequence = _SequenceFiles(
+        detections_path=os.path.join(directory, f"{index}_det.npy"),
+        gt_path=os.path.join(directory, f"{index}_gt.npy"),
+        length=int(seq_length),
+    )
+    np.save(
+        sequence.detections_path,
+        _parse_detections(os.path.join(path, "det", "det.txt")),
+    )
+    np.save(sequence.gt_path, gt)
+    return sequence
+
+
+def _config_name(config: Mapping[str, Any]) -> str:
+    return ", ".join(f"{key}={value!r}" for key, value in config.items())
+
+
+def sweep_mot_challenge(
+    sequence_paths: Sequence[str],
+    configs: Sequence[dict[str, Any]] | Mapping[str, dict[str, Any]],
+    tracker_factory: Callable[..., Tracker] = Tracker,
+    metric: str = "mota",
+    early_stopping_sequences: int | None = None,
+    early_stopping_margin: float = 0.05,
+    max_workers: int | None = None,
+    iou_threshold: float = 0.5,
+) -> tuple[str, dict[str, dict[str, float]]]:
+    """
+    Evaluate several tracker configurations on MOTChallenge sequences using several processes.
+
+    The detections and ground truth of each sequence are parsed once and saved to temporary binary files, which
+    the worker processes memory map, so they share the same copy in memory. Then every pair of sequence and
+    configuration is tracked and evaluated as an independent job in a process pool, with the metrics of
+    [`evaluate_mot_sequence`][norfair.metrics.evaluate_mot_sequence], and the results of each configuration
+    are aggregated over all the sequences.
+
+    With early stopping, every configuration is first evaluated on the first `early_stopping_sequences`
+    sequences, and only those whose `metric` on them is within `early_stopping_margin` of the best one are
+    evaluated on the rest.
+
+    `tracker_factory` and the values of `configs` are sent to the worker processes, so they must be picklable.
+
+    Parameters
+    ----------
+    sequence_paths : Sequence[str]
+        The folders of the sequences, each containing its `seqinfo.ini`, `det/det.txt` and `gt/gt.txt` files.
+    configs : Union[Sequence[Dict[str, Any]], Mapping[str, Dict[str, Any]]]
+        The keyword arguments of `tracker_factory` of each configuration, see [`config_grid`][norfair.sweep.config_grid].
+        When given as a mapping, its keys are used to name the configurations in the results.
+    tracker_factory : Callable[..., Tracker], optional
+        Function creating a tracker from the arguments of a configuration, by default [`Tracker`][norfair.tracker.Tracker].
+    metric : str, optional
+        Metric used to sort the results and to stop configurations early, one of `"mota"`, `"idf1"`, `"idp"`,
+        `"idr"`, `"recall"` or `"precision"`.
+    early_stopping_sequences : Optional[int], optional
+        Number of sequences on which every configuration is evaluated, by default all of them.
+    early_stopping_margin : float, optional
+        How much lower than the best one the `metric` of a configuration can be on the first sequences
+        for it to be evaluated on the rest.
+    max_workers : Optional[int], optional
+        Number of processes, by default the number of CPUs.
+    iou_threshold : float, optional
+        Minimum IoU of a predicted box to match a ground truth one.
+
+    Returns
+    -------
+    Tuple[str, Dict[str, Dict[str, float]]]
+        A table with the results rendered as text, and the metrics of each configuration over the sequences
+        it was evaluated on, best first. `num_sequences` is the number of those sequences.
+
+    Examples
+    --------
+    >>> configs = config_grid(distance_threshold=[0.7, 0.9], initialization_delay=[1, 3])
+    >>> summary_text, summary = sweep_mot_challenge(
+    >>>     sequence_paths, configs, partial(Tracker, distance_function="iou"), early_stopping_sequences=2
+    >>> )
+    >>> print(summary_text)
+    """
+    if metric not in _PERCENTAGE_METRICS:
+        raise ValueError(
+            f"Argument `metric` should be one of {sorted(_PERCENTAGE_METRICS)}, not '{metric}'."
+        )
+    if isinstance(configs, Mapping):
+        named_configs = dict(configs)
+    else:
+        named_configs = {_config_name(config): config for config in configs}
+    if early_stopping_sequences is None:
+        early_stopping_sequences = len(sequence_paths)
+
+    counts: dict[str, list[dict[str, float]]] = {name: [] for name in named_configs}
+
+    def aggregate(name: str) -> dict[str, float]:
+        total = {
+            key: sum(sequence_counts[key] for sequence_counts in counts[name])
+            for key in counts[name][0]
+        }
+        return _metrics_from_counts(total) | {"num_sequences": len(counts[name])}
+
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        ProcessPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        sequences = [
+            _save_sequence(path, directory, index)
+            for index, path in enumerate(sequence_paths)
+        ]
+        # sequences are identified by their index, different folders can have the same name
+        split = min(early_stopping_sequences, len(sequences))
+        phases = [range(split), range(split, len(sequences))]
+        remaining = list(named_configs)
+        for phase_indices in phases:
+            futures = {
+                (name, index): executor.submit(
+                    _evaluate_config,
+                    sequences[index],
+                    tracker_factory,
+                    named_configs[name],
+                    iou_threshold,
+                )
+                for name in remaining
+                for index in phase_indices
+            }
+            for (name, _), future in futures.items():
+                counts[name].append(future.result())
+            if phase_indices and remaining:
+                scores = {name: aggregate(name)[metric] for name in remaining}
+                best = max(
+                    (score for score in scores.values() if not np.isnan(score)),
+                    default=-np.inf,
+                )
+                # configurations with an undefined metric, like when there is no ground truth, are kept
+                remaining = [
+                    name
+                    for name in remaining
+                    if not scores[name] < best - early_stopping_margin
+                ]
+
+    summary = {name: aggregate(name) for name in named_configs if counts[name]}
+    summary = dict(
+        sorted(
+            summary.items(),
+            key=lambda item: (
+                -item[1]["num_sequences"],
+                -np.nan_to_num(item[1][metric], nan=-np.inf),
+            ),
+        )
+    )
+    metrics = [metric, "num_sequences"] + [
+        name for name in MOT_CHALLENGE_METRICS if name != metric
+    ]
+    return render_metrics(summary, metrics), summary
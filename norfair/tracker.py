@@ -1,8 +1,10 @@
 from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Future
 from logging import warning
 from typing import Any
 
 import numpy as np
+from numpy.typing import DTypeLike
 
 from norfair.camera_motion import CoordinatesTransformation
 
@@ -57,11 +59,16 @@ class Tracker:
         Sets the threshold at which the scores of the points in a detection being fed into the tracker must dip below to be ignored by the tracker.
     filter_factory : FilterFactory, optional
         This parameter can be used to change what filter the [`TrackedObject`][norfair.tracker.TrackedObject] instances created by the tracker will use.
-        Defaults to [`OptimizedKalmanFilterFactory()`][norfair.filter.OptimizedKalmanFilterFactory]
+        Defaults to [`OptimizedKalmanFilterFactory()`][norfair.filter.OptimizedKalmanFilterFactory], created with the tracker's `dtype` if set.
     past_detections_length : int, optional
         How many past detections to save for each tracked object.
         Norfair tries to distribute these past detections uniformly through the object's lifetime so they're more representative.
         Very useful if you want to add metric learning to your model, as you can associate an embedding to each detection and access them in your distance function.
+
+        Past detections are kept in fixed size arrays per tracked object, so the memory they use is bounded.
+    keep_past_detections_data : bool, optional
+        Whether to keep the `data` of the past detections. Set it to `False` if your detections carry large payloads,
+        such as image crops, that you don't need to access through `past_detections`.
     reid_distance_function: Optional[Callable[["TrackedObject", "TrackedObject"], float]]
         Function used by the tracker to determine the ReID distance between newly detected trackers and unmatched trackers by the distance function.
 
@@ -77,6 +84,13 @@ class Tracker:
         Each tracked object keeps an internal ReID hit counter which tracks how often it's getting recognized by another tracker,
         each time it gets a match this counter goes up, and each time it doesn't it goes down. If it goes below 0 the object gets destroyed.
         If used, this argument (`reid_hit_counter_max`) defines how long an object can live without getting matched to any detections, before it is destroyed.
+    dtype : Optional[DTypeLike], optional
+        Floating point type in which points are tracked. When set, the `absolute_points` of the detections, which the
+        filters are updated with, are cast to it while their `points` are left as given, and the estimates, filter states
+        and distance computations stay in that type, so `np.float32` halves the memory traffic when the detector already
+        outputs single precision values. The filter factory should be created with the same `dtype`.
+
+        By default the points are used as given and filters work in `np.float64`.
     """
 
     def __init__(
@@ -87,14 +101,17 @@ class Tracker:
         initialization_delay: int | None = None,
         pointwise_hit_counter_max: int = 4,
         detection_threshold: float = 0,
-        filter_factory: FilterFactory = OptimizedKalmanFilterFactory(),
+        filter_factory: FilterFactory | None = None,
         past_detections_length: int = 4,
+        keep_past_detections_data: bool = True,
         reid_distance_function: Callable[["TrackedObject", "TrackedObject"], float]
         | None = None,
         reid_distance_threshold: float = 0,
         reid_hit_counter_max: int | None = None,
+        dtype: DTypeLike | None = None,
     ):
         self.tracked_objects: list[TrackedObject] = []
+        self.dtype = np.dtype(dtype) if dtype is not None else None
 
         # Convert distance_function to Distance object
         distance_obj: Distance
@@ -117,6 +134,19 @@ class Tracker:
         self.hit_counter_max = hit_counter_max
         self.reid_hit_counter_max = reid_hit_counter_max
         self.pointwise_hit_counter_max = pointwise_hit_counter_max
+        if filter_factory is None:
+            filter_factory = OptimizedKalmanFilterFactory(
+                dtype=np.float64 if self.dtype is None else self.dtype
+            )
+        else:
+            # Custom factories may not define the type of their filters
+            factory_dtype = getattr(filter_factory, "dtype", None)
+            if self.dtype is not None and factory_dtype not in (None, self.dtype):
+                warning(
+                    f"The tracker works with {self.dtype} points but its filter factory creates"
+                    f" {factory_dtype} filters, estimates will be upcast on every update."
+                    " Pass the same `dtype` to both."
+                )
         self.filter_factory = filter_factory
         if past_detections_length >= 0:
             self.past_detections_length = past_detections_length
@@ -124,6 +154,7 @@ class Tracker:
             raise ValueError(
                 f"Argument `past_detections_length` is {past_detections_length} and should be larger than 0."
             )
+        self.keep_past_detections_data = keep_past_detections_data
 
         if initialization_delay is None:
             self.initialization_delay = int(self.hit_counter_max / 2)
@@ -148,7 +179,9 @@ class Tracker:
         self,
         detections: list["Detection"] | None = None,
         period: int = 1,
-        coord_transformations: CoordinatesTransformation | None = None,
+        coord_transformations: CoordinatesTransformation
+        | Future[CoordinatesTransformation | None]
+        | None = None,
     ) -> list["TrackedObject"]:
         """
         Process detections found in each frame.
@@ -174,22 +207,37 @@ class Tracker:
         coord_transformations: Optional[CoordinatesTransformation]
             The coordinate transformation calculated by the [MotionEstimator][norfair.camera_motion.MotionEstimator].
 
+            It can also be the future returned by [`AsyncMotionEstimator.update`][norfair.camera_motion.AsyncMotionEstimator.update],
+            which is waited for before using it.
+
         Returns
         -------
         List[TrackedObject]
             The list of active tracked objects.
         """
-        if coord_transformations is not None and detections is not None:
+        if isinstance(coord_transformations, Future):
+            coord_transformations = coord_transformations.result()
+        if self.dtype is not None and detections is not None:
+            # The points of the caller are left as given, only the tracker's copy is cast
             for det in detections:
-                det.update_coordinate_transformation(coord_transformations)
+                if det.absolute_points.dtype != self.dtype:
+                    det.absolute_points = det.absolute_points.astype(self.dtype)
+        if coord_transformations is not None and detections:
+            _update_coordinate_transformations(
+                detections, coord_transformations, self.dtype
+            )
 
         # Remove stale trackers and make candidate object real if the hit counter is positive
         alive_objects = []
         dead_objects = []
         if self.reid_hit_counter_max is None:
-            self.tracked_objects = [
-                o for o in self.tracked_objects if o.hit_counter_is_positive
-            ]
+            tracked_objects = []
+            for o in self.tracked_objects:
+                if o.hit_counter_is_positive:
+                    tracked_objects.append(o)
+                else:
+                    self._obj_factory.release(o, self.filter_factory)
+            self.tracked_objects = tracked_objects
             alive_objects = self.tracked_objects
         else:
             tracked_objects = []
@@ -200,12 +248,15 @@ class Tracker:
                         alive_objects.append(o)
                     else:
                         dead_objects.append(o)
+                else:
+                    self._obj_factory.release(o, self.filter_factory)
             self.tracked_objects = tracked_objects
 
         # Update tracker
         for obj in self.tracked_objects:
             obj.tracker_step()
             obj.update_coordinate_transformation(coord_transformations)
+        _cache_relative_estimates(self.tracked_objects)
 
         # Update initialized tracked objects with detections
         (
@@ -255,12 +306,15 @@ class Tracker:
                     period=period,
                     filter_factory=self.filter_factory,
                     past_detections_length=self.past_detections_length,
+                    keep_past_detections_data=self.keep_past_detections_data,
                     reid_hit_counter_max=self.reid_hit_counter_max,
                     coord_transformations=coord_transformations,
                 )
             )
 
-        return self.get_active_objects()
+        active_objects = self.get_active_objects()
+        _cache_relative_estimates(active_objects)
+        return active_objects
 
     @property
     def current_object_count(self) -> int:
@@ -337,7 +391,9 @@ class Tracker:
                             matched_object.last_distance = match_distance
                             matched_objects.append(matched_object)
                         elif isinstance(matched_candidate, TrackedObject):
-                            # Merge new TrackedObject with the old one
+                            # Merge new TrackedObject with the old one, which takes
+                            # the filter of the candidate and drops its own
+                            self.filter_factory.release_filter(matched_object.filter)
                             matched_object.merge(matched_candidate)
                             # If we are matching TrackedObject instances we want to get rid of the
                             # already matched candidate to avoid matching it again in future frames
@@ -411,6 +467,7 @@ class _TrackedObjectFactory:
         past_detections_length: int,
         reid_hit_counter_max: int | None,
         coord_transformations: CoordinatesTransformation | None,
+        keep_past_detections_data: bool = True,
     ) -> "TrackedObject":
         obj = TrackedObject(
             obj_factory=self,
@@ -424,9 +481,20 @@ class _TrackedObjectFactory:
             past_detections_length=past_detections_length,
             reid_hit_counter_max=reid_hit_counter_max,
             coord_transformations=coord_transformations,
+            keep_past_detections_data=keep_past_detections_data,
         )
         return obj
 
+    def release(self, obj: "TrackedObject", filter_factory: "FilterFactory") -> None:
+        """
+        Called when `obj` is removed from the tracker.
+
+        Its filter is handed back to the factory that created it, which may recycle it
+        for a new object. The `TrackedObject` itself is not reused since users may still
+        hold references to it.
+        """
+        filter_factory.release_filter(obj.filter)
+
     def get_initializing_id(self) -> int:
         self.initializing_count += 1
         return self.initializing_count
@@ -476,6 +544,45 @@ class TrackedObject:
         `initializing_id` is the id temporarily assigned to `TrackedObject` while they are getting initialized.
     """
 
+    # Trackers can hold tens of thousands of these, slots avoid a __dict__ per object
+    __slots__ = (
+        "_obj_factory",
+        "dim_points",
+        "num_points",
+        "hit_counter_max",
+        "pointwise_hit_counter_max",
+        "initialization_delay",
+        "detection_threshold",
+        "initial_period",
+        "hit_counter",
+        "reid_hit_counter_max",
+        "reid_hit_counter",
+        "last_distance",
+        "current_min_distance",
+        "last_detection",
+        "age",
+        "is_initializing",
+        "scores",
+        "initializing_id",
+        "id",
+        "global_id",
+        "detected_at_least_once_points",
+        "point_hit_counter",
+        "past_detections_length",
+        "_past_detections",
+        "filter",
+        "dim_z",
+        "label",
+        "abs_to_rel",
+        "_version",
+        "_positions",
+        "_positions_version",
+        "_velocity",
+        "_velocity_version",
+        "_relative_estimate",
+        "_relative_estimate_key",
+    )
+
     def __init__(
         self,
         obj_factory: _TrackedObjectFactory,
@@ -489,6 +596,7 @@ class TrackedObject:
         past_detections_length: int,
         reid_hit_counter_max: int | None,
         coord_transformations: CoordinatesTransformation | None = None,
+        keep_past_detections_data: bool = True,
     ):
         if not isinstance(initial_detection, Detection):
             raise ValueError(
@@ -529,17 +637,32 @@ class TrackedObject:
         )
         initial_detection.age = self.age
         self.past_detections_length = past_detections_length
-        self.past_detections: list[Detection]
+        self._past_detections: _DetectionHistory | None
         if past_detections_length > 0:
-            self.past_detections = [initial_detection]
+            self._past_detections = _DetectionHistory(
+                past_detections_length,
+                initial_detection,
+                keep_data=keep_past_detections_data,
+            )
+            self._past_detections.append(initial_detection)
         else:
-            self.past_detections = []
+            self._past_detections = None
 
         # Create Kalman Filter
         self.filter = filter_factory.create_filter(initial_detection.absolute_points)
         self.dim_z = self.dim_points * self.num_points
         self.label = initial_detection.label
         self.abs_to_rel: Callable[[np.ndarray], np.ndarray] | None = None
+        # Version of the state of the filter, bumped by predict, hit and merge.
+        # The estimates are cached along the version they were computed for, and the
+        # relative estimate also along the transformation used.
+        self._version = 0
+        self._positions: np.ndarray | None = None
+        self._positions_version = -1
+        self._velocity: np.ndarray | None = None
+        self._velocity_version = -1
+        self._relative_estimate: np.ndarray | None = None
+        self._relative_estimate_key: tuple[int, Callable | None] | None = None
         if coord_transformations is not None:
             self.update_coordinate_transformation(coord_transformations)
 
@@ -554,6 +677,7 @@ class TrackedObject:
         self.age += 1
         # Advances the tracker's state
         self.filter.predict()
+        self._version += 1
         self.scores = None
 
     @property
@@ -572,8 +696,17 @@ class TrackedObject:
         -------
         np.ndarray
             An array of shape (self.num_points, self.dim_points) containing the velocity estimate of the object on each axis.
+            It's cached until the state of the object changes, so it is read only.
         """
-        return self.filter.x.T.flatten()[self.dim_z :].reshape(-1, self.dim_points)
+        velocity = self._velocity
+        if velocity is None or self._velocity_version != self._version:
+            velocity = self.filter.x.T.flatten()[self.dim_z :].reshape(
+                -1, self.dim_points
+            )
+            velocity.setflags(write=False)
+            self._velocity = velocity
+            self._velocity_version = self._version
+        return velocity
 
     @property
     def estimate(self) -> np.ndarray:
@@ -589,6 +722,9 @@ class TrackedObject:
     def get_estimate(self, absolute=False) -> np.ndarray:
         """Get the position estimate of the object from the Kalman filter in an absolute or relative format.
 
+        The estimates are cached until the state of the object or its coordinate transformation change,
+        so reading them several times per frame is free, and the returned arrays are read only.
+
         Parameters
         ----------
         absolute : bool, optional
@@ -604,7 +740,7 @@ class TrackedObject:
         ValueError
             Alert if the coordinates are requested in absolute format but the tracker has no coordinate transformation.
         """
-        positions = self.filter.x.T.flatten()[: self.dim_z].reshape(-1, self.dim_points)
+        positions = self._get_positions()
         if self.abs_to_rel is None:
             if not absolute:
                 return positions
@@ -616,7 +752,47 @@ class TrackedObject:
             if absolute:
                 return positions
             else:
-                return self.abs_to_rel(positions)
+                relative_estimate = self._get_cached_relative_estimate()
+                if relative_estimate is None:
+                    relative_estimate = self.abs_to_rel(positions).astype(
+                        positions.dtype, copy=False
+                    )
+                    self._set_relative_estimate(relative_estimate)
+                return relative_estimate
+
+    def _get_positions(self) -> np.ndarray:
+        positions = self._positions
+        if positions is None or self._positions_version != self._version:
+            positions = self.filter.x.T.flatten()[: self.dim_z].reshape(
+                -1, self.dim_points
+            )
+            positions.setflags(write=False)
+            self._positions = positions
+            self._positions_version = self._version
+        return positions
+
+    def _get_cached_relative_estimate(self) -> np.ndarray | None:
+        if self._relative_estimate_key == (self._version, self.abs_to_rel):
+            return self._relative_estimate
+        return None
+
+    def _set_relative_estimate(self, relative_estimate: np.ndarray):
+        relative_estimate.setflags(write=False)
+        self._relative_estimate = relative_estimate
+        self._relative_estimate_key = (self._version, self.abs_to_rel)
+
+    @property
+    def past_detections(self) -> list["Detection"]:
+        """
+        Detections that matched this object, distributed uniformly through its lifetime.
+
+        They are rebuilt from the arrays in which they are stored, so they are not the same
+        instances fed to the tracker, and their `data` is `None` if the tracker was created
+        with `keep_past_detections_data=False`.
+        """
+        if self._past_detections is None:
+            return []
+        return self._past_detections.detections
 
     @property
     def live_points(self):
@@ -660,19 +836,20 @@ class TrackedObject:
             matched_sensors_mask = np.array(
                 [(m,) * self.dim_points for m in points_over_threshold_mask]
             ).flatten()
-            H_pos = np.diag(matched_sensors_mask).astype(
-                float
-            )  # We measure x, y positions
+            # We measure x, y positions
+            H_pos = np.diag(matched_sensors_mask).astype(self.filter.x.dtype)
             self.point_hit_counter[points_over_threshold_mask] += 2 * period
         else:
             points_over_threshold_mask = np.array([True] * self.num_points)
-            H_pos = np.identity(self.num_points * self.dim_points)
+            H_pos = np.identity(
+                self.num_points * self.dim_points, dtype=self.filter.x.dtype
+            )
             self.point_hit_counter += 2 * period
         self.point_hit_counter[
             self.point_hit_counter >= self.pointwise_hit_counter_max
         ] = self.pointwise_hit_counter_max
         self.point_hit_counter[self.point_hit_counter < 0] = 0
-        H_vel = np.zeros(H_pos.shape)  # But we don't directly measure velocity
+        H_vel = np.zeros_like(H_pos)  # But we don't directly measure velocity
         H = np.hstack([H_pos, H_vel])
         self.filter.update(
             np.expand_dims(detection.absolute_points.flatten(), 0).T, None, H
@@ -702,6 +879,7 @@ class TrackedObject:
         self.detected_at_least_once_points = np.logical_or(
             self.detected_at_least_once_points, points_over_threshold_mask
         )
+        self._version += 1
 
     def __repr__(self):
         if self.last_distance is None:
@@ -724,18 +902,13 @@ class TrackedObject:
         lifetime.
         """
         detection.age = self.age
-        if self.past_detections_length == 0:
+        if self._past_detections is None:
             return
-        if len(self.past_detections) < self.past_detections_length:
-            self.past_detections.append(detection)
-        else:
-            first_detection_age = self.past_detections[0].age
-            if (
-                first_detection_age is not None
-                and self.age >= first_detection_age * self.past_detections_length
-            ):
-                self.past_detections.pop(0)
-                self.past_detections.append(detection)
+        if len(self._past_detections) < self.past_detections_length:
+            self._past_detections.append(detection)
+        elif self.age >= self._past_detections.oldest_age * self.past_detections_length:
+            # overwrites the oldest detection
+            self._past_detections.append(detection)
 
     def merge(self, tracked_object):
         """Merge with a not yet initialized TrackedObject instance"""
@@ -750,6 +923,7 @@ class TrackedObject:
             tracked_object.detected_at_least_once_points
         )
         self.filter = tracked_object.filter
+        self._version += 1
 
         for past_detection in tracked_object.past_detections:
             past_detection.age = self.age
@@ -765,6 +939,145 @@ class TrackedObject:
         self.id, self.global_id = self._obj_factory.get_ids()
 
 
+class _DetectionHistory:
+    """
+    Fixed capacity ring buffer of the past detections of a tracked object.
+
+    Points, scores, ages and embeddings are copied into arrays preallocated on creation,
+    with `head` pointing to the oldest entry. [`Detection`][norfair.tracker.Detection]
+    instances are only rebuilt when `detections` is accessed.
+    """
+
+    __slots__ = (
+        "capacity",
+        "keep_data",
+        "size",
+        "head",
+        "label",
+        "points",
+        "absolute_points",
+        "scores",
+        "has_scores",
+        "ages",
+        "embeddings",
+        "has_embeddings",
+        "data",
+        "_detections",
+    )
+
+    def __init__(
+        self, capacity: int, initial_detection: "Detection", keep_data: bool = True
+    ):
+        self.capacity = capacity
+        self.keep_data = keep_data
+        self.size = 0
+        self.head = 0
+        self.label = initial_detection.label
+
+        points = initial_detection.points
+        dtype = points.dtype if np.issubdtype(points.dtype, np.floating) else float
+        self.points = np.empty((capacity,) + points.shape, dtype=dtype)
+        # only allocated once a detection with a coordinate transformation arrives
+        self.absolute_points: np.ndarray | None = None
+        self.scores = np.empty((capacity, points.shape[0]))
+        self.has_scores = np.zeros(capacity, dtype=bool)
+        self.ages = np.empty(capacity, dtype=np.int64)
+        # only allocated once a detection with an embedding arrives
+        self.embeddings: np.ndarray | None = None
+        self.has_embeddings: np.ndarray | None = None
+        self.data: np.ndarray | None = (
+            np.empty(capacity, dtype=object) if keep_data else None
+        )
+        self._detections: list[Detection] | None = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def oldest_age(self) -> int:
+        return int(self.ages[self.head])
+
+    def append(self, detection: "Detection"):
+        """Append a detection, overwriting the oldest one if the buffer is full."""
+        if self.size < self.capacity:
+            index = (self.head + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self.head
+            self.head = (self.head + 1) % self.capacity
+
+        self.points[index] = detection.points
+        if detection._absolute_points is not None and self.absolute_points is None:
+            self.absolute_points = self.points.copy()
+        if self.absolute_points is not None:
+            self.absolute_points[index] = detection.absolute_points
+        if detection.scores is not None:
+            self.scores[index] = detection.scores
+            self.has_scores[index] = True
+        else:
+            self.has_scores[index] = False
+        self.ages[index] = detection.age if detection.age is not None else 0
+        self._store_embedding(index, detection.embedding)
+        if self.data is not None:
+            self.data[index] = detection.data
+        self._detections = None
+
+    def _store_embedding(self, index: int, embedding: Any):
+        if self.embeddings is None:
+            if embedding is None:
+                return
+            if isinstance(embedding, np.ndarray):
+                self.embeddings = np.empty(
+                    (self.capacity,) + embedding.shape, dtype=embedding.dtype
+                )
+            else:
+                self.embeddings = np.empty(self.capacity, dtype=object)
+            self.has_embeddings = np.zeros(self.capacity, dtype=bool)
+        assert self.has_embeddings is not None
+
+        if embedding is None:
+            self.has_embeddings[index] = False
+            return
+        if self.embeddings.dtype != object and not (
+            isinstance(embedding, np.ndarray)
+            and embedding.shape == self.embeddings.shape[1:]
+        ):
+            # embeddings that don't fit the preallocated array are kept as objects
+            embeddings = np.empty(self.capacity, dtype=object)
+            for i in np.flatnonzero(self.has_embeddings):
+                embeddings[i] = self.embeddings[i]
+            self.embeddings = embeddings
+        self.embeddings[index] = embedding
+        self.has_embeddings[index] = True
+
+    @property
+    def detections(self) -> list["Detection"]:
+        """The stored detections, from oldest to newest."""
+        if self._detections is None:
+            indices = (self.head + np.arange(self.size)) % self.capacity
+            self._detections = [self._materialize(int(i)) for i in indices]
+        return list(self._detections)
+
+    def _materialize(self, index: int) -> "Detection":
+        embedding = None
+        if self.has_embeddings is not None and self.has_embeddings[index]:
+            assert self.embeddings is not None
+            embedding = self.embeddings[index]
+            if isinstance(embedding, np.ndarray):
+                embedding = embedding.copy()
+        detection = Detection(
+            self.points[index].copy(),
+            scores=self.scores[index].copy() if self.has_scores[index] else None,
+            data=self.data[index] if self.data is not None else None,
+            label=self.label,
+            embedding=embedding,
+        )
+        if self.absolute_points is not None:
+            detection.absolute_points = self.absolute_points[index].copy()
+        detection.age = int(self.ages[index])
+        return detection
+
+
 class Detection:
     """Detections returned by the detector must be converted to a `Detection` object before being used by Norfair.
 
@@ -792,6 +1105,16 @@ class Detection:
         The embedding for the reid_distance.
     """
 
+    __slots__ = (
+        "points",
+        "scores",
+        "data",
+        "label",
+        "embedding",
+        "age",
+        "_absolute_points",
+    )
+
     def __init__(
         self,
         points: np.ndarray,
@@ -809,19 +1132,80 @@ class Detection:
             )
             self.scores = scores
         elif scores is not None:
-            self.scores = np.zeros((len(points),)) + scores
+            # A read-only view with a single value instead of an array per point
+            self.scores = np.broadcast_to(np.float64(scores), (len(self.points),))
         else:
             self.scores = None
         self.data = data
         self.label = label
-        self.absolute_points = self.points.copy()
+        # Absolute points are only stored if they differ from `points`, which only
+        # happens once a coordinate transformation is applied.
+        self._absolute_points: np.ndarray | None = None
         self.embedding = embedding
         self.age: int | None = None
 
+    @property
+    def absolute_points(self) -> np.ndarray:
+        """
+        The points in the absolute coordinate system.
+
+        Without coordinate transformations this is the same array as `points`.
+        """
+        if self._absolute_points is None:
+            return self.points
+        return self._absolute_points
+
+    @absolute_points.setter
+    def absolute_points(self, value: np.ndarray):
+        self._absolute_points = value
+
     def update_coordinate_transformation(
         self, coordinate_transformation: CoordinatesTransformation
     ):
         if coordinate_transformation is not None:
-            self.absolute_points = coordinate_transformation.rel_to_abs(
+            self._absolute_points = coordinate_transformation.rel_to_abs(
                 self.absolute_points
             )
+
+
+def _update_coordinate_transformations(
+    detections: Sequence[Detection],
+    coordinate_transformation: CoordinatesTransformation,
+    dtype: DTypeLike | None = None,
+):
+    """Convert the points of all the detections to absolute coordinates with a single transformation."""
+    points = [det.absolute_points for det in detections]
+    if len({p.shape[1] for p in points}) > 1:
+        for det in detections:
+            det.update_coordinate_transformation(coordinate_transformation)
+            if dtype is not None:
+                det.absolute_points = det.absolute_points.astype(dtype, copy=False)
+        return
+    absolute_points = coordinate_transformation.rel_to_abs(np.concatenate(points))
+    if dtype is not None:
+        absolute_points = absolute_points.astype(dtype, copy=False)
+    start = 0
+    for det, p in zip(detections, points):
+        det.absolute_points = absolute_points[start : start + len(p)]
+        start += len(p)
+
+
+def _cache_relative_estimates(objects: Sequence[TrackedObject]):
+    """Compute the estimates in relative coordinates of the objects sharing a transformation with a single call."""
+    groups: dict[Callable[[np.ndarray], np.ndarray], list[TrackedObject]] = {}
+    for obj in objects:
+        if obj.abs_to_rel is not None and obj._get_cached_relative_estimate() is None:
+            groups.setdefault(obj.abs_to_rel, []).append(obj)
+    for abs_to_rel, group in groups.items():
+        positions = [obj._get_positions() for obj in group]
+        if len({p.shape[1] for p in positions}) > 1:
+            for obj in group:
+                obj.get_estimate()
+            continue
+        relative = abs_to_rel(np.concatenate(positions))
+        start = 0
+        for obj, p in zip(group, positions):
+            obj._set_relative_estimate(
+                relative[start : start + len(p)].astype(p.dtype, copy=False)
+            )
+            start += len(p)
@@ -1,5 +1,10 @@
 import os
+import queue
+import threading
 import time
+from collections import deque
+from collections.abc import Generator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 try:
@@ -20,14 +25,92 @@ from rich.progress import BarColumn, Progress, ProgressColumn, TimeRemainingColu
 
 from norfair import metrics
 
+from .frame import FramePacket
 from .utils import get_terminal_size
 
+# Seconds between redraws of the progress bar, redrawing it on every frame is slow.
+_PROGRESS_REFRESH_PERIOD = 0.1
+
 
 def _get_fourcc(codec: str) -> int:
     """Helper to get VideoWriter fourcc code with proper typing."""
     return cv2.VideoWriter_fourcc(*codec)  # type: ignore[attr-defined]
 
 
+def _put_until_stopped(items: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put `item` in a bounded queue, giving up if `stop` is set while it is full."""
+    while not stop.is_set():
+        try:
+            items.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+class SkippedFrame:
+    """
+    Placeholder yielded by [`Video.iter_frames`][norfair.video.Video.iter_frames] for frames that were not decoded.
+
+    The tracker still needs to be updated on these frames, without detections.
+
+    Attributes
+    ----------
+    index : int
+        Position of the frame in the video, starting at 0.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __repr__(self):
+        return f"SkippedFrame({self.index})"
+
+
+class _AsyncVideoWriter:
+    """
+    Wraps a `cv2.VideoWriter` so frames are encoded by a background thread.
+
+    Frames are encoded in the order they are written, `release` waits for all the
+    queued frames to be encoded before closing the file.
+    """
+
+    def __init__(self, writer: Any, queue_size: int):
+        self.writer = writer
+        self._frames: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target=self._encode, daemon=True)
+        self._thread.start()
+
+    def _encode(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            if self._error is None:
+                try:
+                    self.writer.write(frame)
+                except Exception as e:
+                    self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError("Failed to encode the output video") from self._error
+
+    def write(self, frame: np.ndarray):
+        self._raise_error()
+        self._frames.put(frame)
+
+    def release(self):
+        if self._thread.is_alive():
+            self._frames.put(None)
+            self._thread.join()
+            self.writer.release()
+        self._raise_error()
+
+
 class Video:
     """
     Class that provides a simple and pythonic way to interact with video.
@@ -64,6 +147,13 @@ class Video:
         Notice that some fourcc are not compatible with some extensions.
     output_extension : str, optional
         File extension used for the output video. Ignored if `output_path` is not a folder.
+    prefetch_size : int, optional
+        Number of frames decoded ahead of time by a background thread, so decoding overlaps with the processing of the
+        current frame. By default `0`, frames are decoded when requested.
+    write_queue_size : int, optional
+        Number of frames that [`write`][norfair.video.Video.write] can queue for a background thread to encode.
+        In this mode `write` returns as soon as the frame is queued and makes no GUI calls, and the frame
+        must not be modified after being written. By default `0`, frames are encoded when written.
 
     Examples
     --------
@@ -82,6 +172,8 @@ class Video:
         label: str = "",
         output_fourcc: str | None = None,
         output_extension: str = "mp4",
+        prefetch_size: int = 0,
+        write_queue_size: int = 0,
     ):
         self.camera = camera
         self.input_path = input_path
@@ -89,7 +181,11 @@ class Video:
         self.label = label
         self.output_fourcc = output_fourcc
         self.output_extension = output_extension
+        self.prefetch_size = prefetch_size
+        self.write_queue_size = write_queue_size
         self.output_video: Any = None  # cv2.VideoWriter or None
+        # Whether `show` opened a window, GUI calls fail on headless OpenCV builds
+        self._window_shown = False
 
         # Input validation
         if (input_path is None and camera is None) or (
@@ -161,31 +257,139 @@ class Video:
             process_fps=0,
         )
 
-    # This is a generator, note the yield keyword below.
     def __iter__(self):
-        with self.progress_bar as progress_bar:
-            start = time.time()
+        return self.iter_frames()
 
-            # Iterate over video
-            while True:
-                self.frame_counter += 1
+    # This is a generator, note the yield keyword below.
+    def iter_frames(
+        self, period: int = 1, decode: str = "all", packets: bool = False
+    ) -> Iterator[np.ndarray | FramePacket | SkippedFrame]:
+        """
+        Iterate over the frames of the video, optionally without decoding the ones on which the detector doesn't run.
+
+        Parameters
+        ----------
+        period : int, optional
+            Every how many frames the detector runs, the first frame being always decoded.
+            Only used when `decode="detector_only"`.
+        decode : str, optional
+            `"all"` decodes every frame, as iterating over the video does.
+            With `"detector_only"` only one out of every `period` frames is decoded, the others are skipped without
+            decoding and a [`SkippedFrame`][norfair.video.SkippedFrame] is yielded in their place.
+        packets : bool, optional
+            Whether to yield each decoded frame wrapped in a [`FramePacket`][norfair.frame.FramePacket], which
+            computes the grayscale and downscaled versions of the frame once for all of their consumers.
+
+        Yields
+        ------
+        Union[np.ndarray, FramePacket, SkippedFrame]
+            The decoded frame, or a `SkippedFrame` for frames that were skipped.
+
+        Examples
+        --------
+        >>> for frame in video.iter_frames(period=3, decode="detector_only"):
+        >>>     if isinstance(frame, SkippedFrame):
+        >>>         tracked_objects = tracker.update()
+        >>>     else:
+        >>>         detections = detector(frame)
+        >>>         tracked_objects = tracker.update(detections, period=3)
+        """
+        if decode not in ("all", "detector_only"):
+            raise ValueError(
+                f"Argument `decode` should be 'all' or 'detector_only', not '{decode}'."
+            )
+        if period < 1:
+            raise ValueError(f"Argument `period` should be at least 1, not {period}.")
+        if decode == "all":
+            period = 1
+
+        frames = (
+            self._prefetch_frames(period)
+            if self.prefetch_size > 0
+            else self._read_frames(period)
+        )
+        try:
+            with self.progress_bar as progress_bar:
+                start = time.time()
+                last_refresh = 0.0
+
+                # Iterate over video
+                for index, frame in enumerate(frames):
+                    if packets and not isinstance(frame, SkippedFrame):
+                        frame = FramePacket(frame, index)
+                    self.frame_counter += 1
+                    now = time.time()
+                    process_fps = self.frame_counter / (now - start)
+                    refresh = now - last_refresh >= _PROGRESS_REFRESH_PERIOD
+                    if refresh:
+                        last_refresh = now
+                    progress_bar.update(
+                        self.task, advance=1, refresh=refresh, process_fps=process_fps
+                    )
+                    yield frame
+        finally:
+            # Also reached when the loop over the video is exited early
+            frames.close()
+            self._cleanup()
+
+    def _read_frames(
+        self, period: int = 1
+    ) -> Generator[np.ndarray | SkippedFrame, None, None]:
+        index = 0
+        while True:
+            if index % period == 0:
                 ret, frame = self.video_capture.read()
                 if ret is False or frame is None:
-                    break
-                process_fps = self.frame_counter / (time.time() - start)
-                progress_bar.update(
-                    self.task, advance=1, refresh=True, process_fps=process_fps
-                )
+                    return
                 yield frame
-
-        # Cleanup
+            else:
+                # Advance the video without decoding the frame
+                if not self.video_capture.grab():
+                    return
+                yield SkippedFrame(index)
+            index += 1
+
+    def _prefetch_frames(
+        self, period: int = 1
+    ) -> Generator[np.ndarray | SkippedFrame, None, None]:
+        frames: queue.Queue = queue.Queue(maxsize=self.prefetch_size)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._prefetch, args=(frames, stop, period), daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    return
+                if isinstance(frame, Exception):
+                    raise frame
+                yield frame
+        finally:
+            stop.set()
+            reader.join()
+
+    def _prefetch(self, frames: queue.Queue, stop: threading.Event, period: int):
+        """Decode frames into `frames` until the video ends, followed by `None`."""
+        end: Exception | None = None
+        try:
+            for frame in self._read_frames(period):
+                if not _put_until_stopped(frames, frame, stop):
+                    return
+        except Exception as e:
+            end = e
+        _put_until_stopped(frames, end, stop)
+
+    def _cleanup(self):
         if self.output_video is not None:
             self.output_video.release()
             print(
                 f"[white]Output video file saved to: {self.get_output_file_path()}[/white]"
             )
         self.video_capture.release()
-        cv2.destroyAllWindows()
+        if self._window_shown:
+            cv2.destroyAllWindows()
 
     def _fail(self, msg: str):
         raise RuntimeError(msg)
@@ -202,7 +406,8 @@ class Video:
         Returns
         -------
         int
-            _description_
+            The key pressed on the OpenCV window, as returned by `cv2.waitKey`.
+            Always `-1` when `write_queue_size` is set, since no GUI calls are made.
         """
         if self.output_video is None:
             # The user may need to access the output file path on their code
@@ -219,8 +424,14 @@ class Video:
                 self.output_fps,
                 output_size,
             )
+            if self.write_queue_size > 0:
+                self.output_video = _AsyncVideoWriter(
+                    self.output_video, self.write_queue_size
+                )
 
         self.output_video.write(frame)
+        if self.write_queue_size > 0:
+            return -1
         return cv2.waitKey(1)
 
     def show(self, frame: np.ndarray, downsample_ratio: float = 1.0) -> int:
@@ -251,6 +462,7 @@ class Video:
                 ),
             )
         cv2.imshow("Output", frame)
+        self._window_shown = True
         return cv2.waitKey(1)
 
     def get_output_file_path(self) -> str:
@@ -307,37 +519,62 @@ class Video:
 
 
 class VideoFromFrames:
+    """
+    Iterates over the images of a sequence in the [MOTChallenge](https://motchallenge.net/) format, optionally writing a video.
+
+    Parameters
+    ----------
+    input_path : str
+        Path to the sequence folder, which contains the `seqinfo.ini` file.
+    save_path : str, optional
+        Folder in which the `videos` folder with the output video is created.
+    information_file : Optional[metrics.InformationFile], optional
+        Information of the sequence, read from `seqinfo.ini` by default.
+    make_video : bool, optional
+        Whether to create an output video, written through `update`.
+    prefetch_size : int, optional
+        Number of images read ahead of time by a pool of threads, frames are still returned in order.
+        By default `0`, images are read when requested.
+    scale : float, optional
+        Factor by which images are resized when read. Scales of `0.5`, `0.25` and `0.125` are applied
+        while decoding, which is faster than resizing the full image.
+    grayscale : bool, optional
+        Whether to read images in grayscale.
+    write_queue_size : int, optional
+        Number of frames that `update` can queue for a background thread to encode,
+        by default `0`, frames are encoded when written.
+    """
+
     def __init__(
-        self, input_path, save_path=".", information_file=None, make_video=True
+        self,
+        input_path,
+        save_path=".",
+        information_file=None,
+        make_video=True,
+        prefetch_size: int = 0,
+        scale: float = 1.0,
+        grayscale: bool = False,
+        write_queue_size: int = 0,
     ):
         if information_file is None:
             information_file = metrics.InformationFile(
                 file_path=os.path.join(input_path, "seqinfo.ini")
             )
+        self.make_video = make_video
+        self.video: Any = None  # cv2.VideoWriter, created on the first update
         if make_video:
             file_name = os.path.split(input_path)[1]
 
             # Search framerate on seqinfo.ini
             fps_val = information_file.search(variable_name="frameRate")
-            fps = float(fps_val) if isinstance(fps_val, (int, str)) else fps_val
-
-            # Search resolution in seqinfo.ini
-            h_res = information_file.search(variable_name="imWidth")
-            v_res = information_file.search(variable_name="imHeight")
-            horizontal_resolution = int(h_res) if not isinstance(h_res, int) else h_res
-            vertical_resolution = int(v_res) if not isinstance(v_res, int) else v_res
-            image_size = (horizontal_resolution, vertical_resolution)
+            self.fps = float(fps_val) if isinstance(fps_val, (int, str)) else fps_val
 
             videos_folder = os.path.join(save_path, "videos")
             if not os.path.exists(videos_folder):
                 os.makedirs(videos_folder)
 
-            video_path = os.path.join(videos_folder, file_name + ".mp4")
-            fourcc = _get_fourcc("mp4v")
-
+            self.video_path = os.path.join(videos_folder, file_name + ".mp4")
             self.file_name = file_name
-            # Video file
-            self.video = cv2.VideoWriter(video_path, fourcc, fps, image_size)
 
         length_val = information_file.search(variable_name="seqLength")
         self.length = int(length_val) if not isinstance(length_val, int) else length_val
@@ -348,26 +585,104 @@ class VideoFromFrames:
         dir_val = information_file.search("imDir")
         self.image_directory = str(dir_val) if not isinstance(dir_val, str) else dir_val
 
+        self.prefetch_size = prefetch_size
+        self.scale = scale
+        self.grayscale = grayscale
+        self.write_queue_size = write_queue_size
+        self._imread_flags, self._resize_scale = self._get_decoding(scale, grayscale)
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: deque[Future] = deque()
+        self._next_to_read = 1
+
+    @staticmethod
+    def _get_decoding(scale: float, grayscale: bool) -> tuple[int, float]:
+        """OpenCV `imread` flags, and the resize left to do after decoding."""
+        reduced = {
+            0.5: (cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+            0.25: (cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+            0.125: (cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+        }
+        if scale in reduced:
+            return reduced[scale][int(grayscale)], 1.0
+        flags = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        return flags, scale
+
+    def _frame_path(self, frame_number: int) -> str:
+        return os.path.join(
+            self.input_path,
+            self.image_directory,
+            str(frame_number).zfill(6) + self.image_extension,
+        )
+
+    def _read(self, frame_number: int) -> np.ndarray | None:
+        frame = cv2.imread(self._frame_path(frame_number), self._imread_flags)
+        if frame is not None and self._resize_scale != 1.0:
+            frame = cv2.resize(
+                frame,
+                None,
+                fx=self._resize_scale,
+                fy=self._resize_scale,
+                interpolation=cv2.INTER_AREA,
+            )
+        return frame
+
+    def _close_executor(self):
+        if self._executor is not None:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+
     def __iter__(self):
+        self._close_executor()
         self.frame_number = 1
+        if self.prefetch_size > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(self.prefetch_size, os.cpu_count() or 1)
+            )
+            self._next_to_read = 1
         return self
 
     def __next__(self):
         if self.frame_number <= self.length:
-            frame_path = os.path.join(
-                self.input_path,
-                self.image_directory,
-                str(self.frame_number).zfill(6) + self.image_extension,
-            )
+            if self._executor is None:
+                frame = self._read(self.frame_number)
+            else:
+                # Keep a window of `prefetch_size` images being read
+                while (
+                    len(self._pending) < self.prefetch_size
+                    and self._next_to_read <= self.length
+                ):
+                    self._pending.append(
+                        self._executor.submit(self._read, self._next_to_read)
+                    )
+                    self._next_to_read += 1
+                frame = self._pending.popleft().result()
+            if frame is None:
+                self._close_executor()
+                raise RuntimeError(
+                    f"Could not read the image of frame {self.frame_number}: '{self._frame_path(self.frame_number)}'."
+                )
             self.frame_number += 1
-
-            return cv2.imread(frame_path)
+            return frame
+        self._close_executor()
         raise StopIteration()
 
     def update(self, frame):
+        if self.video is None:
+            # OpenCV format is (width, height)
+            image_size = (frame.shape[1], frame.shape[0])
+            self.video = cv2.VideoWriter(
+                self.video_path,
+                _get_fourcc("mp4v"),
+                self.fps,
+                image_size,
+                isColor=frame.ndim == 3,
+            )
+            if self.write_queue_size > 0:
+                self.video = _AsyncVideoWriter(self.video, self.write_queue_size)
         self.video.write(frame)
-        cv2.waitKey(1)
 
         if self.frame_number > self.length:
-            cv2.destroyAllWindows()
             self.video.release()
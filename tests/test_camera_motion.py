@@ -1,6 +1,21 @@
+import asyncio
+from concurrent.futures import Future
+
 import numpy as np
+import pytest
 
-from norfair.camera_motion import HomographyTransformation
+from norfair import Detection, Tracker
+from norfair.camera_motion import (
+    AffineTransformation,
+    AffineTransformationGetter,
+    AsyncMotionEstimator,
+    HomographyTransformation,
+    MotionEstimator,
+    TranslationTransformation,
+    TranslationTransformationGetter,
+    _flow_mode,
+)
+from norfair.frame import FramePacket
 
 
 def test_homography_1d_point():
@@ -57,3 +72,219 @@ def test_homography_1d_non_identity():
     result = transform.abs_to_rel(point_1d)
     assert result.ndim == 1
     np.testing.assert_allclose(result, np.array([110.0, 220.0]))
+
+
+def _textured_frames(shifts):
+    cv2 = pytest.importorskip("cv2")
+    rng = np.random.default_rng(0)
+    texture = cv2.GaussianBlur(
+        (rng.random((300, 400)) * 255).astype(np.uint8), (7, 7), 2
+    )
+    texture = cv2.cvtColor(texture, cv2.COLOR_GRAY2BGR)
+    return [np.roll(texture, shift, axis=(0, 1)) for shift in shifts]
+
+
+def test_motion_estimator_frame_packet():
+    frames = _textured_frames([(0, 0), (2, 3), (4, 6), (6, 9)])
+    from_arrays = MotionEstimator(
+        transformations_getter=TranslationTransformationGetter()
+    )
+    from_packets = MotionEstimator(
+        transformations_getter=TranslationTransformationGetter()
+    )
+    for i, frame in enumerate(frames):
+        expected = from_arrays.update(frame)
+        packet = FramePacket(frame, i)
+        transformation = from_packets.update(packet)
+        # the grayscale frame is computed once and reused by the estimator
+        assert from_packets.gray_next is packet.gray
+        if expected is None:
+            assert transformation is None
+        else:
+            np.testing.assert_array_equal(
+                transformation.movement_vector, expected.movement_vector
+            )
+    np.testing.assert_allclose(transformation.abs_to_rel(np.zeros((1, 2))), [[9, 6]])
+
+
+def test_frame_packet_views():
+    (frame,) = _textured_frames([(0, 0)])
+    packet = FramePacket(frame)
+    assert packet.gray.shape == (300, 400)
+    assert packet.downscaled(0.5).shape == (150, 200, 3)
+    assert packet.downscaled(0.5) is packet.downscaled(0.5)
+    assert packet.downscaled(0.25, gray=True).shape == (75, 100)
+    assert packet.downscaled(1) is frame
+
+
+@pytest.mark.parametrize("processing_scale", [0.5, 0.25])
+def test_motion_estimator_processing_scale(processing_scale):
+    frames = _textured_frames([(0, 0), (4, 6), (8, 12), (12, 18)])
+    full = MotionEstimator(transformations_getter=TranslationTransformationGetter())
+    scaled = MotionEstimator(
+        transformations_getter=TranslationTransformationGetter(),
+        processing_scale=processing_scale,
+    )
+    for frame in frames:
+        expected = full.update(frame)
+        transformation = scaled.update(FramePacket(frame))
+    # the transformation is returned in full resolution coordinates
+    np.testing.assert_allclose(
+        transformation.movement_vector, expected.movement_vector, atol=1
+    )
+    assert scaled.gray_next.shape == (
+        round(frames[0].shape[0] * processing_scale),
+        round(frames[0].shape[1] * processing_scale),
+    )
+
+    with pytest.raises(ValueError):
+        MotionEstimator(processing_scale=0)
+
+
+def test_motion_estimator_replenish_grid():
+    frames = _textured_frames([(0, 0), (2, 3), (4, 6), (6, 9), (8, 12)])
+
+    def motion_estimator(**kwargs):
+        # a threshold above 1 changes the reference frame on every update
+        return MotionEstimator(
+            transformations_getter=TranslationTransformationGetter(
+                proportion_points_used_threshold=1.1
+            ),
+            **kwargs,
+        )
+
+    full = motion_estimator()
+    replenished = motion_estimator(replenish_grid=(3, 4))
+    for frame in frames:
+        expected = full.update(frame)
+        transformation = replenished.update(frame)
+        # the points are replenished instead of sampled again
+        assert full.prev_pts is None
+        assert 0 < len(replenished.prev_pts) <= replenished.max_points
+    np.testing.assert_allclose(transformation.movement_vector, expected.movement_vector)
+
+    with pytest.raises(ValueError):
+        MotionEstimator(replenish_grid=(0, 2))
+
+
+def test_async_motion_estimator():
+    frames = _textured_frames([(0, 0), (2, 3), (4, 6), (6, 9)])
+    motion_estimator = MotionEstimator(
+        transformations_getter=TranslationTransformationGetter()
+    )
+    expected = [motion_estimator.update(frame) for frame in frames]
+
+    with AsyncMotionEstimator(
+        MotionEstimator(transformations_getter=TranslationTransformationGetter())
+    ) as async_estimator:
+        futures = [async_estimator.update(frame) for frame in frames]
+        for future, transformation in zip(futures, expected):
+            np.testing.assert_allclose(
+                future.result().movement_vector, transformation.movement_vector
+            )
+
+    async def estimate():
+        with AsyncMotionEstimator(
+            MotionEstimator(transformations_getter=TranslationTransformationGetter())
+        ) as async_estimator:
+            return [await async_estimator.update_async(frame) for frame in frames]
+
+    for transformation, expected_transformation in zip(
+        asyncio.run(estimate()), expected
+    ):
+        np.testing.assert_allclose(
+            transformation.movement_vector, expected_transformation.movement_vector
+        )
+
+
+def test_tracker_resolves_transformation_future():
+    future = Future()
+    future.set_result(TranslationTransformation(np.array([10, 0])))
+    tracker = Tracker("euclidean", distance_threshold=1, initialization_delay=0)
+    tracker.update([Detection(np.array([[1, 1]]))], coord_transformations=future)
+    (obj,) = tracker.tracked_objects
+    np.testing.assert_allclose(obj.get_estimate(absolute=True), [[-9, 1]])
+
+
+@pytest.mark.parametrize("spread", [3, 1e6])
+def test_flow_mode_matches_unique(spread):
+    rng = np.random.default_rng(0)
+    flow = rng.normal(scale=spread, size=(200, 2))
+    flow[:40] = [1.3, -2.1]
+    bins = np.around(flow / 0.2) * 0.2
+    unique_flows, counts = np.unique(bins, axis=0, return_counts=True)
+
+    mode, count = _flow_mode(flow, 0.2)
+    np.testing.assert_allclose(mode, unique_flows[counts.argmax()])
+    assert count == counts.max()
+
+
+def test_affine_transformation():
+    angle, scale = 0.1, 1.2
+    matrix = np.array(
+        [
+            [scale * np.cos(angle), -scale * np.sin(angle), 5],
+            [scale * np.sin(angle), scale * np.cos(angle), -3],
+        ]
+    )
+    transformation = AffineTransformation(matrix)
+    points = np.array([[0, 0], [10, 20], [-4, 7]], dtype=float)
+    relative = transformation.abs_to_rel(points)
+    np.testing.assert_allclose(relative[0], [5, -3])
+    np.testing.assert_allclose(transformation.rel_to_abs(relative), points, atol=1e-9)
+    np.testing.assert_allclose(transformation.rel_to_abs(relative[1]), points[1])
+
+
+def test_affine_transformation_getter():
+    rng = np.random.default_rng(0)
+    prev_pts = rng.uniform(0, 500, size=(50, 2)).astype(np.float32)
+    matrix = np.array([[1.1, 0, 4], [0, 1.1, -2]])
+    curr_pts = AffineTransformation(matrix).abs_to_rel(prev_pts).astype(np.float32)
+
+    getter = AffineTransformationGetter(proportion_points_used_threshold=1.1)
+    update_prvs, transformation = getter(curr_pts, prev_pts)
+    assert update_prvs
+    np.testing.assert_allclose(transformation.affine_matrix, matrix, atol=1e-3)
+
+    # the next transformation is chained to the new reference
+    update_prvs, transformation = getter(curr_pts, curr_pts)
+    np.testing.assert_allclose(transformation.affine_matrix, matrix, atol=1e-3)
+
+    # too few points keep the last reference
+    update_prvs, transformation = getter(curr_pts[:1], prev_pts[:1])
+    assert update_prvs
+    np.testing.assert_allclose(transformation.affine_matrix, matrix, atol=1e-3)
+
+
+@pytest.mark.parametrize(
+    "transformation",
+    [
+        TranslationTransformation(np.array([3.0, -2.0])),
+        HomographyTransformation(
+            np.array([[1.1, 0.1, 3.0], [-0.05, 0.9, 7.0], [1e-4, 2e-4, 1.0]])
+        ),
+        AffineTransformation(np.array([[1.1, 0.1, 3.0], [-0.1, 1.1, 7.0]])),
+    ],
+)
+def test_transformation_out(transformation):
+    points = np.array([[0.0, 0.0], [10.0, 20.0], [-4.0, 7.0]])
+    expected = transformation.abs_to_rel(points)
+    np.testing.assert_allclose(transformation.rel_to_abs(expected), points, atol=1e-9)
+
+    out = np.empty_like(points)
+    assert transformation.abs_to_rel(points, out=out) is out
+    np.testing.assert_allclose(out, expected)
+
+    # in place
+    transformed = points.copy()
+    transformation.abs_to_rel(transformed, out=transformed)
+    np.testing.assert_allclose(transformed, expected)
+    transformation.rel_to_abs(transformed, out=transformed)
+    np.testing.assert_allclose(transformed, points, atol=1e-9)
+
+    # into an array that can't be reshaped without a copy
+    batch = np.stack([points, points + 1])
+    out = np.empty((3, 2, 2)).transpose(1, 0, 2)
+    assert not out.flags.c_contiguous
+    assert transformation.abs_to_rel(batch, out=out) is out
+    np.testing.assert_allclose(out, transformation.abs_to_rel(batch))
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pytest
+
+from norfair.history import TrackHistory
+
+
+class FakeTrackedObject:
+    def __init__(self, id, estimate):
+        self.id = id
+        self.estimate = np.array(estimate, dtype=float)
+        self.live_points = np.ones(len(self.estimate), dtype=bool)
+
+    def get_estimate(self, absolute=False):
+        return self.estimate
+
+
+def objects_at(frame, ids=(1, 2, 3)):
+    """Objects moving right, each one on its own row."""
+    return [
+        FakeTrackedObject(id, [[frame, 10 * id], [frame + 2, 10 * id + 2]])
+        for id in ids
+    ]
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_last_estimates_and_query_box(tmp_path, spill):
+    history = TrackHistory(chunk_size=4, path=str(tmp_path) if spill else None)
+    for frame in range(10):
+        history.update(objects_at(frame, ids=(1, 2) if frame < 5 else (1, 3)))
+    assert len(history) == 20
+    if spill:
+        assert len(os.listdir(tmp_path)) == 3 * 5
+
+    tails = history.last_estimates([1, 2, 4], 3)
+    assert list(tails) == [1, 2]
+    np.testing.assert_equal(tails[1][:, 0, 0], [7, 8, 9])
+    np.testing.assert_equal(tails[2][:, 0, 0], [2, 3, 4])
+    assert history.last_estimates([3], 100)[3].shape == (5, 2, 2)
+
+    # centers of object 1 are at (frame + 1, 11), object 3 at (frame + 1, 31)
+    found = history.query_box([3, 0], [7.5, 20], start_frame=4, end_frame=8)
+    assert list(found) == [1]
+    frames, estimates = found[1]
+    np.testing.assert_equal(frames, [4, 5, 6])
+    np.testing.assert_equal(estimates[:, 0, 0], [4, 5, 6])
+    assert list(history.query_box([0, 0], [100, 100])) == [1, 2, 3]
+    assert history.query_box([0, 0], [100, 100], start_frame=20) == {}
+
+    history.close()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_retention(tmp_path, spill):
+    history = TrackHistory(
+        retention=4, chunk_size=3, path=str(tmp_path) if spill else None
+    )
+    for frame in range(6):
+        history.update(objects_at(frame, ids=(1, 2) if frame < 3 else (1,)))
+    # object 2 was last seen on frame 2, it is dead from frame 6 on
+    assert list(history.last_estimates([1, 2], 10)) == [1, 2]
+    history.update(objects_at(6, ids=(1,)))
+    assert list(history.last_estimates([1, 2], 10)) == [1]
+    assert list(history.query_box([0, 0], [100, 100])) == [1]
+
+    for frame in range(7, 9):
+        history.update(objects_at(frame, ids=(1,)))
+    # the rows of object 2 are removed
+    assert len(history) == 9
+    np.testing.assert_equal(history.last_estimates([1], 20)[1][:, 0, 0], range(9))
+    if spill:
+        files = os.listdir(tmp_path)
+        # the two chunks with rows of object 2 were rewritten without them
+        assert len(files) == 3 * 4
+        assert all(
+            2 not in np.load(tmp_path / file)
+            for file in files
+            if file.endswith("_ids.npy")
+        )
+
+
+def test_history_errors():
+    history = TrackHistory()
+    history.update(objects_at(0))
+    with pytest.raises(ValueError):
+        history.update(objects_at(1), frame_number=-1)
+    with pytest.raises(ValueError):
+        history.update([FakeTrackedObject(1, [[0, 0]])])
+    with pytest.raises(ValueError):
+        TrackHistory(retention=0)
+
+
+def test_absolute_paths_history():
+    pytest.importorskip("cv2")
+    from norfair.drawing import AbsolutePaths
+
+    with pytest.raises(ValueError):
+        AbsolutePaths(history=TrackHistory())
+
+    history = TrackHistory(absolute=True)
+    drawers = [
+        AbsolutePaths(max_history=3),
+        AbsolutePaths(max_history=3, history=history),
+    ]
+    for frame_number in range(8):
+        tracked_objects = objects_at(
+            10 * frame_number, ids=(1, 2) if frame_number < 4 else (1,)
+        )
+        history.update(tracked_objects)
+        frames = [
+            drawer.draw(np.zeros((100, 100, 3), dtype=np.uint8), tracked_objects)
+            for drawer in drawers
+        ]
+        np.testing.assert_array_equal(frames[0], frames[1])
+    # the drawer without history forgets the objects that are gone for longer than a path
+    assert list(drawers[0].past_points) == [1]
+
+
+def test_absolute_paths_left_out_objects():
+    pytest.importorskip("cv2")
+    from norfair.drawing import AbsolutePaths
+
+    drawer = AbsolutePaths(max_history=3)
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    for frame_number in range(4):
+        drawer.draw(frame, objects_at(10 * frame_number))
+    # an object left out of a call, like when filtering by label, keeps its path
+    drawer.draw(frame, objects_at(40, ids=(1, 3)))
+    assert len(drawer.past_points[2]) == 3
+    drawer.draw(frame, objects_at(50))
+    np.testing.assert_array_equal(drawer.past_points[2][0], [[51, 21]])
+    assert len(drawer.past_points[2]) == 3
+
+    # objects that aren't drawn for longer than the path are forgotten
+    for frame_number in range(6, 10):
+        drawer.draw(frame, objects_at(10 * frame_number, ids=(1, 3)))
+    assert sorted(drawer.past_points) == [1, 3]
@@ -0,0 +1,280 @@
+import os
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from norfair import Detection, Tracker
+from norfair.metrics import (
+    DetectionFileParser,
+    OnlineMOTMetrics,
+    PredictionsTextFile,
+    _GrowableArray,
+    _iou_distances,
+    _max_overlap_matching,
+    _predictions_to_rows,
+    eval_mot_challenge,
+    evaluate_mot_sequence,
+)
+
+
+def test_growable_array():
+    buffer = _GrowableArray(num_columns=3, capacity=2)
+    assert buffer.array.shape == (0, 3)
+    rows = np.arange(15, dtype=float).reshape(5, 3)
+    buffer.extend(rows[:1])
+    buffer.extend(rows[1:4])
+    buffer.extend(rows[4:])
+    buffer.extend(rows[:0])
+    np.testing.assert_equal(buffer.array, rows)
+
+
+def test_predictions_to_rows():
+    tracker = Tracker("iou", distance_threshold=0.5, initialization_delay=0)
+    boxes = [np.array([[10, 20], [30, 60]]), np.array([[100, 100], [110, 130]])]
+    predictions = tracker.update([Detection(box) for box in boxes])
+
+    rows = _predictions_to_rows(predictions, frame_number=7)
+    np.testing.assert_equal(
+        rows,
+        [
+            [7, 1, 10, 20, 20, 40, -1, -1, -1, -1],
+            [7, 2, 100, 100, 10, 30, -1, -1, -1, -1],
+        ],
+    )
+    assert _predictions_to_rows([], frame_number=7).shape == (0, 10)
+
+
+@pytest.fixture
+def sequence_path(tmp_path):
+    """MOTChallenge sequence of 4 frames, without detections on the third one."""
+    (tmp_path / "det").mkdir()
+    (tmp_path / "seqinfo.ini").write_text("[Sequence]\nseqLength=4\n")
+    (tmp_path / "det" / "det.txt").write_text(
+        "2,-1,10,20,5,5,0.9,-1,-1,-1\n"
+        "1,-1,1,2,3,4,0.5,-1,-1,-1\n"
+        "4,-1,7,7,1,1,0.8,-1,-1,-1\n"
+        "2,-1,30,40,10,10,0.7,-1,-1,-1\n"
+    )
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_detection_file_parser(sequence_path, cache):
+    for _ in range(2):
+        parser = DetectionFileParser(sequence_path, cache=cache)
+        frames = list(parser)
+        assert [len(detections) for detections in frames] == [1, 2, 0, 1]
+        np.testing.assert_equal(frames[0][0].points, [[1, 2], [4, 6]])
+        np.testing.assert_allclose(frames[0][0].scores, [0.5, 0.5])
+        # rows of the same frame keep the order of the file
+        np.testing.assert_equal(
+            parser.get_frame_matrix(2)[:, 2:6], [[10, 20, 15, 25], [30, 40, 40, 50]]
+        )
+        assert parser.get_frame_matrix(5).shape == (0, 10)
+        # the detections of all the frames are only built once
+        assert parser.sorted_by_frame is parser.sorted_by_frame
+        assert list(map(len, parser.sorted_by_frame)) == [1, 2, 0, 1]
+    cache_path = os.path.join(sequence_path, "det", "det.npy")
+    assert os.path.exists(cache_path) == cache
+    # the second time the cache is memory mapped instead of parsed
+    assert isinstance(parser.matrix_detections, np.memmap) == cache
+
+
+@pytest.mark.parametrize("buffer_size", [1, 3, 10000])
+def test_predictions_text_file(sequence_path, tmp_path, buffer_size):
+    predictions_file = PredictionsTextFile(
+        sequence_path, save_path=str(tmp_path), buffer_size=buffer_size, binary=True
+    )
+    tracker = Tracker("iou", distance_threshold=0.5, initialization_delay=0)
+    boxes = [np.array([[10.5, 20], [30, 60]]), np.array([[100, 100], [110, 130]])]
+    for frame in range(4):
+        predictions = tracker.update([Detection(box + frame) for box in boxes])
+        predictions_file.update(predictions if frame != 2 else [])
+    assert predictions_file.text_file.closed
+
+    name = os.path.basename(sequence_path)
+    lines = (tmp_path / "predictions" / f"{name}.txt").read_text().splitlines()
+    assert len(lines) == 6
+    assert lines[0] == "1,1,10.5,20.0,19.5,40.0,-1,-1,-1,-1"
+    assert [line.split(",")[:2] for line in lines[-2:]] == [["4", "1"], ["4", "2"]]
+
+    rows = np.load(tmp_path / "predictions" / f"{name}.npy")
+    np.testing.assert_equal(
+        rows, np.loadtxt(tmp_path / "predictions" / f"{name}.txt", delimiter=",")
+    )
+
+
+def test_predictions_text_file_float32(sequence_path, tmp_path):
+    predictions_file = PredictionsTextFile(sequence_path, save_path=str(tmp_path))
+    tracker = Tracker(
+        "iou", distance_threshold=0.5, initialization_delay=0, dtype=np.float32
+    )
+    box = np.array([[10.1, 20.3], [30.7, 60.9]], dtype=np.float32)
+    (obj,) = tracker.update([Detection(box)])
+    predictions_file.update([obj])
+    predictions_file.close()
+
+    name = os.path.basename(sequence_path)
+    text = (tmp_path / "predictions" / f"{name}.txt").read_text()
+    # the boxes are printed like the float32 values of the estimate
+    estimate = obj.estimate
+    left, top = estimate[0]
+    width, height = estimate[1] - estimate[0]
+    values = ",".join(map(str, [left, top, width, height]))
+    assert text == f"1,1,{values},-1,-1,-1,-1\n"
+    assert text.startswith("1,1,10.1,20.3,")
+
+
+def test_iou_distances():
+    gt_boxes = np.array([[0, 0, 2, 2], [10, 10, 1, 1]], dtype=float)
+    predicted_boxes = np.array([[1, 0, 2, 2], [0, 0, 2, 2]], dtype=float)
+    np.testing.assert_allclose(
+        _iou_distances(gt_boxes, predicted_boxes, max_distance=1),
+        [[2 / 3, 0], [1, 1]],
+    )
+    distances = _iou_distances(gt_boxes, predicted_boxes, max_distance=0.5)
+    np.testing.assert_equal(np.isnan(distances), [[True, False], [True, True]])
+
+
+def test_max_overlap_matching():
+    # (1, 10) and (2, 11) are better than (1, 11), and (3, 30) is an independent component
+    pair_counts = Counter({(1, 10): 3, (1, 11): 4, (2, 11): 2, (3, 30): 5})
+    assert _max_overlap_matching(pair_counts) == 10
+    assert _max_overlap_matching(Counter()) == 0
+
+
+def mot_rows(frame, boxes):
+    return [[frame, id, x, y, 10, 10, 1, -1, -1, -1] for id, (x, y) in boxes.items()]
+
+
+@pytest.fixture
+def mot_sequence():
+    """Ground truth and predictions of 4 frames, where object 1 is tracked by prediction 10 and then by 11, and object 2 is lost twice."""
+    gt = []
+    predictions = []
+    for frame in range(1, 5):
+        gt += mot_rows(frame, {1: (0, 0), 2: (50, 50)})
+    predictions += mot_rows(1, {10: (0, 0), 20: (50, 50)})
+    predictions += mot_rows(2, {10: (0, 0)})
+    predictions += mot_rows(3, {11: (0, 0), 20: (51, 50)})
+    predictions += mot_rows(4, {11: (0, 0), 30: (100, 100)})
+    return np.array(gt), np.array(predictions)
+
+
+def test_evaluate_mot_sequence(mot_sequence):
+    metrics = evaluate_mot_sequence(*mot_sequence)
+    assert metrics["num_frames"] == 4
+    assert metrics["num_objects"] == 8
+    assert metrics["num_switches"] == 1
+    assert metrics["num_ascend"] == 1
+    assert metrics["num_misses"] == 2
+    assert metrics["num_false_positives"] == 1
+    # the miss on the last frame isn't followed by a match
+    assert metrics["num_fragmentations"] == 1
+    assert metrics["mostly_tracked"] == 1
+    assert metrics["partially_tracked"] == 1
+    assert metrics["mostly_lost"] == 0
+    assert metrics["recall"] == pytest.approx(6 / 8)
+    assert metrics["precision"] == pytest.approx(6 / 7)
+    assert metrics["mota"] == pytest.approx(1 - 4 / 8)
+    assert metrics["motp"] == pytest.approx((1 - 90 / 110) / 6)
+    assert metrics["idf1"] == pytest.approx(2 * 4 / (8 + 7))
+    assert metrics["idp"] == pytest.approx(4 / 7)
+    assert metrics["idr"] == pytest.approx(4 / 8)
+
+
+def test_evaluate_mot_sequence_transfer():
+    gt = mot_rows(1, {1: (0, 0)}) + mot_rows(2, {2: (50, 50)})
+    predictions = mot_rows(1, {10: (0, 0)}) + mot_rows(2, {10: (50, 50)})
+    metrics = evaluate_mot_sequence(np.array(gt), np.array(predictions))
+    assert metrics["num_switches"] == 0
+    assert metrics["num_transfer"] == 1
+    assert metrics["num_migrate"] == 1
+    assert metrics["idf1"] == pytest.approx(0.5)
+
+    metrics = evaluate_mot_sequence(np.array(gt), np.empty((0, 10)))
+    assert metrics["num_misses"] == 2
+    assert metrics["recall"] == 0
+    assert np.isnan(metrics["precision"])
+
+
+def test_evaluate_mot_sequence_transfer_back():
+    """Prediction 10 goes from object 1 to 2, back to 1, and then to 2 again."""
+    gt = (
+        mot_rows(1, {1: (0, 0)})
+        + mot_rows(2, {2: (50, 50)})
+        + mot_rows(3, {1: (0, 0), 2: (50, 50)})
+        + mot_rows(4, {2: (50, 50)})
+    )
+    predictions = (
+        mot_rows(1, {10: (0, 0)})
+        + mot_rows(2, {10: (50, 50)})
+        + mot_rows(3, {10: (0, 0), 20: (50, 50)})
+        + mot_rows(4, {10: (50, 50)})
+    )
+    metrics = evaluate_mot_sequence(np.array(gt), np.array(predictions))
+    # the counts of motmetrics: object 1 takes back prediction 10 on the third frame
+    # through its previous match, which isn't a transfer, so when object 2 switches
+    # back to it on the last frame, the prediction is still considered to follow object 2
+    assert metrics["num_matches"] == 3
+    assert metrics["num_switches"] == 2
+    assert metrics["num_ascend"] == 1
+    assert metrics["num_transfer"] == 1
+    assert metrics["num_migrate"] == 1
+
+
+def test_eval_mot_challenge(tmp_path):
+    (tmp_path / "MOT-01" / "gt").mkdir(parents=True)
+    gt = mot_rows(1, {1: (0, 0)}) + mot_rows(2, {1: (0, 0), 2: (50, 50)})
+    # boxes with confidence 0 are ignored
+    gt[-1][6] = 0
+    np.savetxt(tmp_path / "MOT-01" / "gt" / "gt.txt", gt, delimiter=",")
+    predictions = np.array(mot_rows(1, {5: (0, 0)}) + mot_rows(2, {5: (0, 0)}))
+
+    summary_text, summary = eval_mot_challenge(
+        [predictions],
+        [str(tmp_path / "MOT-01")],
+        metrics=["mota", "num_unique_objects"],
+    )
+    assert summary == {
+        "MOT-01": {"mota": 1.0, "num_unique_objects": 1},
+        "OVERALL": {"mota": 1.0, "num_unique_objects": 1},
+    }
+    assert summary_text.splitlines()[1].split() == ["MOT-01", "100.0%", "1"]
+
+
+def test_online_mot_metrics(mot_sequence):
+    gt, predictions = mot_sequence
+    online_metrics = OnlineMOTMetrics()
+    for frame in range(1, 5):
+        online_metrics.update(
+            gt[gt[:, 0] == frame], predictions[predictions[:, 0] == frame]
+        )
+        # the running metrics are those of the sequence up to this frame
+        expected = evaluate_mot_sequence(
+            gt[gt[:, 0] <= frame], predictions[predictions[:, 0] <= frame]
+        )
+        assert online_metrics.compute() == pytest.approx(expected, nan_ok=True)
+    # a frame without boxes is evaluated, but isn't part of the metrics
+    online_metrics.update(np.empty((0, 10)))
+    assert online_metrics.num_frames == 5
+    assert online_metrics.compute() == pytest.approx(expected, nan_ok=True)
+    assert "MOTA" in online_metrics.render()
+
+
+def test_online_mot_metrics_tracked_objects():
+    tracker = Tracker("iou", distance_threshold=0.5, initialization_delay=0)
+    online_metrics = OnlineMOTMetrics()
+    for frame in range(1, 6):
+        boxes = {1: (frame, 0), 2: (50, 50 + frame)}
+        gt = np.array(mot_rows(frame, boxes), dtype=float)
+        detections = [
+            Detection(np.array([[x, y], [x + 10, y + 10]])) for x, y in boxes.values()
+        ]
+        online_metrics.update(gt, tracker.update(detections) if frame != 3 else None)
+    metrics = online_metrics.compute()
+    assert metrics["num_misses"] == 2
+    assert metrics["num_switches"] == 0
+    assert metrics["num_fragmentations"] == 2
+    assert metrics["idf1"] == pytest.approx(2 * 8 / (10 + 8))
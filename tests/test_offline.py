@@ -0,0 +1,69 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from norfair import Detection, Tracker  # noqa: E402
+from norfair.offline import _split_in_chunks, track_video_in_chunks  # noqa: E402
+
+NUM_FRAMES = 60
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Video of two white squares moving in opposite directions."""
+    path = str(tmp_path / "squares.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (320, 120))
+    for i in range(NUM_FRAMES):
+        frame = np.zeros((120, 320, 3), dtype=np.uint8)
+        frame[10:40, 20 + 4 * i : 50 + 4 * i] = 255
+        frame[70:100, 270 - 4 * i : 300 - 4 * i] = 255
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def detect_squares(frame):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    count, _, stats, _ = cv2.connectedComponentsWithStats((gray > 127).astype(np.uint8))
+    return [
+        Detection(np.array([[x, y], [x + w, y + h]], dtype=float))
+        for x, y, w, h, _ in stats[1:count]
+    ]
+
+
+def test_split_in_chunks():
+    chunks = _split_in_chunks(25, chunk_size=10, overlap=3)
+    assert [(c.start, c.end, c.first_output) for c in chunks] == [
+        (0, 13, 0),
+        (10, 23, 13),
+        (20, 25, 23),
+    ]
+
+
+@pytest.mark.parametrize("period", [1, 2])
+def test_track_video_in_chunks(video_path, period):
+    tracker_factory = partial(
+        Tracker,
+        distance_function="iou",
+        distance_threshold=0.7,
+        hit_counter_max=4,
+        initialization_delay=1,
+    )
+    frames = track_video_in_chunks(
+        video_path,
+        detect_squares,
+        tracker_factory,
+        chunk_size=15,
+        overlap=6,
+        max_workers=2,
+        period=period,
+    )
+    assert len(frames) == NUM_FRAMES
+    # once initialized, both squares keep the same id through every chunk
+    assert all(len(states) == 2 for states in frames[4:])
+    assert {state.id for states in frames for state in states} == {1, 2}
+    top_ids = {min(states, key=lambda s: s.estimate[0, 1]).id for states in frames[4:]}
+    assert len(top_ids) == 1
@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from norfair import Detection, Tracker
+from norfair.camera_motion import (
+    AffineTransformation,
+    HomographyTransformation,
+    TranslationTransformation,
+)
+from norfair.recording import TrackerRecorder, TrackerReplayer
+
+NUM_FRAMES = 12
+
+
+def make_inputs(frame):
+    """Arguments of `Tracker.update` covering every kind of recorded input."""
+    if frame == 5:
+        return None, 2, None
+    detections = [
+        Detection(
+            np.array([[10.0 + frame, 20], [30 + frame, 40]]),
+            scores=np.array([0.9, 0.8]),
+            label="car",
+            embedding=np.arange(4, dtype=np.float32) + frame,
+        ),
+        Detection(
+            np.array([[100.0 - frame, 50], [130 - frame, 80]]),
+            label=7,
+        ),
+        Detection(np.array([[200.0, 200], [220, 230]]), scores=0.5),
+    ]
+    transformations = [
+        None,
+        TranslationTransformation(np.array([frame, -frame], dtype=np.float32)),
+        HomographyTransformation(np.array([[1, 0.01, frame], [0, 1, 2], [0, 0, 1]])),
+        AffineTransformation(np.array([[1.0, 0, frame], [0, 1.0, -1]])),
+    ]
+    return detections, 1, transformations[frame % 4]
+
+
+def track(tracker, inputs):
+    return [
+        [(obj.id, obj.label, obj.estimate.copy()) for obj in tracker.update(*args)]
+        for args in inputs
+    ]
+
+
+def assert_same_tracks(tracks, expected):
+    assert len(tracks) == len(expected)
+    for objects, expected_objects in zip(tracks, expected):
+        assert [o[:2] for o in objects] == [o[:2] for o in expected_objects]
+        for obj, expected_obj in zip(objects, expected_objects):
+            np.testing.assert_array_equal(obj[2], expected_obj[2])
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "tracker.rec")
+    with TrackerRecorder(path) as recorder:
+        for frame in range(NUM_FRAMES):
+            recorder.record(*make_inputs(frame))
+
+    replayer = TrackerReplayer(path)
+    assert len(replayer) == NUM_FRAMES
+    assert replayer.labels == ["car", 7]
+
+    detections, period, transformation = replayer[5]
+    assert detections is None and period == 2 and transformation is None
+    detections, period, transformation = replayer[1]
+    expected_detections, _, expected_transformation = make_inputs(1)
+    assert isinstance(transformation, TranslationTransformation)
+    assert transformation.movement_vector.dtype == np.float32
+    np.testing.assert_array_equal(
+        transformation.movement_vector, expected_transformation.movement_vector
+    )
+    for det, expected in zip(detections, expected_detections):
+        np.testing.assert_array_equal(det.points, expected.points)
+        np.testing.assert_array_equal(det.scores, expected.scores)
+        assert det.label == expected.label
+        np.testing.assert_array_equal(det.embedding, expected.embedding)
+    assert detections[1].scores is None and detections[1].embedding is None
+    assert detections[0].embedding.dtype == np.float32
+
+    # replaying drives a new tracker exactly like the original inputs
+    def tracker_factory():
+        return Tracker("iou", distance_threshold=0.5, initialization_delay=1)
+
+    expected_tracks = track(
+        tracker_factory(), [make_inputs(frame) for frame in range(NUM_FRAMES)]
+    )
+    tracks = [
+        [(obj.id, obj.label, obj.estimate.copy()) for obj in objects]
+        for objects in replayer.replay(tracker_factory())
+    ]
+    assert_same_tracks(tracks, expected_tracks)
+
+
+def test_append_and_truncated_record(tmp_path):
+    path = str(tmp_path / "tracker.rec")
+    with TrackerRecorder(path) as recorder:
+        for frame in range(3):
+            recorder.record(*make_inputs(frame))
+    # an interrupted recording leaves half a record at the end
+    with open(path, "ab") as log:
+        log.write(b"\x02\x00\x00\x00\xff\x00\x00\x00partial")
+    assert len(TrackerReplayer(path)) == 3
+
+    with TrackerRecorder(path) as recorder:
+        for frame in range(3, 6):
+            recorder.record(*make_inputs(frame))
+    replayer = TrackerReplayer(path)
+    assert len(replayer) == 6
+    # labels seen before appending aren't recorded again
+    assert replayer.labels == ["car", 7]
+    np.testing.assert_array_equal(replayer[4][0][0].points, make_inputs(4)[0][0].points)
+
+
+def test_float32_record(tmp_path):
+    path = str(tmp_path / "tracker.rec")
+    detection = Detection(
+        np.array([[1, 2], [3, 4]], dtype=np.float32),
+        scores=np.array([0.3, 0.7], dtype=np.float32),
+    )
+    with TrackerRecorder(path) as recorder:
+        recorder.record([detection])
+    (replayed,), _, _ = TrackerReplayer(path)[0]
+    # the types are kept, so the replay matches a float32 tracker exactly
+    assert replayed.points.dtype == replayed.scores.dtype == np.float32
+    np.testing.assert_array_equal(replayed.scores, detection.scores)
+
+
+def test_recording_errors(tmp_path):
+    (tmp_path / "other.rec").write_bytes(b"not a recording")
+    with pytest.raises(ValueError):
+        TrackerReplayer(str(tmp_path / "other.rec"))
+
+    with (
+        TrackerRecorder(str(tmp_path / "tracker.rec")) as recorder,
+        pytest.raises(ValueError),
+    ):
+        recorder.record([Detection(np.array([[1, 2]], dtype=np.uint8))])
@@ -0,0 +1,95 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from norfair import Detection, Tracker
+from norfair.metrics import evaluate_mot_sequence
+from norfair.sweep import config_grid, sweep_mot_challenge
+
+NUM_FRAMES = 20
+
+
+def write_sequence(path, offset):
+    """MOTChallenge sequence of two boxes moving apart, whose detections are the ground truth."""
+    (path / "det").mkdir(parents=True)
+    (path / "gt").mkdir()
+    (path / "seqinfo.ini").write_text(f"[Sequence]\nseqLength={NUM_FRAMES}\n")
+    gt = []
+    for frame in range(1, NUM_FRAMES + 1):
+        gt.append([frame, 1, offset + 3 * frame, 10, 20, 20, 1, 1, 1, -1])
+        gt.append([frame, 2, 300 - 3 * frame, 60, 20, 20, 1, 1, 1, -1])
+    gt = np.array(gt, dtype=float)
+    np.savetxt(path / "gt" / "gt.txt", gt, delimiter=",", fmt="%g")
+    detections = gt.copy()
+    detections[:, 1] = -1
+    np.savetxt(path / "det" / "det.txt", detections, delimiter=",", fmt="%g")
+    return gt
+
+
+def test_config_grid():
+    assert config_grid(a=[1, 2], b=["x"]) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+    assert config_grid() == [{}]
+
+
+def test_sweep_mot_challenge(tmp_path):
+    paths = [str(tmp_path / f"MOT-0{i}") for i in range(3)]
+    gts = [write_sequence(tmp_path / f"MOT-0{i}", 10 * i) for i in range(3)]
+    tracker_factory = partial(Tracker, distance_function="iou", distance_threshold=0.5)
+    configs = {
+        "fast": {"initialization_delay": 0},
+        "slow": {"initialization_delay": 3, "hit_counter_max": 5},
+        # never initializes any object
+        "late": {"initialization_delay": NUM_FRAMES, "hit_counter_max": NUM_FRAMES + 1},
+    }
+
+    summary_text, summary = sweep_mot_challenge(
+        paths,
+        configs,
+        tracker_factory,
+        early_stopping_sequences=1,
+        early_stopping_margin=0.5,
+        max_workers=2,
+    )
+    assert list(summary) == ["fast", "slow", "late"]
+    assert [metrics["num_sequences"] for metrics in summary.values()] == [3, 3, 1]
+    assert summary["fast"]["mota"] == 1
+    assert summary["late"]["mota"] == 0
+
+    # the same results as evaluating each sequence on its own
+    total_misses = 0
+    for gt in gts:
+        tracker = tracker_factory(**configs["slow"])
+        predictions = []
+        for frame in range(1, NUM_FRAMES + 1):
+            for obj in tracker.update(
+                [
+                    Detection(np.array([row[2:4], row[2:4] + row[4:6]]))
+                    for row in gt[gt[:, 0] == frame]
+                ]
+            ):
+                x, y = obj.estimate[0]
+                w, h = obj.estimate[1] - obj.estimate[0]
+                predictions.append([frame, obj.id, x, y, w, h])
+        total_misses += evaluate_mot_sequence(gt, np.array(predictions))["num_misses"]
+    assert summary["slow"]["num_misses"] == total_misses > 0
+
+    lines = summary_text.splitlines()
+    assert lines[0].split()[:2] == ["MOTA", "num_sequences"]
+    assert lines[1].startswith("fast")
+
+    with pytest.raises(ValueError):
+        sweep_mot_challenge(paths, configs, metric="num_switches")
+
+
+def test_sweep_sequences_with_the_same_name(tmp_path):
+    paths = [str(tmp_path / split / "MOT-01") for split in ("train", "test")]
+    for i, path in enumerate(paths):
+        write_sequence(tmp_path / path, 10 * i)
+    _, summary = sweep_mot_challenge(
+        paths,
+        {"fast": {"initialization_delay": 0}},
+        partial(Tracker, distance_function="iou", distance_threshold=0.5),
+        max_workers=1,
+    )
+    assert summary["fast"]["num_sequences"] == 2
@@ -4,9 +4,11 @@ import pytest
 from norfair import (
     Detection,
     FilterPyKalmanFilterFactory,
+    NoFilterFactory,
     OptimizedKalmanFilterFactory,
     Tracker,
 )
+from norfair.camera_motion import TranslationTransformation
 from norfair.utils import validate_points
 
 
@@ -494,8 +496,254 @@ def test_detection_age_after_merge():
         assert pd.age is not None
 
 
+def test_detection_absolute_points_copy_on_write(mock_coordinate_transformation):
+    points = np.array([[1.0, 1.0], [2.0, 2.0]])
+    detection = Detection(points, scores=0.5)
+
+    # no transformation: absolute points are the points themselves, no copy is made
+    assert detection.absolute_points is detection.points
+    np.testing.assert_equal(detection.scores, [0.5, 0.5])
+
+    detection.update_coordinate_transformation(
+        mock_coordinate_transformation(
+            relative_points=points, absolute_points=points + 1
+        )
+    )
+    np.testing.assert_equal(detection.absolute_points, points + 1)
+    np.testing.assert_equal(detection.points, points)
+
+    with pytest.raises(AttributeError):
+        detection.unknown_attribute = None
+
+
+@pytest.mark.parametrize("past_detections_length", [1, 3, 5])
+def test_past_detections_uniform_sampling(past_detections_length):
+    tracker = Tracker(
+        "euclidean",
+        distance_threshold=100,
+        initialization_delay=0,
+        past_detections_length=past_detections_length,
+    )
+
+    # reference implementation of the sampling policy over a python list
+    expected_ages = []
+    for age in range(50):
+        point = np.array([[age, 0.0]])
+        tracked_objects = tracker.update([Detection(point, scores=1, data=age)])
+        if len(expected_ages) < past_detections_length:
+            expected_ages.append(age)
+        elif age >= expected_ages[0] * past_detections_length:
+            expected_ages = expected_ages[1:] + [age]
+
+        past_detections = tracked_objects[0].past_detections
+        assert [d.age for d in past_detections] == expected_ages
+        for d in past_detections:
+            assert d.data == d.age
+            np.testing.assert_equal(d.points, [[d.age, 0.0]])
+            np.testing.assert_equal(d.scores, [1])
+
+
+def test_past_detections_without_data():
+    tracker = Tracker(
+        "euclidean",
+        distance_threshold=100,
+        initialization_delay=0,
+        keep_past_detections_data=False,
+    )
+    embedding = np.arange(8.0)
+    for _ in range(3):
+        detection = Detection(np.array([[1, 1]]), data="crop", embedding=embedding)
+        tracked_objects = tracker.update([detection])
+
+    obj = tracked_objects[0]
+    assert obj.last_detection.data == "crop"
+    assert len(obj.past_detections) == 3
+    for past_detection in obj.past_detections:
+        assert past_detection.data is None
+        assert past_detection.scores is None
+        np.testing.assert_equal(past_detection.embedding, embedding)
+
+
+@pytest.mark.parametrize(
+    "factory_class",
+    [FilterPyKalmanFilterFactory, OptimizedKalmanFilterFactory, NoFilterFactory],
+)
+def test_filter_pool(factory_class):
+    factory = factory_class(pool_size=1)
+    initial = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+    filter = factory.create_filter(initial)
+    fresh_x = filter.x.copy()
+    for i in range(3):
+        filter.predict()
+        filter.update(initial.reshape(-1, 1) + i)
+    factory.release_filter(filter)
+
+    # the released filter is reset and handed to the next object with its dimensions
+    recycled = factory.create_filter(initial)
+    assert recycled is filter
+    reference = factory_class().create_filter(initial)
+    np.testing.assert_equal(recycled.x, fresh_x)
+    for name in ("P", "Q", "R", "pos_variance", "pos_vel_covariance", "vel_variance"):
+        if hasattr(reference, name):
+            np.testing.assert_equal(getattr(recycled, name), getattr(reference, name))
+
+    # other dimensions get a new filter, and the pool doesn't exceed its size
+    assert factory.create_filter(initial[:1]) is not filter
+    factory.release_filter(filter)
+    factory.release_filter(factory_class().create_filter(initial))
+    assert factory.create_filter(initial) is filter
+    assert factory.create_filter(initial) is not filter
+
+
+def test_filterpy_shared_matrices():
+    factory = FilterPyKalmanFilterFactory()
+    a = factory.create_filter(np.array([[1.0, 1.0]]))
+    b = factory.create_filter(np.array([[2.0, 2.0]]))
+    assert a.F is b.F and a.H is b.H and a._I is b._I
+    assert not a.F.flags.writeable
+    assert a.P is not b.P
+
+
+@pytest.mark.parametrize(
+    "factory_class",
+    [FilterPyKalmanFilterFactory, OptimizedKalmanFilterFactory, NoFilterFactory],
+)
+def test_tracker_with_filter_pool(factory_class):
+    def run(filter_factory):
+        tracker = Tracker(
+            "euclidean",
+            distance_threshold=20,
+            hit_counter_max=2,
+            initialization_delay=1,
+            filter_factory=filter_factory,
+        )
+        estimates = []
+        for frame in range(40):
+            # objects are born and die every few frames
+            detections = [
+                Detection(np.array([[100.0 * i + frame, 0.0]]))
+                for i in range(5)
+                if (frame + i) % 7 < 4
+            ]
+            estimates.append(
+                [(o.id, o.estimate.tolist()) for o in tracker.update(detections)]
+            )
+        return estimates
+
+    pooled_factory = factory_class(pool_size=5)
+    released = []
+    release_filter = pooled_factory.release_filter
+    pooled_factory.release_filter = lambda f: released.append(f) or release_filter(f)
+    assert run(pooled_factory) == run(factory_class())
+    assert released
+
+
+@pytest.mark.parametrize(
+    "factory_class",
+    [FilterPyKalmanFilterFactory, OptimizedKalmanFilterFactory, NoFilterFactory],
+)
+def test_float32_tracking(factory_class):
+    def run(dtype):
+        tracker = Tracker(
+            "euclidean",
+            distance_threshold=20,
+            initialization_delay=0,
+            filter_factory=factory_class(dtype=dtype),
+            dtype=dtype,
+        )
+        for frame in range(30):
+            detections = [
+                Detection(np.array([[10.0 * i + frame, 2.0 * frame], [1.5, 0.5]]))
+                for i in range(3)
+            ]
+            tracked_objects = tracker.update(detections)
+        return tracked_objects
+
+    single = run(np.float32)
+    double = run(np.float64)
+    assert len(single) == len(double) == 3
+    for obj_32, obj_64 in zip(single, double):
+        assert obj_32.filter.x.dtype == np.float32
+        assert obj_32.estimate.dtype == np.float32
+        assert obj_32.last_detection.absolute_points.dtype == np.float32
+        # the points given by the caller aren't modified
+        assert obj_32.last_detection.points.dtype == np.float64
+        np.testing.assert_allclose(obj_32.estimate, obj_64.estimate, rtol=1e-5)
+
+
+def test_tracker_dtype_default_filter_factory():
+    tracker = Tracker("euclidean", distance_threshold=1, dtype=np.float32)
+    assert tracker.filter_factory.dtype == np.float32
+    assert Tracker("euclidean", distance_threshold=1).filter_factory.dtype == np.float64
+
+
+def test_batched_coordinate_transformation():
+    class CountingTranslation(TranslationTransformation):
+        calls = 0
+
+        def abs_to_rel(self, points, out=None):
+            CountingTranslation.calls += 1
+            return super().abs_to_rel(points, out)
+
+        def rel_to_abs(self, points, out=None):
+            CountingTranslation.calls += 1
+            return super().rel_to_abs(points, out)
+
+    tracker = Tracker("euclidean", distance_threshold=5, initialization_delay=0)
+    points = np.array([[[0.0, 0.0], [5.0, 5.0]], [[50.0, 0.0], [55.0, 5.0]]])
+    for i in range(3):
+        detections = [Detection(p + i) for p in points]
+        transformation = CountingTranslation(np.array([i, 2 * i]))
+        CountingTranslation.calls = 0
+        tracked_objects = tracker.update(
+            detections, coord_transformations=transformation
+        )
+        # one call for the detections and one per stage for the estimates
+        assert CountingTranslation.calls <= 3
+        for det, p in zip(detections, points):
+            np.testing.assert_allclose(det.absolute_points, p + i - [i, 2 * i])
+
+    CountingTranslation.calls = 0
+    for obj in tracked_objects:
+        np.testing.assert_allclose(
+            obj.estimate,
+            transformation.abs_to_rel(obj.get_estimate(absolute=True)),
+        )
+        # repeated reads are cached
+        assert obj.estimate is obj.estimate
+    assert CountingTranslation.calls == len(tracked_objects)
+
+
+def test_estimate_cache():
+    tracker = Tracker("euclidean", distance_threshold=5, initialization_delay=0)
+    (obj,) = tracker.update([Detection(np.array([[1.0, 1.0]]))])
+    estimate = obj.estimate
+    velocity = obj.estimate_velocity
+    # unchanged state is only read once
+    assert obj.estimate is estimate
+    assert obj.get_estimate() is estimate
+    assert obj.estimate_velocity is velocity
+    # the cached arrays can't be modified by the caller
+    with pytest.raises(ValueError):
+        estimate[0, 0] = 0
+    assert not velocity.flags.writeable
+
+    # predict and hit invalidate the cache
+    tracker.update([Detection(np.array([[2.0, 1.0]]))])
+    assert obj.estimate is not estimate
+    np.testing.assert_allclose(obj.estimate, obj.filter.x[:2].T)
+    assert obj.estimate_velocity[0, 0] > 0
+
+    # so does a new coordinate transformation
+    tracker.update(coord_transformations=TranslationTransformation(np.array([0, 0])))
+    estimate = obj.estimate
+    obj.update_coordinate_transformation(TranslationTransformation(np.array([1, 0])))
+    np.testing.assert_allclose(obj.estimate, estimate + [1, 0])
+    assert not obj.estimate.flags.writeable
+
+
 # TODO tests list:
 #   - detections with different labels
 #   - partial matches where some points are missing
 #   - pointwise_hit_counter_max
-#   - past detections
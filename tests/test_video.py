@@ -0,0 +1,145 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from norfair.frame import FramePacket  # noqa: E402
+from norfair.video import SkippedFrame, Video, VideoFromFrames  # noqa: E402
+
+NUM_FRAMES = 12
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    """Short video whose frames are filled with a different gray level each."""
+    path = str(tmp_path / "input.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def frame_index(frame):
+    return int(round(frame.mean() / 20))
+
+
+@pytest.mark.parametrize("prefetch_size", [0, 1, 4])
+def test_iterate(video_path, prefetch_size):
+    video = Video(input_path=video_path, prefetch_size=prefetch_size)
+    assert [frame_index(frame) for frame in video] == list(range(NUM_FRAMES))
+    assert not video.video_capture.isOpened()
+
+
+def test_prefetch_early_break(video_path):
+    threads = threading.active_count()
+    video = Video(input_path=video_path, prefetch_size=2)
+    for i, frame in enumerate(video):
+        assert frame_index(frame) == i
+        if i == 3:
+            break
+    # the reader thread is stopped and the capture released
+    assert threading.active_count() == threads
+    assert not video.video_capture.isOpened()
+
+
+def test_async_write(video_path, tmp_path):
+    output_path = str(tmp_path / "output.avi")
+    video = Video(input_path=video_path, output_path=output_path, write_queue_size=2)
+    for frame in video:
+        assert video.write(frame) == -1
+    assert not video.output_video._thread.is_alive()
+
+    # every frame is flushed to the file, in order
+    output = Video(input_path=output_path)
+    assert [frame_index(frame) for frame in output] == list(range(NUM_FRAMES))
+
+
+@pytest.mark.parametrize("prefetch_size", [0, 2])
+def test_iter_frames_detector_only(video_path, prefetch_size):
+    video = Video(input_path=video_path, prefetch_size=prefetch_size)
+    frames = list(video.iter_frames(period=3, decode="detector_only"))
+    assert len(frames) == NUM_FRAMES
+    for i, frame in enumerate(frames):
+        if i % 3 == 0:
+            assert frame_index(frame) == i
+        else:
+            assert isinstance(frame, SkippedFrame)
+            assert frame.index == i
+
+    with pytest.raises(ValueError):
+        next(video.iter_frames(decode="nothing"))
+
+
+@pytest.fixture
+def sequence_path(tmp_path):
+    """Sequence of images in the MOTChallenge format."""
+    path = tmp_path / "MOT-01"
+    (path / "img1").mkdir(parents=True)
+    (path / "seqinfo.ini").write_text(
+        "[Sequence]\nname=MOT-01\nimDir=img1\nframeRate=10\n"
+        f"seqLength={NUM_FRAMES}\nimWidth=64\nimHeight=48\nimExt=.png\n"
+    )
+    for i in range(NUM_FRAMES):
+        cv2.imwrite(
+            str(path / "img1" / f"{i + 1:06d}.png"),
+            np.full((48, 64, 3), i * 20, dtype=np.uint8),
+        )
+    return str(path)
+
+
+@pytest.mark.parametrize("prefetch_size", [0, 3])
+def test_video_from_frames(sequence_path, tmp_path, prefetch_size):
+    video = VideoFromFrames(
+        sequence_path,
+        save_path=str(tmp_path),
+        prefetch_size=prefetch_size,
+        write_queue_size=2,
+    )
+    frames = []
+    for frame in video:
+        frames.append(frame_index(frame))
+        video.update(frame)
+    assert frames == list(range(NUM_FRAMES))
+    # iterating again starts over
+    assert frame_index(next(iter(video))) == 0
+
+    output = Video(input_path=str(tmp_path / "videos" / "MOT-01.mp4"))
+    assert len(list(output)) == NUM_FRAMES
+
+
+@pytest.mark.parametrize("scale", [0.5, 0.3])
+def test_video_from_frames_decoding(sequence_path, scale):
+    video = VideoFromFrames(
+        sequence_path, make_video=False, scale=scale, grayscale=True, prefetch_size=2
+    )
+    frame = next(iter(video))
+    assert frame.shape == (round(48 * scale), round(64 * scale))
+    assert frame_index(frame) == 0
+
+
+@pytest.mark.parametrize("prefetch_size", [0, 2])
+def test_video_from_frames_missing_image(sequence_path, prefetch_size):
+    os.remove(os.path.join(sequence_path, "img1", "000003.png"))
+    video = VideoFromFrames(
+        sequence_path, make_video=False, prefetch_size=prefetch_size
+    )
+    frames = iter(video)
+    assert [frame_index(next(frames)) for _ in range(2)] == [0, 1]
+    with pytest.raises(RuntimeError, match="frame 3"):
+        next(frames)
+
+
+def test_iter_frames_packets(video_path):
+    video = Video(input_path=video_path)
+    frames = list(video.iter_frames(period=2, decode="detector_only", packets=True))
+    for i, frame in enumerate(frames):
+        if i % 2 == 0:
+            assert isinstance(frame, FramePacket)
+            assert frame.index == i
+            assert frame_index(frame.gray) == i
+        else:
+            assert isinstance(frame, SkippedFrame)